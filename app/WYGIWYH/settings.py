@@ -324,12 +324,42 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
 
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+CACHE_LOCATION = os.getenv("CACHE_LOCATION", "/var/tmp/django_cache")
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000"))
+CACHE_LOCAL_TIMEOUT = int(os.getenv("CACHE_LOCAL_TIMEOUT", "60"))
+
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
-        "LOCATION": "/var/tmp/django_cache",
+    "shared": {
+        # Either one of the names above or the dotted path of a cache backend
+        "BACKEND": CACHE_BACKENDS.get(CACHE_BACKEND.lower(), CACHE_BACKEND),
+        "LOCATION": CACHE_LOCATION,
     }
 }
+if CACHE_BACKEND.lower() == "locmem" or CACHE_LOCAL_MAX_ENTRIES <= 0:
+    # Already in-process, or the local tier is disabled
+    CACHES["default"] = CACHES["shared"]
+else:
+    CACHES["default"] = {
+        "BACKEND": "apps.common.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "LOCAL_MAX_ENTRIES": CACHE_LOCAL_MAX_ENTRIES,
+            "LOCAL_TIMEOUT": CACHE_LOCAL_TIMEOUT,
+            # Invalidation keys, shared between every process
+            "READ_THROUGH_PREFIXES": (
+                "cachalot-table:",
+                "overview:version",
+                "filter_choices:version",
+            ),
+        },
+    }
 
 DJANGO_VITE_ASSETS_PATH = STATIC_ROOT
 DJANGO_VITE_MANIFEST_PATH = DJANGO_VITE_ASSETS_PATH / "manifest.json"
@@ -555,6 +585,11 @@ else:
     }
 
 CACHALOT_UNCACHABLE_TABLES = ("django_migrations", "procrastinate_jobs")
+CACHALOT_TABLE_KEYGEN = "apps.common.cache.get_table_cache_key"
+if CACHES["default"]["BACKEND"] == "apps.common.cache.TieredCache":
+    # TieredCache isn't on cachalot's list, the shared cache it wraps is checked
+    # by apps.common.checks instead
+    SILENCED_SYSTEM_CHECKS = ["cachalot.W001"]
 
 # Procrastinate
 PROCRASTINATE_ON_APP_READY = "apps.common.procrastinate.on_app_ready"
@@ -0,0 +1,126 @@
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def build_monthly_balances(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    AccountMonthlyBalance = apps.get_model("accounts", "AccountMonthlyBalance")
+
+    def total(transaction_type, is_paid):
+        return Coalesce(
+            Sum("amount", filter=Q(type=transaction_type, is_paid=is_paid)),
+            Decimal("0"),
+        )
+
+    balances = (
+        Transaction.objects.filter(deleted=False)
+        .annotate(month=TruncMonth("reference_date"))
+        .values("account", "month")
+        .annotate(
+            income_current=total("IN", True),
+            income_projected=total("IN", False),
+            expense_current=total("EX", True),
+            expense_projected=total("EX", False),
+        )
+        .order_by()
+    )
+
+    AccountMonthlyBalance.objects.bulk_create(
+        [
+            AccountMonthlyBalance(
+                account_id=balance["account"],
+                month=balance["month"],
+                income_current=balance["income_current"],
+                income_projected=balance["income_projected"],
+                expense_current=balance["expense_current"],
+                expense_projected=balance["expense_projected"],
+            )
+            for balance in balances.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_account_untracked_by"),
+        ("transactions", "0051_transaction_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountMonthlyBalance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Month")),
+                (
+                    "income_current",
+                    models.DecimalField(
+                        decimal_places=30,
+                        default=0,
+                        max_digits=42,
+                        verbose_name="Current income",
+                    ),
+                ),
+                (
+                    "income_projected",
+                    models.DecimalField(
+                        decimal_places=30,
+                        default=0,
+                        max_digits=42,
+                        verbose_name="Projected income",
+                    ),
+                ),
+                (
+                    "expense_current",
+                    models.DecimalField(
+                        decimal_places=30,
+                        default=0,
+                        max_digits=42,
+                        verbose_name="Current expense",
+                    ),
+                ),
+                (
+                    "expense_projected",
+                    models.DecimalField(
+                        decimal_places=30,
+                        default=0,
+                        max_digits=42,
+                        verbose_name="Projected expense",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_balances",
+                        to="accounts.account",
+                        verbose_name="Account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Account Monthly Balance",
+                "verbose_name_plural": "Account Monthly Balances",
+                "db_table": "account_monthly_balances",
+                "ordering": ["account", "month"],
+                "unique_together": {("account", "month")},
+            },
+        ),
+        migrations.RunPython(
+            build_monthly_balances, reverse_code=migrations.RunPython.noop
+        ),
+    ]
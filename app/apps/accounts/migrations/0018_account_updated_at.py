@@ -0,0 +1,23 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0017_accountmonthlybalance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(fields=["updated_at", "id"], name="accounts_sync_idx"),
+        ),
+    ]
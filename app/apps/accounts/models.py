@@ -68,6 +68,8 @@ class Account(SharedObject):
         related_name="untracked_accounts",
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = SharedObjectManager()
     all_objects = models.Manager()  # Unfiltered manager
 
@@ -75,6 +77,9 @@ class Account(SharedObject):
         verbose_name = _("Account")
         verbose_name_plural = _("Accounts")
         unique_together = (("owner", "name"),)
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="accounts_sync_idx"),
+        ]
         ordering = ["name", "id"]
 
     def __str__(self):
@@ -94,3 +99,66 @@ class Account(SharedObject):
                     )
                 }
             )
+
+
+class AccountMonthlyBalanceManager(models.Manager):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = get_current_user()
+        if user and not user.is_anonymous:
+            # Filter through a subquery, joining shared_with would repeat rows
+            # and inflate any sum made over them
+            return queryset.filter(
+                account_id__in=Account.objects.values_list("id", flat=True)
+            )
+        return queryset
+
+
+class AccountMonthlyBalance(models.Model):
+    """
+    Paid (current) and unpaid (projected) income and expense totals of an account
+    for one reference month.
+
+    Kept up to date by `apps.accounts.services.refresh_account_balances` whenever
+    transactions change, so balances can be read without summing every
+    transaction of the account.
+    """
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name="monthly_balances",
+        verbose_name=_("Account"),
+    )
+    month = models.DateField(verbose_name=_("Month"))
+    income_current = models.DecimalField(
+        max_digits=42, decimal_places=30, default=0, verbose_name=_("Current income")
+    )
+    income_projected = models.DecimalField(
+        max_digits=42,
+        decimal_places=30,
+        default=0,
+        verbose_name=_("Projected income"),
+    )
+    expense_current = models.DecimalField(
+        max_digits=42, decimal_places=30, default=0, verbose_name=_("Current expense")
+    )
+    expense_projected = models.DecimalField(
+        max_digits=42,
+        decimal_places=30,
+        default=0,
+        verbose_name=_("Projected expense"),
+    )
+
+    objects = AccountMonthlyBalanceManager()
+    all_objects = models.Manager()  # Unfiltered manager
+
+    class Meta:
+        verbose_name = _("Account Monthly Balance")
+        verbose_name_plural = _("Account Monthly Balances")
+        db_table = "account_monthly_balances"
+        unique_together = (("account", "month"),)
+        ordering = ["account", "month"]
+
+    def __str__(self):
+        return f"{self.account} - {self.month}"
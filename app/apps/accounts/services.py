@@ -1,10 +1,22 @@
+from contextlib import contextmanager
 from decimal import Decimal
+from threading import local
 
-from django.db import models
+from dateutil.relativedelta import relativedelta
+from django.db import models, transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.dispatch import Signal
 
-from apps.accounts.models import Account
+from apps.accounts.models import Account, AccountMonthlyBalance
 from apps.transactions.models import Transaction
 
+_pending_balance_refresh = local()
+
+# Sent with the (account_id, month) keys whose transactions changed, once their
+# balances are refreshed
+account_months_changed = Signal()
+
 
 def get_account_balance(account: Account, paid_only: bool = True) -> Decimal:
     """
@@ -18,16 +30,190 @@ def get_account_balance(account: Account, paid_only: bool = True) -> Decimal:
     Returns:
         Decimal: The calculated balance (income - expense).
     """
-    filters = {"account": account}
+    return AccountMonthlyBalance.all_objects.filter(account=account).aggregate(
+        total=Coalesce(Sum(get_balance_expression(paid_only)), Decimal("0"))
+    )["total"]
+
+
+def get_balance_expression(paid_only: bool = True):
+    """Income minus expense of an AccountMonthlyBalance row."""
     if paid_only:
-        filters["is_paid"] = True
+        return models.F("income_current") - models.F("expense_current")
+
+    return (
+        models.F("income_current")
+        + models.F("income_projected")
+        - models.F("expense_current")
+        - models.F("expense_projected")
+    )
+
+
+@contextmanager
+def deferred_account_balance_refresh():
+    """
+    Collect the balances touched inside the block and refresh them once when it
+    exits, instead of once per saved transaction.
+    """
+    if getattr(_pending_balance_refresh, "keys", None) is not None:
+        # Nested block, the outermost one refreshes
+        yield
+        return
+
+    _pending_balance_refresh.keys = set()
+    try:
+        yield
+        keys = _pending_balance_refresh.keys
+    finally:
+        _pending_balance_refresh.keys = None
+
+    refresh_account_balances(keys)
+
+
+def _lock_accounts(account_ids):
+    """
+    Lock the accounts until the current transaction ends, so concurrent refreshes
+    of their balances take turns. Each one then aggregates the rows the previous
+    ones committed, instead of overwriting their totals with its own snapshot.
+    """
+    # NO KEY, so transactions referencing the accounts can still be inserted. In
+    # id order, so refreshes of several accounts can't deadlock
+    list(
+        Account.all_objects.filter(id__in=account_ids)
+        .order_by("id")
+        .select_for_update(no_key=True)
+        .values_list("id", flat=True)
+    )
+
+
+def refresh_account_balances(keys):
+    """
+    Recompute the AccountMonthlyBalance rows for the given (account_id, month)
+    keys from their transactions.
+    """
+    keys = {key for key in keys if key is not None}
+    if not keys:
+        return
+
+    pending = getattr(_pending_balance_refresh, "keys", None)
+    if pending is not None:
+        pending.update(keys)
+        return
+
+    with transaction.atomic():
+        _lock_accounts({account_id for account_id, _month in keys})
+
+        months = Q()
+        for account_id, month in keys:
+            months |= Q(
+                account_id=account_id,
+                reference_date__gte=month,
+                reference_date__lt=month + relativedelta(months=1),
+            )
+
+        balances = {
+            (total["account"], total["month"]): total
+            for total in _aggregate_balances(
+                Transaction.userless_all_objects.filter(months, deleted=False)
+            )
+        }
+
+        AccountMonthlyBalance.all_objects.bulk_create(
+            [
+                AccountMonthlyBalance(account_id=account_id, month=month, **totals)
+                for (account_id, month), totals in _balance_values(balances).items()
+            ],
+            update_conflicts=True,
+            unique_fields=["account", "month"],
+            update_fields=[
+                "income_current",
+                "income_projected",
+                "expense_current",
+                "expense_projected",
+            ],
+        )
+
+        emptied = Q()
+        for account_id, month in keys - balances.keys():
+            emptied |= Q(account_id=account_id, month=month)
+        if emptied:
+            AccountMonthlyBalance.all_objects.filter(emptied).delete()
+
+    account_months_changed.send(sender=AccountMonthlyBalance, keys=keys)
+
+
+def rebuild_account_balances(accounts=None) -> int:
+    """
+    Recompute every AccountMonthlyBalance row of the given accounts (all
+    accounts if None) from scratch. Returns the number of rows written.
+    """
+    transactions = Transaction.userless_all_objects.filter(deleted=False)
+    balances = AccountMonthlyBalance.all_objects.all()
+    if accounts is not None:
+        transactions = transactions.filter(account__in=accounts)
+        balances = balances.filter(account__in=accounts)
+
+    totals = {
+        (total["account"], total["month"]): total
+        for total in _aggregate_balances(transactions)
+    }
+
+    balances.delete()
+    created = AccountMonthlyBalance.all_objects.bulk_create(
+        [
+            AccountMonthlyBalance(account_id=account_id, month=month, **values)
+            for (account_id, month), values in _balance_values(totals).items()
+        ],
+        batch_size=1000,
+    )
+
+    return len(created)
+
 
-    income = Transaction.objects.filter(
-        type=Transaction.Type.INCOME, **filters
-    ).aggregate(total=models.Sum("amount"))["total"] or Decimal("0")
+def _aggregate_balances(transactions):
+    return (
+        transactions.annotate(month=TruncMonth("reference_date"))
+        .values("account", "month")
+        .annotate(
+            income_current=Coalesce(
+                Sum(
+                    "amount",
+                    filter=Q(type=Transaction.Type.INCOME, is_paid=True),
+                ),
+                Decimal("0"),
+            ),
+            income_projected=Coalesce(
+                Sum(
+                    "amount",
+                    filter=Q(type=Transaction.Type.INCOME, is_paid=False),
+                ),
+                Decimal("0"),
+            ),
+            expense_current=Coalesce(
+                Sum(
+                    "amount",
+                    filter=Q(type=Transaction.Type.EXPENSE, is_paid=True),
+                ),
+                Decimal("0"),
+            ),
+            expense_projected=Coalesce(
+                Sum(
+                    "amount",
+                    filter=Q(type=Transaction.Type.EXPENSE, is_paid=False),
+                ),
+                Decimal("0"),
+            ),
+        )
+        .order_by()
+    )
 
-    expense = Transaction.objects.filter(
-        type=Transaction.Type.EXPENSE, **filters
-    ).aggregate(total=models.Sum("amount"))["total"] or Decimal("0")
 
-    return income - expense
+def _balance_values(balances):
+    return {
+        key: {
+            "income_current": total["income_current"],
+            "income_projected": total["income_projected"],
+            "expense_current": total["expense_current"],
+            "expense_projected": total["expense_projected"],
+        }
+        for key, total in balances.items()
+    }
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.services import refresh_account_balances
+from apps.transactions.models import Transaction
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def transaction_balance_receiver(sender, instance: Transaction, **kwargs):
+    if kwargs.get("raw"):
+        # Fixtures, rebuild_account_balances takes care of those
+        return
+
+    refresh_account_balances(
+        {instance.get_balance_key(), instance.get_balance_key(loaded=True)}
+    )
+    instance._loaded_balance_key = instance.get_balance_key()
@@ -1,6 +1,8 @@
+import threading
+import time
 from datetime import date
 
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 
 from apps.accounts.models import Account, AccountGroup
 from apps.currencies.models import Currency
@@ -173,3 +175,243 @@ class GetAccountBalanceServiceTests(TestCase):
         balance = get_account_balance(self.account)  # defaults to paid_only=True
         self.assertEqual(balance, Decimal("100.00"))
 
+
+
+class AccountMonthlyBalanceTests(TestCase):
+    """Tests for the per-account, per-month balance ledger"""
+
+    def setUp(self):
+        """Set up test data"""
+        from django.contrib.auth import get_user_model
+
+        from apps.common.middleware.thread_local import write_current_user
+        from apps.transactions.models import Transaction
+
+        self.Transaction = Transaction
+
+        self.user = get_user_model().objects.create_user(
+            email="ledger@example.com", password="password"
+        )
+        write_current_user(self.user)
+
+        self.currency = Currency.objects.create(
+            code="BRL", name="Brazilian Real", decimal_places=2, prefix="R$ "
+        )
+        self.account = Account.objects.create(
+            name="Ledger Account", currency=self.currency, owner=self.user
+        )
+        self.other_account = Account.objects.create(
+            name="Other Ledger Account", currency=self.currency, owner=self.user
+        )
+
+    def tearDown(self):
+        from apps.common.middleware.thread_local import delete_current_user
+
+        delete_current_user()
+
+    def _create(self, amount, month=1, is_paid=True, type=None, account=None):
+        from decimal import Decimal
+
+        return self.Transaction.objects.create(
+            account=account or self.account,
+            type=type or self.Transaction.Type.INCOME,
+            amount=Decimal(amount),
+            is_paid=is_paid,
+            date=date(2025, month, 10),
+            reference_date=date(2025, month, 1),
+            description="Ledger",
+        )
+
+    def _balances(self):
+        from apps.accounts.models import AccountMonthlyBalance
+
+        return {
+            (balance.account_id, balance.month): (
+                balance.income_current,
+                balance.income_projected,
+                balance.expense_current,
+                balance.expense_projected,
+            )
+            for balance in AccountMonthlyBalance.all_objects.all()
+        }
+
+    def test_ledger_follows_transaction_changes(self):
+        """Test that creating, editing, moving and deleting transactions updates the ledger"""
+        from decimal import Decimal
+
+        income = self._create("100")
+        self._create("40", is_paid=False, type=self.Transaction.Type.EXPENSE)
+        self.assertEqual(
+            self._balances()[(self.account.id, date(2025, 1, 1))],
+            (Decimal("100"), Decimal("0"), Decimal("0"), Decimal("40")),
+        )
+
+        income.amount = Decimal("150")
+        income.save()
+        self.assertEqual(
+            self._balances()[(self.account.id, date(2025, 1, 1))][0], Decimal("150")
+        )
+
+        income.account = self.other_account
+        income.reference_date = date(2025, 2, 1)
+        income.save()
+        balances = self._balances()
+        self.assertEqual(
+            balances[(self.account.id, date(2025, 1, 1))][0], Decimal("0")
+        )
+        self.assertEqual(
+            balances[(self.other_account.id, date(2025, 2, 1))][0], Decimal("150")
+        )
+
+        income.delete()
+        self.assertNotIn((self.other_account.id, date(2025, 2, 1)), self._balances())
+
+    def test_ledger_follows_queryset_writes(self):
+        """Test that queryset update, bulk_create and delete update the ledger"""
+        from decimal import Decimal
+
+        self.Transaction.objects.bulk_create(
+            [
+                self.Transaction(
+                    account=self.account,
+                    type=self.Transaction.Type.INCOME,
+                    amount=Decimal("10"),
+                    is_paid=False,
+                    date=date(2025, 3, 1),
+                    reference_date=date(2025, 3, 1),
+                )
+                for _ in range(3)
+            ]
+        )
+        self.assertEqual(
+            self._balances()[(self.account.id, date(2025, 3, 1))][1], Decimal("30")
+        )
+
+        self.Transaction.objects.filter(account=self.account).update(is_paid=True)
+        self.assertEqual(
+            self._balances()[(self.account.id, date(2025, 3, 1))][:2],
+            (Decimal("30"), Decimal("0")),
+        )
+
+        self.Transaction.objects.filter(account=self.account).update(
+            reference_date=date(2025, 4, 1)
+        )
+        balances = self._balances()
+        self.assertNotIn((self.account.id, date(2025, 3, 1)), balances)
+        self.assertEqual(
+            balances[(self.account.id, date(2025, 4, 1))][0], Decimal("30")
+        )
+
+        self.Transaction.objects.filter(account=self.account).delete()
+        self.assertEqual(self._balances(), {})
+
+    def test_rebuild_account_balances_command(self):
+        """Test that the rebuild command repairs a stale ledger"""
+        from decimal import Decimal
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from apps.accounts.models import AccountMonthlyBalance
+        from apps.accounts.services import get_account_balance
+
+        self._create("100")
+        self._create("25", month=2, type=self.Transaction.Type.EXPENSE)
+        AccountMonthlyBalance.all_objects.all().delete()
+        self.assertEqual(get_account_balance(self.account), Decimal("0"))
+
+        out = StringIO()
+        call_command("rebuild_account_balances", stdout=out)
+
+        self.assertIn("2", out.getvalue())
+        self.assertEqual(get_account_balance(self.account), Decimal("75"))
+
+
+class ConcurrentBalanceRefreshTests(TransactionTestCase):
+    """Tests for ledger refreshes of writers running at the same time"""
+
+    def setUp(self):
+        """Set up test data"""
+        from django.contrib.auth import get_user_model
+
+        from apps.common.middleware.thread_local import (
+            delete_current_user,
+            write_current_user,
+        )
+
+        self.user = get_user_model().objects.create_user(
+            email="ledger@example.com", password="password"
+        )
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        self.currency = Currency.objects.create(
+            code="BRL", name="Brazilian Real", decimal_places=2, prefix="R$ "
+        )
+        self.account = Account.objects.create(
+            name="Ledger Account", currency=self.currency, owner=self.user
+        )
+
+    def _write(self, amount, started=None, wait_for=None):
+        from decimal import Decimal
+
+        from django.db import connection, transaction
+
+        from apps.common.middleware.thread_local import (
+            delete_current_user,
+            write_current_user,
+        )
+        from apps.transactions.models import Transaction
+
+        write_current_user(self.user)
+        try:
+            with transaction.atomic():
+                Transaction.objects.create(
+                    account=self.account,
+                    type=Transaction.Type.INCOME,
+                    amount=Decimal(amount),
+                    is_paid=True,
+                    date=date(2025, 1, 10),
+                    reference_date=date(2025, 1, 1),
+                    description="Ledger",
+                )
+                if started is not None:
+                    started.set()
+                if wait_for is not None:
+                    # Give the other writer time to refresh the same month
+                    wait_for.wait(5)
+                    time.sleep(0.5)
+        finally:
+            delete_current_user()
+            connection.close()
+
+    def test_overlapping_writers_keep_both_totals(self):
+        """Test that a refresh doesn't overwrite a concurrent writer's total"""
+        from decimal import Decimal
+
+        from django.db import connection
+
+        from apps.accounts.services import get_account_balance
+
+        first_created = threading.Event()
+        second_started = threading.Event()
+
+        def second_writer():
+            first_created.wait(5)
+            second_started.set()
+            self._write("200")
+
+        first = threading.Thread(
+            target=self._write,
+            args=("100",),
+            kwargs={"started": first_created, "wait_for": second_started},
+        )
+        second = threading.Thread(target=second_writer)
+        # Both writers need a connection from the pool at once
+        connection.close()
+        first.start()
+        second.start()
+        first.join(10)
+        second.join(10)
+
+        self.assertEqual(get_account_balance(self.account), Decimal("300"))
@@ -1,6 +1,65 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = "page_size"
+
+
+class CustomCursorPagination(CursorPagination):
+    page_size = 100
+    page_size_query_param = "page_size"
+    ordering = "-id"
+
+
+class CursorOrPageNumberPagination(CustomPageNumberPagination):
+    """
+    Page numbers by default, or cursors with `?pagination=cursor`.
+
+    Cursor pages don't run a COUNT(*) or use an OFFSET, so they stay fast however
+    deep they are, at the cost of not having a total count.
+    """
+
+    cursor_query_param = "cursor"
+    pagination_query_param = "pagination"
+
+    def __init__(self):
+        self.cursor_pagination = None
+
+    def _wants_cursor(self, request) -> bool:
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.pagination_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._wants_cursor(request):
+            self.cursor_pagination = CustomCursorPagination()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'cursor' to paginate with cursors instead of page numbers.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+        ]
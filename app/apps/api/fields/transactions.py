@@ -1,6 +1,10 @@
+from functools import cached_property
+
+from django.db.models import Q
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
+from apps.accounts.models import Account
 from apps.transactions.models import (
     TransactionCategory,
     TransactionTag,
@@ -8,6 +12,115 @@ from apps.transactions.models import (
 )
 
 
+class TransactionLookups:
+    """
+    The accounts, categories, tags and entities a batch of transaction payloads
+    refers to, loaded with one query per model the first time they're needed so
+    the fields don't query them again for every transaction. Pass it as the
+    "lookups" serializer context.
+    """
+
+    def __init__(self, items):
+        self.items = [item for item in items if isinstance(item, dict)]
+
+    @cached_property
+    def accounts(self):
+        account_ids = set()
+        for item in self.items:
+            account_id = item.get("account_id")
+            if isinstance(account_id, int):
+                account_ids.add(account_id)
+            elif isinstance(account_id, str) and account_id.isdigit():
+                account_ids.add(int(account_id))
+
+        return Account.objects.select_related(
+            "group", "currency", "exchange_currency"
+        ).in_bulk(account_ids)
+
+    @cached_property
+    def _objects(self):
+        references = {
+            TransactionCategory: [item.get("category") for item in self.items],
+            TransactionTag: [],
+            TransactionEntity: [],
+        }
+        for item in self.items:
+            for model, key in (
+                (TransactionTag, "tags"),
+                (TransactionEntity, "entities"),
+            ):
+                if isinstance(item.get(key), list):
+                    references[model] += item[key]
+
+        by_id = {}
+        by_name = {}
+        for model, values in references.items():
+            ids = {value for value in values if isinstance(value, int)}
+            names = {value for value in values if isinstance(value, str)}
+            objects = list(
+                model.objects.filter(Q(id__in=ids) | Q(name__in=names)).order_by("id")
+            )
+            by_id[model] = {obj.id: obj for obj in objects}
+            by_name[model] = {}
+            for obj in objects:
+                by_name[model].setdefault(obj.name, obj)
+
+        return by_id, by_name
+
+    def get(self, model, value):
+        """Get an object by ID, or by name creating it if needed."""
+        by_id, by_name = self._objects
+        if isinstance(value, int):
+            return by_id[model].get(value)
+
+        obj = by_name[model].get(value)
+        if obj is None:
+            obj = model(name=value)
+            obj.save()
+            by_id[model][obj.id] = obj
+            by_name[model][value] = obj
+
+        return obj
+
+
+def _get_or_create(field, model, value, not_found_message):
+    lookups = field.context.get("lookups")
+    if lookups is not None:
+        obj = lookups.get(model, value)
+        if obj is None:
+            raise serializers.ValidationError(not_found_message)
+        return obj
+
+    if isinstance(value, int):
+        try:
+            return model.objects.get(pk=value)
+        except model.DoesNotExist:
+            raise serializers.ValidationError(not_found_message)
+
+    try:
+        return model.objects.get(name=value)
+    except model.DoesNotExist:
+        obj = model(name=value)
+        obj.save()
+        return obj
+
+
+class TransactionAccountField(serializers.PrimaryKeyRelatedField):
+    def to_internal_value(self, data):
+        lookups = self.context.get("lookups")
+        if lookups is None:
+            return super().to_internal_value(data)
+
+        try:
+            account = lookups.accounts.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if account is None:
+            self.fail("does_not_exist", pk_value=data)
+
+        return account
+
+
 @extend_schema_field(
     {
         "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "null"}],
@@ -23,20 +136,13 @@ class TransactionCategoryField(serializers.Field):
     def to_internal_value(self, data):
         if data is None:
             return None
-        if isinstance(data, int):
-            try:
-                return TransactionCategory.objects.get(pk=data)
-            except TransactionCategory.DoesNotExist:
-                raise serializers.ValidationError(
-                    _("Category with this ID does not exist.")
-                )
-        elif isinstance(data, str):
-            try:
-                category = TransactionCategory.objects.get(name=data)
-            except TransactionCategory.DoesNotExist:
-                category = TransactionCategory(name=data)
-                category.save()
-            return category
+        if isinstance(data, (int, str)):
+            return _get_or_create(
+                self,
+                TransactionCategory,
+                data,
+                _("Category with this ID does not exist."),
+            )
         raise serializers.ValidationError(
             _("Invalid category data. Provide an ID or name.")
         )
@@ -66,19 +172,10 @@ class TransactionTagField(serializers.Field):
     def to_internal_value(self, data):
         tags = []
         for item in data:
-            if isinstance(item, int):
-                try:
-                    tag = TransactionTag.objects.get(pk=item)
-                except TransactionTag.DoesNotExist:
-                    raise serializers.ValidationError(
-                        _("Tag with this ID does not exist.")
-                    )
-            elif isinstance(item, str):
-                try:
-                    tag = TransactionTag.objects.get(name=item)
-                except TransactionTag.DoesNotExist:
-                    tag = TransactionTag(name=item)
-                    tag.save()
+            if isinstance(item, (int, str)):
+                tag = _get_or_create(
+                    self, TransactionTag, item, _("Tag with this ID does not exist.")
+                )
             else:
                 raise serializers.ValidationError(
                     _("Invalid tag data. Provide an ID or name.")
@@ -101,19 +198,13 @@ class TransactionEntityField(serializers.Field):
     def to_internal_value(self, data):
         entities = []
         for item in data:
-            if isinstance(item, int):
-                try:
-                    entity = TransactionEntity.objects.get(pk=item)
-                except TransactionEntity.DoesNotExist:
-                    raise serializers.ValidationError(
-                        _("Entity with this ID does not exist.")
-                    )
-            elif isinstance(item, str):
-                try:
-                    entity = TransactionEntity.objects.get(name=item)
-                except TransactionEntity.DoesNotExist:
-                    entity = TransactionEntity(name=item)
-                    entity.save()
+            if isinstance(item, (int, str)):
+                entity = _get_or_create(
+                    self,
+                    TransactionEntity,
+                    item,
+                    _("Entity with this ID does not exist."),
+                )
             else:
                 raise serializers.ValidationError(
                     _("Invalid entity data. Provide an ID or name.")
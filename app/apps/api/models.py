@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def get_tombstone_retention() -> timedelta | None:
+    """How long tombstones are kept, as long as deleted transactions."""
+    if settings.KEEP_DELETED_TRANSACTIONS_FOR <= 0:
+        return None
+
+    return timedelta(days=settings.KEEP_DELETED_TRANSACTIONS_FOR)
+
+
+class Tombstone(models.Model):
+    """
+    A hard-deleted object, or one that was unshared from some users, kept so
+    the sync API can tell clients to drop their copy of it.
+
+    Soft-deleted transactions don't get one, their `deleted_at` is used instead.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    # For transactions, which are visible through their account
+    account_id = models.BigIntegerField(null=True, blank=True)
+    # For everything else, who could see the object, or null if everyone could
+    user_ids = models.JSONField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstones_sync_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
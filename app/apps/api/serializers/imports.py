@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.import_app.models import ImportProfile, ImportRun
+from apps.import_app.models import ImportProfile, ImportRun, ImportRunLog
 
 
 class ImportProfileSerializer(serializers.ModelSerializer):
@@ -14,6 +14,16 @@ class ImportProfileSerializer(serializers.ModelSerializer):
 class ImportRunSerializer(serializers.ModelSerializer):
     """Serializer for listing import runs."""
 
+    # Only the tail of the log, every entry is listed by the run's logs endpoint
+    LOG_LINES = 100
+
+    logs = serializers.SerializerMethodField(
+        help_text=(
+            f"The last {LOG_LINES} log lines. Deprecated, use "
+            "/api/import/runs/{id}/logs/ to read every log entry."
+        )
+    )
+
     class Meta:
         model = ImportRun
         fields = [
@@ -31,6 +41,20 @@ class ImportRunSerializer(serializers.ModelSerializer):
             "finished_at",
         ]
 
+    def get_logs(self, obj) -> str:
+        entries = getattr(obj, "recent_log_entries", None)
+        if entries is None:
+            entries = obj.log_entries.order_by("-id")[: self.LOG_LINES]
+        return "\n".join(str(entry) for entry in reversed(entries))
+
+
+class ImportRunLogSerializer(serializers.ModelSerializer):
+    """Serializer for listing the log entries of an import run."""
+
+    class Meta:
+        model = ImportRunLog
+        fields = ["id", "level", "message", "created_at"]
+
 
 class ImportFileSerializer(serializers.Serializer):
     """Serializer for uploading a file to import using an existing profile."""
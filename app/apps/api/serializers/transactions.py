@@ -1,5 +1,9 @@
+from copy import deepcopy
 from decimal import Decimal
+from functools import cached_property
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.manager import BaseManager
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular import openapi
 from drf_spectacular.types import OpenApiTypes
@@ -7,9 +11,11 @@ from drf_spectacular.utils import extend_schema_field
 
 from rest_framework import serializers
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.validators import UniqueValidator
 
 from apps.accounts.models import Account
 from apps.api.fields.transactions import (
+    TransactionAccountField,
     TransactionTagField,
     TransactionCategoryField,
     TransactionEntityField,
@@ -22,6 +28,9 @@ from apps.transactions.models import (
     InstallmentPlan,
     TransactionEntity,
     RecurringTransaction,
+    SoftDeleteQuerySet,
+    get_exchanged_amounts,
+    prefetch_exchanged_amounts,
 )
 from apps.common.middleware.thread_local import get_current_user
 
@@ -142,6 +151,178 @@ class RecurringTransactionSerializer(serializers.ModelSerializer):
         return instance
 
 
+class TransactionListSerializer(serializers.ListSerializer):
+    """
+    Creates or updates many transactions at once: written with bulk_create or
+    bulk_update, with their rules checked in batches. Pass a TransactionLookups
+    as the "lookups" context so relations are looked up once for the batch.
+    """
+
+    def to_representation(self, data):
+        # One batch of conversions for the page instead of one per transaction
+        transactions = list(data.all() if isinstance(data, BaseManager) else data)
+        prefetch_exchanged_amounts(transactions)
+        return super().to_representation(transactions)
+
+    def to_internal_value(self, data):
+        self._child_instances = []
+        self._child_ids = set()
+        validated_data = super().to_internal_value(data)
+        self._validate_internal_ids(validated_data)
+        return validated_data
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        if not hasattr(self, "_instances_by_id"):
+            self._instances_by_id = {obj.pk: obj for obj in self.instance}
+
+        try:
+            instance = self._instances_by_id.get(int(data["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise serializers.ValidationError(
+                {"id": [_("A transaction ID is required.")]}
+            )
+        if instance is None:
+            raise serializers.ValidationError(
+                {"id": [_("Transaction with this ID does not exist.")]}
+            )
+        if instance.pk in self._child_ids:
+            raise serializers.ValidationError(
+                {"id": [_("This transaction is already being updated.")]}
+            )
+
+        self.child.instance = instance
+        self.child.initial_data = data
+        validated = super().run_child_validation(data)
+        self._child_instances.append(instance)
+        self._child_ids.add(instance.pk)
+        return validated
+
+    def _validate_internal_ids(self, validated_data):
+        # The child serializers skip their UniqueValidator when given lookups,
+        # check the whole batch with a single query instead
+        if "lookups" not in self.context:
+            return
+
+        internal_ids = [attrs.get("internal_id") or None for attrs in validated_data]
+        owners = dict(
+            Transaction.userless_all_objects.filter(
+                internal_id__in=[value for value in internal_ids if value]
+            ).values_list("internal_id", "pk")
+        )
+
+        errors = []
+        seen = set()
+        for index, internal_id in enumerate(internal_ids):
+            pk = self._child_instances[index].pk if self._child_instances else None
+            if internal_id and (
+                internal_id in seen or owners.get(internal_id, pk) != pk
+            ):
+                errors.append(
+                    {
+                        "internal_id": [
+                            _("Transaction with this Internal ID already exists.")
+                        ]
+                    }
+                )
+            else:
+                errors.append({})
+            seen.add(internal_id)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+    @staticmethod
+    def _clean(transactions):
+        # Relations were resolved by the fields already, don't query them again
+        relations = [
+            field.name
+            for field in Transaction._meta.concrete_fields
+            if field.is_relation
+        ]
+
+        errors = []
+        for transaction in transactions:
+            try:
+                transaction.full_clean(
+                    exclude=relations, validate_unique=False, validate_constraints=False
+                )
+            except DjangoValidationError as exc:
+                errors.append(exc.message_dict)
+            else:
+                errors.append({})
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+    @staticmethod
+    def _set_relations(transactions, validated_data, replace=False):
+        for name in ("tags", "entities"):
+            field = Transaction._meta.get_field(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+
+            changed = [
+                (transaction, attrs[name])
+                for transaction, attrs in zip(transactions, validated_data)
+                if name in attrs
+            ]
+            if replace:
+                through.objects.filter(
+                    **{f"{source}__in": [transaction for transaction, _ in changed]}
+                ).delete()
+            through.objects.bulk_create(
+                [
+                    through(**{source: transaction, target: obj})
+                    for transaction, objs in changed
+                    for obj in objs
+                ],
+                ignore_conflicts=True,
+            )
+
+    def create(self, validated_data):
+        owner = get_current_user()
+        transactions = []
+        for attrs in validated_data:
+            attrs = {
+                key: value
+                for key, value in attrs.items()
+                if key not in ("tags", "entities")
+            }
+            transactions.append(Transaction(owner=owner, **attrs))
+
+        self._clean(transactions)
+        Transaction.objects.bulk_create(transactions, emit_signal=False)
+        self._set_relations(transactions, validated_data)
+        SoftDeleteQuerySet.emit_signals(transactions, created=True)
+
+        return transactions
+
+    def update(self, instance, validated_data):
+        transactions = self._child_instances
+        old_data = deepcopy(transactions)
+
+        # Fields clean() may normalize on top of the ones sent
+        fields = {"amount", "reference_date", "internal_id"}
+        for transaction, attrs in zip(transactions, validated_data):
+            for attr, value in attrs.items():
+                if attr not in ("tags", "entities"):
+                    setattr(transaction, attr, value)
+                    fields.add(attr)
+
+        self._clean(transactions)
+        Transaction.objects.bulk_update(
+            transactions, fields=sorted(fields), emit_signal=False
+        )
+        self._set_relations(transactions, validated_data, replace=True)
+        SoftDeleteQuerySet.emit_signals(transactions, created=False, old_data=old_data)
+
+        return transactions
+
+
 class TransactionSerializer(serializers.ModelSerializer):
     category: str | int = TransactionCategoryField(required=False)
     tags: str | int = TransactionTagField(required=False)
@@ -153,7 +334,7 @@ class TransactionSerializer(serializers.ModelSerializer):
     account = AccountSerializer(read_only=True)
 
     # For write operations (POST, PUT, PATCH)
-    account_id = serializers.PrimaryKeyRelatedField(
+    account_id = TransactionAccountField(
         queryset=Account.objects.all(), source="account", write_only=True
     )
 
@@ -166,6 +347,7 @@ class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
         fields = "__all__"
+        list_serializer_class = TransactionListSerializer
         read_only_fields = [
             "id",
             "installment_plan",
@@ -181,6 +363,15 @@ class TransactionSerializer(serializers.ModelSerializer):
 
         self.fields["account_id"].queryset = Account.objects.all()
 
+        if "lookups" in self.context:
+            # TransactionListSerializer checks them for the whole batch at once
+            internal_id = self.fields["internal_id"]
+            internal_id.validators = [
+                validator
+                for validator in internal_id.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+
     def validate(self, data):
         if not self.partial:
             if "date" in data and "reference_date" not in data:
@@ -218,3 +409,129 @@ class TransactionSerializer(serializers.ModelSerializer):
     @staticmethod
     def get_exchanged_amount(obj) -> Decimal:
         return obj.exchanged_amount()
+
+
+class TransactionFlatListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data)
+        related = self.child.load_related(rows)
+        return [self.child.to_representation(row, related) for row in rows]
+
+
+class TransactionFlatSerializer(serializers.BaseSerializer):
+    """
+    A read-only TransactionSerializer for the rows of a `.values(*COLUMNS)`
+    transaction queryset, rendering only the requested fields and relations as
+    IDs unless they are expanded. No model instance or nested serializer is
+    built per row, and expanded relations are loaded once for all the rows.
+    """
+
+    COLUMNS = [field.attname for field in Transaction._meta.concrete_fields]
+    FIELDS = [*COLUMNS, "tags", "entities"]
+    EXPANDABLE = ["account", "category", "tags", "entities", "exchanged_amount"]
+
+    class Meta:
+        list_serializer_class = TransactionFlatListSerializer
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = fields or self.FIELDS
+        self.expand = set(expand)
+
+    @cached_property
+    def _formatters(self):
+        # Format the values the same way TransactionSerializer does, relations
+        # are rendered as their IDs
+        fields = TransactionSerializer(context=self.context).fields
+        return {
+            field.name: fields[field.name].to_representation
+            for field in Transaction._meta.concrete_fields
+            if not field.is_relation and field.name in fields
+        }
+
+    def load_related(self, rows):
+        """The relations and exchanged amounts of rows, loaded all at once."""
+        related = {}
+        transaction_ids = [row["id"] for row in rows]
+
+        if "account" in self.expand:
+            accounts = Account.objects.select_related(
+                "group", "currency", "exchange_currency"
+            ).filter(id__in={row["account_id"] for row in rows})
+            related["account"] = {
+                account["id"]: account
+                for account in AccountSerializer(
+                    accounts, many=True, context=self.context
+                ).data
+            }
+
+        if "category" in self.expand:
+            categories = TransactionCategory.all_objects.filter(
+                id__in={row["category_id"] for row in rows}
+            ).values("id", "name")
+            related["category"] = {category["id"]: category for category in categories}
+
+        for name in ("tags", "entities"):
+            if name not in self.requested_fields and name not in self.expand:
+                continue
+
+            field = Transaction._meta.get_field(name)
+            transaction_field = field.related_query_name()
+            values = {transaction_id: [] for transaction_id in transaction_ids}
+            for obj in (
+                field.related_model.objects.filter(
+                    **{f"{transaction_field}__in": transaction_ids}
+                )
+                .values(transaction_field, "id", "name")
+                .order_by("id")
+            ):
+                values[obj[transaction_field]].append(
+                    {"id": obj["id"], "name": obj["name"]}
+                    if name in self.expand
+                    else obj["id"]
+                )
+            related[name] = values
+
+        if "exchanged_amount" in self.expand:
+            currencies = {
+                account_id: (currency_id, exchange_currency_id)
+                for account_id, currency_id, exchange_currency_id in Account.all_objects.filter(
+                    id__in={row["account_id"] for row in rows}
+                ).values_list(
+                    "id", "currency_id", "exchange_currency_id"
+                )
+            }
+            related["exchanged_amount"] = dict(
+                zip(
+                    transaction_ids,
+                    get_exchanged_amounts(
+                        [
+                            (row["amount"], row["date"], *currencies[row["account_id"]])
+                            for row in rows
+                        ]
+                    ),
+                )
+            )
+
+        return related
+
+    def to_representation(self, row, related=None):
+        if related is None:
+            related = self.load_related([row])
+
+        data = {}
+        for name in self.requested_fields:
+            if name in related:
+                data[name] = related[name][row["id"]]
+            elif row[name] is None or name not in self._formatters:
+                data[name] = row[name]
+            else:
+                data[name] = self._formatters[name](row[name])
+
+        for name in self.expand - data.keys():
+            if name in ("account", "category"):
+                data[name] = related[name].get(row[f"{name}_id"])
+            else:
+                data[name] = related[name][row["id"]]
+
+        return data
@@ -0,0 +1,173 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.accounts.models import Account
+from apps.api.models import Tombstone
+from apps.transactions.models import (
+    Transaction,
+    TransactionCategory,
+    TransactionEntity,
+    TransactionTag,
+)
+
+
+def _visible_to_user_ids(instance):
+    """Who can see a SharedObject, or None if everyone can."""
+    if instance.visibility == "public" or instance.owner_id is None:
+        return None
+
+    return [instance.owner_id, *instance.shared_with.values_list("id", flat=True)]
+
+
+def _resend_account_transactions(account_ids):
+    """Make the sync API send the transactions of accounts new users can see."""
+    Transaction.userless_all_objects.filter(account_id__in=account_ids).update(
+        emit_signal=False, updated_at=timezone.now()
+    )
+
+
+@receiver(pre_delete, sender=Transaction)
+def transaction_pre_delete_receiver(sender, instance, origin=None, **kwargs):
+    if instance.deleted:
+        # Sync already reported it through deleted_at when it was soft deleted
+        return
+
+    if isinstance(origin, Account) or (
+        isinstance(origin, QuerySet) and origin.model is Account
+    ):
+        # Clients drop the transactions of a deleted account with it
+        return
+
+    Tombstone.objects.create(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        account_id=instance.account_id,
+    )
+
+
+@receiver(pre_delete, sender=Account)
+@receiver(pre_delete, sender=TransactionCategory)
+@receiver(pre_delete, sender=TransactionTag)
+@receiver(pre_delete, sender=TransactionEntity)
+def shared_object_pre_delete_receiver(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        user_ids=_visible_to_user_ids(instance),
+    )
+
+
+@receiver(m2m_changed, sender=Account.shared_with.through)
+@receiver(m2m_changed, sender=TransactionCategory.shared_with.through)
+@receiver(m2m_changed, sender=TransactionTag.shared_with.through)
+@receiver(m2m_changed, sender=TransactionEntity.shared_with.through)
+def shared_object_sharing_changed_receiver(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse:
+        # A user was (un)shared some objects
+        shared_model = model
+        if action == "pre_clear":
+            objects = list(shared_model._base_manager.filter(shared_with=instance))
+        else:
+            objects = list(shared_model._base_manager.filter(pk__in=pk_set))
+        user_ids = [instance.pk]
+    else:
+        shared_model = type(instance)
+        objects = [instance]
+        if action == "pre_clear":
+            user_ids = list(instance.shared_with.values_list("id", flat=True))
+        else:
+            user_ids = list(pk_set)
+
+    if action == "post_add":
+        # So the sync API sends them to the users they were shared with
+        shared_model._base_manager.filter(pk__in=[obj.pk for obj in objects]).update(
+            updated_at=timezone.now()
+        )
+        if shared_model is Account:
+            _resend_account_transactions([obj.pk for obj in objects])
+        return
+
+    tombstones = []
+    for obj in objects:
+        if obj.visibility == "public":
+            continue
+
+        lost_access = [user_id for user_id in user_ids if user_id != obj.owner_id]
+        if lost_access:
+            tombstones.append(
+                Tombstone(
+                    model=shared_model._meta.label_lower,
+                    object_id=obj.pk,
+                    user_ids=lost_access,
+                )
+            )
+
+    Tombstone.objects.bulk_create(tombstones)
+
+
+@receiver(pre_save, sender=Account)
+@receiver(pre_save, sender=TransactionCategory)
+@receiver(pre_save, sender=TransactionTag)
+@receiver(pre_save, sender=TransactionEntity)
+def shared_object_pre_save_receiver(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    old = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values("visibility", "owner_id")
+        .first()
+    )
+    if old and (old["visibility"], old["owner_id"]) != (
+        instance.visibility,
+        instance.owner_id,
+    ):
+        # Kept on the instance until post_save knows the write went through
+        instance._sync_was_visible_to = _visible_to_user_ids(
+            sender(pk=instance.pk, **old)
+        )
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_save, sender=TransactionCategory)
+@receiver(post_save, sender=TransactionTag)
+@receiver(post_save, sender=TransactionEntity)
+def shared_object_access_changed_receiver(sender, instance, **kwargs):
+    if "_sync_was_visible_to" not in instance.__dict__:
+        return
+
+    was_visible_to = instance.__dict__.pop("_sync_was_visible_to")
+    visible_to = _visible_to_user_ids(instance)
+
+    if visible_to is None:
+        lost_access = []
+    elif was_visible_to is None:
+        lost_access = list(
+            get_user_model()
+            .objects.exclude(pk__in=visible_to)
+            .values_list("id", flat=True)
+        )
+    else:
+        lost_access = sorted(set(was_visible_to) - set(visible_to))
+
+    if lost_access:
+        # Like shared_with removals, users who can't see it anymore drop it
+        Tombstone.objects.create(
+            model=sender._meta.label_lower,
+            object_id=instance.pk,
+            user_ids=lost_access,
+        )
+
+    gained_access = was_visible_to is not None and (
+        visible_to is None or set(visible_to) - set(was_visible_to)
+    )
+    if gained_access and sender is Account:
+        _resend_account_transactions([instance.pk])
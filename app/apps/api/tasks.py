@@ -0,0 +1,19 @@
+from django.utils import timezone
+from procrastinate.contrib.django import app
+
+from apps.api.models import Tombstone, get_tombstone_retention
+
+
+@app.periodic(cron="20 1 * * *")
+@app.task(lock="cleanup_tombstones", name="cleanup_tombstones")
+def cleanup_tombstones(timestamp=None):
+    retention = get_tombstone_retention()
+    if retention is None:
+        return "KEEP_DELETED_TRANSACTIONS_FOR is 0, no cleanup performed."
+
+    # Sync cursors older than this are rejected, their clients start over
+    deleted_count, _ = Tombstone.objects.filter(
+        deleted_at__lt=timezone.now() - retention
+    ).delete()
+
+    return f"Deleted {deleted_count} sync tombstones."
@@ -7,7 +7,8 @@ from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from apps.import_app.models import ImportProfile, ImportRun
+from apps.api.serializers import ImportRunSerializer
+from apps.import_app.models import ImportProfile, ImportRun, ImportRunLog
 
 
 @override_settings(
@@ -64,9 +65,7 @@ column_mapping:
         mock_path.return_value = "/usr/src/app/temp/test_file.csv"
 
         csv_content = b"date,description,amount,account\n2025-01-01,Test,100,Main"
-        file = SimpleUploadedFile(
-            "test_file.csv", csv_content, content_type="text/csv"
-        )
+        file = SimpleUploadedFile("test_file.csv", csv_content, content_type="text/csv")
 
         response = self.client.post(
             "/api/import/import/",
@@ -93,9 +92,7 @@ column_mapping:
     def test_create_import_missing_profile(self):
         """Test request without profile_id returns 400"""
         csv_content = b"date,description,amount\n2025-01-01,Test,100"
-        file = SimpleUploadedFile(
-            "test_file.csv", csv_content, content_type="text/csv"
-        )
+        file = SimpleUploadedFile("test_file.csv", csv_content, content_type="text/csv")
 
         response = self.client.post(
             "/api/import/import/",
@@ -120,9 +117,7 @@ column_mapping:
     def test_create_import_invalid_profile(self):
         """Test request with non-existent profile returns 400"""
         csv_content = b"date,description,amount\n2025-01-01,Test,100"
-        file = SimpleUploadedFile(
-            "test_file.csv", csv_content, content_type="text/csv"
-        )
+        file = SimpleUploadedFile("test_file.csv", csv_content, content_type="text/csv")
 
         response = self.client.post(
             "/api/import/import/",
@@ -163,9 +158,7 @@ column_mapping:
         unauthenticated_client = APIClient()
 
         csv_content = b"date,description,amount\n2025-01-01,Test,100"
-        file = SimpleUploadedFile(
-            "test_file.csv", csv_content, content_type="text/csv"
-        )
+        file = SimpleUploadedFile("test_file.csv", csv_content, content_type="text/csv")
 
         response = unauthenticated_client.post(
             "/api/import/import/",
@@ -402,3 +395,57 @@ column_mapping:
         response = unauthenticated_client.get("/api/import/runs/")
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_run_logs(self):
+        """Test the log entries of a run are listed from their own endpoint"""
+        ImportRunLog.objects.bulk_create(
+            ImportRunLog(import_run=self.run1, message=f"Row {row} imported")
+            for row in range(3)
+        )
+
+        response = self.client.get(f"/api/import/runs/{self.run1.id}/logs/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [entry["message"] for entry in response.data["results"]],
+            ["Row 0 imported", "Row 1 imported", "Row 2 imported"],
+        )
+
+    def test_run_logs_field_keeps_the_last_lines(self):
+        """Test the logs field still holds the tail of the run's log"""
+        ImportRunLog.objects.bulk_create(
+            ImportRunLog(import_run=self.run1, message=f"Row {row} imported")
+            for row in range(ImportRunSerializer.LOG_LINES + 5)
+        )
+
+        response = self.client.get("/api/import/runs/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        runs = {run["id"]: run for run in response.data["results"]}
+        lines = runs[self.run1.id]["logs"].splitlines()
+        self.assertEqual(len(lines), ImportRunSerializer.LOG_LINES)
+        self.assertTrue(lines[0].endswith("INFO: Row 5 imported"))
+        self.assertTrue(
+            lines[-1].endswith(f"Row {ImportRunSerializer.LOG_LINES + 4} imported")
+        )
+        self.assertEqual(runs[self.run2.id]["logs"], "")
+
+        response = self.client.get(f"/api/import/runs/{self.run1.id}/")
+        self.assertEqual(response.data["logs"].splitlines(), lines)
+
+    def test_filter_runs_by_log_message(self):
+        """Test a run with several matching log entries is listed once"""
+        ImportRunLog.objects.bulk_create(
+            [
+                ImportRunLog(import_run=self.run1, message="Duplicate row skipped"),
+                ImportRunLog(import_run=self.run1, message="Duplicate row skipped"),
+                ImportRunLog(import_run=self.run2, message="Row imported"),
+            ]
+        )
+
+        response = self.client.get("/api/import/runs/?logs__icontains=duplicate")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.run1.id)
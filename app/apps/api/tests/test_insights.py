@@ -0,0 +1,121 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.common.middleware.thread_local import (
+    delete_current_user,
+    write_current_user,
+)
+from apps.currencies.models import Currency
+from apps.transactions.models import Transaction, TransactionCategory
+
+
+class InsightsAPITests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+        self.food = TransactionCategory.objects.create(name="Food")
+
+        self._create_transaction(Decimal("30"), category=self.food)
+        self._create_transaction(Decimal("20"))
+
+    def _create_transaction(self, amount, **kwargs):
+        return Transaction.objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            amount=amount,
+            is_paid=True,
+            date=date(2025, 1, 10),
+            owner=self.user,
+            **kwargs,
+        )
+
+    def test_currency_totals_use_the_transaction_filters(self):
+        response = self.client.get(
+            "/api/insights/currency-totals/", {"category": "Food"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        totals = response.json()[str(self.currency.id)]
+        self.assertEqual(Decimal(str(totals["expense_current"])), Decimal("30"))
+
+    def test_account_totals(self):
+        response = self.client.get("/api/insights/account-totals/")
+
+        self.assertEqual(response.status_code, 200)
+        totals = response.json()[str(self.account.id)]
+        self.assertEqual(totals["account"]["name"], "Checking")
+        self.assertEqual(Decimal(str(totals["expense_current"])), Decimal("50"))
+
+    def test_net_worth(self):
+        response = self.client.get(
+            "/api/insights/net-worth/", {"reference_date_end": "2025-01"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        balances = list(response.json().values())
+        self.assertEqual(Decimal(str(balances[-1]["US Dollar"])), Decimal("-50"))
+
+    def test_month_by_month(self):
+        response = self.client.get(
+            "/api/insights/month-by-month/", {"year": 2025, "group_by": "categories"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["year"], 2025)
+
+        response = self.client.get(
+            "/api/insights/month-by-month/", {"group_by": "accounts"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(
+            "/api/insights/currency-totals/", {"date_start": "not a date"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("date_start", response.json())
+
+    def test_unchanged_data_is_not_modified(self):
+        response = self.client.get("/api/insights/currency-totals/")
+        etag = response.headers["ETag"]
+
+        response = self.client.get(
+            "/api/insights/currency-totals/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self._create_transaction(Decimal("5"))
+
+        response = self.client.get(
+            "/api/insights/currency-totals/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_if_modified_since(self):
+        response = self.client.get("/api/insights/account-totals/")
+
+        response = self.client.get(
+            "/api/insights/account-totals/",
+            HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,202 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.api.models import Tombstone
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.currencies.models import Currency
+from apps.transactions.models import Transaction, TransactionTag
+
+
+@patch("apps.api.views.sync.SYNC_LAG", timedelta(0))
+class SyncAPITests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        User = get_user_model()
+        self.user = User.objects.create_user(email="one@test.com", password="x")
+        self.other_user = User.objects.create_user(email="two@test.com", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        currency = Currency.objects.create(code="USD", name="US Dollar")
+        self.account = Account.objects.create(
+            name="Checking", currency=currency, owner=self.user
+        )
+        self.other_account = Account.objects.create(
+            name="Theirs", currency=currency, owner=self.other_user
+        )
+        self.transaction = self._create_transaction(self.account)
+
+    def _create_transaction(self, account):
+        return Transaction.objects.create(
+            account=account,
+            type=Transaction.Type.EXPENSE,
+            amount=Decimal("10"),
+            is_paid=True,
+            date=date(2025, 1, 1),
+            owner=account.owner,
+        )
+
+    def _sync(self, cursor=None):
+        params = {"cursor": cursor} if cursor else {}
+        response = self.client.get("/api/sync/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _ids(self, data, name):
+        return [obj["id"] for obj in data["changed"][name]]
+
+    def test_first_sync_returns_everything_visible(self):
+        data = self._sync()
+
+        self.assertEqual(self._ids(data, "accounts"), [self.account.id])
+        self.assertEqual(self._ids(data, "transactions"), [self.transaction.id])
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["deleted"]["transactions"], [])
+
+        data = self._sync(data["cursor"])
+        self.assertEqual(self._ids(data, "accounts"), [])
+        self.assertEqual(self._ids(data, "transactions"), [])
+
+    def test_returns_only_the_changes_since_the_cursor(self):
+        cursor = self._sync()["cursor"]
+
+        self.transaction.description = "Changed"
+        self.transaction.save()
+        tag = TransactionTag.objects.create(name="New", owner=self.user)
+        other_transaction = self._create_transaction(self.account)
+        Transaction.objects.filter(id=other_transaction.id).update(
+            is_paid=False, emit_signal=False
+        )
+        self._create_transaction(self.other_account)
+
+        data = self._sync(cursor)
+
+        self.assertEqual(
+            self._ids(data, "transactions"), [self.transaction.id, other_transaction.id]
+        )
+        self.assertEqual(data["changed"]["transactions"][0]["description"], "Changed")
+        self.assertEqual(self._ids(data, "tags"), [tag.id])
+        self.assertEqual(self._ids(data, "accounts"), [])
+
+    def test_hard_deletes_return_tombstones(self):
+        cursor = self._sync()["cursor"]
+        tag = TransactionTag.objects.create(name="Old", owner=self.user)
+        other_tag = TransactionTag.objects.create(name="Old", owner=self.other_user)
+        cursor = self._sync(cursor)["cursor"]
+
+        transaction_id, tag_id = self.transaction.id, tag.id
+        self.transaction.delete()
+        tag.delete()
+        other_tag.delete()
+
+        data = self._sync(cursor)
+
+        self.assertEqual(data["deleted"]["transactions"], [transaction_id])
+        self.assertEqual(data["deleted"]["tags"], [tag_id])
+
+    @override_settings(ENABLE_SOFT_DELETE=True)
+    def test_soft_deletes_are_returned_without_tombstones(self):
+        cursor = self._sync()["cursor"]
+
+        self.transaction.delete()
+
+        data = self._sync(cursor)
+        self.assertEqual(data["deleted"]["transactions"], [self.transaction.id])
+        self.assertEqual(self._ids(data, "transactions"), [])
+        self.assertFalse(Tombstone.objects.exists())
+
+        # Purging it later isn't reported again
+        Transaction.userless_all_objects.filter(id=self.transaction.id).hard_delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_deleting_an_account_only_tombstones_the_account(self):
+        cursor = self._sync()["cursor"]
+        account_id = self.account.id
+
+        self.account.delete()
+
+        data = self._sync(cursor)
+        self.assertEqual(data["deleted"]["accounts"], [account_id])
+        self.assertEqual(Tombstone.objects.count(), 1)
+
+    def test_sharing_changes_reach_the_users_involved(self):
+        their_transaction = self._create_transaction(self.other_account)
+        # Moves the cursor past the transaction the user couldn't see yet
+        self._create_transaction(self.account)
+        cursor = self._sync()["cursor"]
+
+        self.other_account.shared_with.add(self.user)
+        data = self._sync(cursor)
+        self.assertEqual(self._ids(data, "accounts"), [self.other_account.id])
+        self.assertEqual(self._ids(data, "transactions"), [their_transaction.id])
+
+        self.other_account.shared_with.remove(self.user)
+        data = self._sync(data["cursor"])
+        self.assertEqual(data["deleted"]["accounts"], [self.other_account.id])
+
+    def test_visibility_changes_reach_the_users_involved(self):
+        their_transaction = self._create_transaction(self.other_account)
+        # Moves the cursor past the transaction the user couldn't see yet
+        self._create_transaction(self.account)
+        cursor = self._sync()["cursor"]
+
+        self.other_account.visibility = "public"
+        self.other_account.save()
+        data = self._sync(cursor)
+        self.assertEqual(self._ids(data, "accounts"), [self.other_account.id])
+        self.assertEqual(self._ids(data, "transactions"), [their_transaction.id])
+
+        self.other_account.visibility = "private"
+        self.other_account.save()
+        data = self._sync(data["cursor"])
+        self.assertEqual(data["deleted"]["accounts"], [self.other_account.id])
+        self.assertEqual(data["changed"]["accounts"], [])
+
+        self.account.owner = self.other_user
+        self.account.save()
+        data = self._sync(data["cursor"])
+        self.assertEqual(data["deleted"]["accounts"], [self.account.id])
+
+    @patch("apps.api.views.sync.SYNC_PAGE_SIZE", 2)
+    def test_large_changes_are_paginated(self):
+        for _ in range(3):
+            self._create_transaction(self.account)
+
+        data = self._sync()
+        self.assertTrue(data["has_more"])
+        ids = self._ids(data, "transactions")
+
+        data = self._sync(data["cursor"])
+        self.assertFalse(data["has_more"])
+        ids += self._ids(data, "transactions")
+
+        self.assertEqual(
+            ids,
+            list(
+                Transaction.userless_all_objects.order_by("updated_at", "id")
+                .filter(account=self.account)
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_invalid_and_expired_cursors(self):
+        response = self.client.get("/api/sync/", {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+        with patch(
+            "apps.api.views.sync.timezone.now",
+            return_value=timezone.now() - timedelta(days=400),
+        ):
+            cursor = self._sync()["cursor"]
+
+        response = self.client.get("/api/sync/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 410)
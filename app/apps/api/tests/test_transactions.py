@@ -0,0 +1,395 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from cachalot.api import cachalot_disabled
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.common.middleware.thread_local import (
+    delete_current_user,
+    write_current_user,
+)
+from apps.currencies.models import Currency, ExchangeRate
+from apps.transactions.models import (
+    Transaction,
+    TransactionCategory,
+    TransactionEntity,
+    TransactionTag,
+)
+
+
+class TransactionListAPITests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.usd = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.eur = Currency.objects.create(
+            code="EUR", name="Euro", decimal_places=2, exchange_currency=self.usd
+        )
+        ExchangeRate.objects.create(
+            from_currency=self.eur,
+            to_currency=self.usd,
+            rate=Decimal("1.10"),
+            date=datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+        )
+        self.account = Account.objects.create(
+            name="Euros", currency=self.eur, owner=self.user
+        )
+
+    def _create_transactions(self, count):
+        for day in range(1, count + 1):
+            Transaction.objects.create(
+                account=self.account,
+                type=Transaction.Type.EXPENSE,
+                amount=Decimal("10"),
+                is_paid=True,
+                date=date(2025, 1, day),
+                owner=self.user,
+            )
+
+    def _count_list_queries(self):
+        with cachalot_disabled(), CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/transactions/")
+
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def test_exchanged_amounts_are_converted(self):
+        self._create_transactions(1)
+
+        response = self.client.get("/api/transactions/")
+
+        exchanged = response.json()["results"][0]["exchanged_amount"]
+        self.assertEqual(Decimal(str(exchanged["amount"])), Decimal("11"))
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        self._create_transactions(2)
+        queries, _ = self._count_list_queries()
+
+        self._create_transactions(20)
+        more_queries, data = self._count_list_queries()
+
+        self.assertEqual(len(data["results"]), 22)
+        self.assertEqual(more_queries, queries)
+
+    def test_cursor_pagination(self):
+        self._create_transactions(3)
+
+        response = self.client.get(
+            "/api/transactions/", {"pagination": "cursor", "page_size": 2}
+        )
+
+        data = response.json()
+        self.assertNotIn("count", data)
+        self.assertIsNone(data["previous"])
+        first_page = [transaction["id"] for transaction in data["results"]]
+
+        data = self.client.get(data["next"]).json()
+        ids = first_page + [transaction["id"] for transaction in data["results"]]
+        self.assertEqual(
+            ids, list(Transaction.objects.order_by("-id").values_list("id", flat=True))
+        )
+        self.assertIsNone(data["next"])
+
+    def test_sparse_fieldsets(self):
+        self._create_transactions(1)
+        full = self.client.get("/api/transactions/").json()["results"][0]
+
+        response = self.client.get(
+            "/api/transactions/", {"fields": "id,date,amount,account_id"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "id": full["id"],
+                    "date": full["date"],
+                    "amount": full["amount"],
+                    "account_id": self.account.id,
+                }
+            ],
+        )
+
+    def test_expanded_relations_match_the_full_representation(self):
+        self._create_transactions(1)
+        transaction = Transaction.objects.get()
+        transaction.category = TransactionCategory.objects.create(name="Food")
+        transaction.save()
+        transaction.tags.add(TransactionTag.objects.create(name="Groceries"))
+        full = self.client.get("/api/transactions/").json()["results"][0]
+
+        response = self.client.get(
+            "/api/transactions/",
+            {
+                "fields": "id,reference_date,tags",
+                "expand": "account,category,tags,entities,exchanged_amount",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["results"][0]
+        for name in data:
+            self.assertEqual(data[name], full[name], name)
+        self.assertEqual(
+            set(data),
+            {
+                "id",
+                "reference_date",
+                "tags",
+                "account",
+                "category",
+                "entities",
+                "exchanged_amount",
+            },
+        )
+
+    def test_sparse_fieldsets_with_cursor_pagination(self):
+        self._create_transactions(3)
+
+        data = self.client.get(
+            "/api/transactions/",
+            {"fields": "id", "pagination": "cursor", "page_size": 2},
+        ).json()
+        ids = [transaction["id"] for transaction in data["results"]]
+        data = self.client.get(data["next"]).json()
+        ids += [transaction["id"] for transaction in data["results"]]
+
+        self.assertEqual(
+            ids, list(Transaction.objects.order_by("-id").values_list("id", flat=True))
+        )
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get("/api/transactions/", {"fields": "id,secret"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.json())
+
+    def test_flat_query_count_does_not_grow_with_the_page(self):
+        def count_queries():
+            with cachalot_disabled(), CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    "/api/transactions/",
+                    {"expand": "account,category,tags,entities,exchanged_amount"},
+                )
+
+            self.assertEqual(response.status_code, 200)
+            return len(context.captured_queries), response.json()
+
+        self._create_transactions(2)
+        queries, _ = count_queries()
+
+        self._create_transactions(20)
+        more_queries, data = count_queries()
+
+        self.assertEqual(len(data["results"]), 22)
+        self.assertEqual(more_queries, queries)
+
+
+class TransactionBulkAPITests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123", is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+
+    def _item(self, day, **kwargs):
+        return {
+            "account_id": self.account.id,
+            "type": Transaction.Type.EXPENSE,
+            "amount": "10.00",
+            "is_paid": True,
+            "date": f"2025-01-{day:02d}",
+            "description": f"Transaction {day}",
+            "category": "Groceries",
+            "tags": ["Food"],
+            **kwargs,
+        }
+
+    def _create_transaction(self, day):
+        return Transaction.objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            amount=Decimal("10"),
+            is_paid=True,
+            date=date(2025, 1, day),
+            owner=self.user,
+        )
+
+    def test_bulk_create(self):
+        response = self.client.post(
+            "/api/transactions/bulk/",
+            [self._item(1), self._item(2, entities=["Market"])],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(
+            [item["description"] for item in data],
+            ["Transaction 1", "Transaction 2"],
+        )
+        self.assertEqual(data[0]["reference_date"], "2025-01")
+        self.assertEqual(TransactionCategory.objects.count(), 1)
+
+        transaction = Transaction.objects.get(id=data[1]["id"])
+        self.assertEqual(transaction.owner, self.user)
+        self.assertEqual(transaction.category.name, "Groceries")
+        self.assertEqual([tag.name for tag in transaction.tags.all()], ["Food"])
+        self.assertEqual(
+            [entity.name for entity in transaction.entities.all()], ["Market"]
+        )
+
+    def test_bulk_create_query_count_does_not_grow_with_the_batch(self):
+        def count_queries(count):
+            items = [self._item(day) for day in range(1, count + 1)]
+            with cachalot_disabled(), CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    "/api/transactions/bulk/", items, format="json"
+                )
+
+            self.assertEqual(response.status_code, 201)
+            return len(context.captured_queries)
+
+        # The first batch creates the category and tag
+        count_queries(1)
+        self.assertEqual(count_queries(20), count_queries(2))
+
+    def test_invalid_transaction_creates_nothing(self):
+        response = self.client.post(
+            "/api/transactions/bulk/",
+            [self._item(1), self._item(2, account_id=0)],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn("account_id", errors[1])
+        self.assertFalse(Transaction.objects.exists())
+        self.assertFalse(TransactionCategory.objects.exists())
+
+    def test_duplicate_internal_ids_are_rejected(self):
+        existing = self._create_transaction(1)
+        existing.internal_id = "taken"
+        existing.save()
+
+        response = self.client.post(
+            "/api/transactions/bulk/",
+            [
+                self._item(2, internal_id="taken"),
+                self._item(3, internal_id="new"),
+                self._item(4, internal_id="new"),
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertIn("internal_id", errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("internal_id", errors[2])
+
+    def test_bulk_update(self):
+        first = self._create_transaction(1)
+        second = self._create_transaction(2)
+
+        response = self.client.patch(
+            "/api/transactions/bulk/",
+            [
+                {"id": second.id, "amount": "25.50", "tags": ["Food"]},
+                {"id": first.id, "description": "Renamed"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.json()], [second.id, first.id]
+        )
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.description, "Renamed")
+        self.assertEqual(first.amount, Decimal("10"))
+        self.assertEqual(second.amount, Decimal("25.50"))
+        self.assertEqual([tag.name for tag in second.tags.all()], ["Food"])
+
+    def test_bulk_update_requires_known_ids(self):
+        transaction = self._create_transaction(1)
+
+        response = self.client.patch(
+            "/api/transactions/bulk/",
+            [
+                {"id": transaction.id, "description": "Renamed"},
+                {"id": transaction.id + 1000, "description": "Missing"},
+                {"description": "No ID"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn("id", errors[1])
+        self.assertIn("id", errors[2])
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.description, "")
+
+    def test_bulk_delete(self):
+        transactions = [self._create_transaction(day) for day in range(1, 4)]
+
+        response = self.client.delete(
+            "/api/transactions/bulk/",
+            {"ids": [transactions[0].id, transactions[1].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(
+            list(Transaction.objects.values_list("id", flat=True)),
+            [transactions[2].id],
+        )
+
+    @override_settings(ENABLE_SOFT_DELETE=False)
+    def test_bulk_delete_counts_only_transactions(self):
+        transactions = [self._create_transaction(day) for day in range(1, 3)]
+        tag = TransactionTag.objects.create(name="Food")
+        entity = TransactionEntity.objects.create(name="Market")
+        for transaction in transactions:
+            transaction.tags.add(tag)
+            transaction.entities.add(entity)
+
+        response = self.client.delete(
+            "/api/transactions/bulk/",
+            {"ids": [transaction.id for transaction in transactions]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertFalse(Transaction.all_objects.exists())
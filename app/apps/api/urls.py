@@ -19,6 +19,8 @@ router.register(r"dca/entries", views.DCAEntryViewSet)
 router.register(r"import/profiles", views.ImportProfileViewSet, basename="import-profiles")
 router.register(r"import/runs", views.ImportRunViewSet, basename="import-runs")
 router.register(r"import/import", views.ImportViewSet, basename="import-import")
+router.register(r"sync", views.SyncViewSet, basename="sync")
+router.register(r"insights", views.InsightsViewSet, basename="insights")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -3,4 +3,6 @@ from .accounts import *
 from .currencies import *
 from .dca import *
 from .imports import *
+from .insights import *
 
+from .sync import *
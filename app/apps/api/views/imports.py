@@ -1,14 +1,22 @@
 from django.core.files.storage import FileSystemStorage
+from django.db.models import Prefetch
+from django_filters import rest_framework as filters
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view, inline_serializer
 from rest_framework import serializers as drf_serializers
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.api.serializers import ImportFileSerializer, ImportProfileSerializer, ImportRunSerializer
-from apps.import_app.models import ImportProfile, ImportRun
+from apps.api.serializers import (
+    ImportFileSerializer,
+    ImportProfileSerializer,
+    ImportRunLogSerializer,
+    ImportRunSerializer,
+)
+from apps.import_app.models import ImportProfile, ImportRun, ImportRunLog
 from apps.import_app.tasks import process_import
 
 
@@ -38,6 +46,32 @@ class ImportProfileViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['name']
 
 
+class ImportRunFilterSet(filters.FilterSet):
+    # Log lines are rows now. Distinct, so a run with several matching lines is
+    # only listed once
+    logs = filters.CharFilter(
+        field_name="log_entries__message", lookup_expr="exact", distinct=True
+    )
+    logs__icontains = filters.CharFilter(
+        field_name="log_entries__message", lookup_expr="icontains", distinct=True
+    )
+
+    class Meta:
+        model = ImportRun
+        fields = {
+            'status': ['exact'],
+            'profile': ['exact'],
+            'file_name': ['exact', 'icontains'],
+            'processed_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
+            'total_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
+            'successful_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
+            'skipped_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
+            'failed_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
+            'started_at': ['exact', 'gte', 'lte', 'gt', 'lt', 'isnull'],
+            'finished_at': ['exact', 'gte', 'lte', 'gt', 'lt', 'isnull'],
+        }
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="List import runs",
@@ -54,29 +88,34 @@ class ImportProfileViewSet(viewsets.ReadOnlyModelViewSet):
     ),
     retrieve=extend_schema(
         summary="Get import run",
-        description="Returns the details of a specific import run by ID, including status and logs.",
+        description="Returns the details of a specific import run by ID, including status and the last log lines.",
+    ),
+    logs=extend_schema(
+        summary="List import run logs",
+        description="Returns a paginated list of the log entries of a specific import run.",
+        responses=ImportRunLogSerializer(many=True),
     ),
 )
 class ImportRunViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for listing and retrieving import runs."""
 
-    queryset = ImportRun.objects.all().order_by("-id")
+    queryset = (
+        ImportRun.objects.filter(parent__isnull=True)
+        .prefetch_related(
+            Prefetch(
+                "log_entries",
+                queryset=ImportRunLog.objects.order_by("-id")[
+                    : ImportRunSerializer.LOG_LINES
+                ],
+                to_attr="recent_log_entries",
+            )
+        )
+        .order_by("-id")
+    )
     serializer_class = ImportRunSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = {
-        'status': ['exact'],
-        'profile': ['exact'],
-        'file_name': ['exact', 'icontains'],
-        'logs': ['exact', 'icontains'],
-        'processed_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
-        'total_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
-        'successful_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
-        'skipped_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
-        'failed_rows': ['exact', 'gte', 'lte', 'gt', 'lt'],
-        'started_at': ['exact', 'gte', 'lte', 'gt', 'lt', 'isnull'],
-        'finished_at': ['exact', 'gte', 'lte', 'gt', 'lt', 'isnull'],
-    }
-    search_fields = ['file_name', 'logs']
+    filterset_class = ImportRunFilterSet
+    search_fields = ['file_name', 'log_entries__message']
     ordering_fields = '__all__'
     ordering = ['-id']
 
@@ -87,6 +126,13 @@ class ImportRunViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(profile_id=profile_id)
         return queryset
 
+    @action(detail=True, serializer_class=ImportRunLogSerializer, filter_backends=[])
+    def logs(self, request, pk=None):
+        import_run = self.get_object()
+        page = self.paginate_queryset(import_run.log_entries.all())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 @extend_schema_view(
     create=extend_schema(
@@ -0,0 +1,173 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django_filters import MultipleChoiceFilter
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.api.permissions import NotInDemoMode
+from apps.insights.utils.month_by_month import get_month_by_month_data
+from apps.net_worth.utils.calculate_net_worth import (
+    calculate_historical_currency_net_worth,
+)
+from apps.transactions.filters import TransactionsFilter
+from apps.transactions.models import Transaction
+from apps.transactions.utils.calculations import (
+    calculate_account_totals,
+    calculate_currency_totals,
+)
+from apps.transactions.utils.overview_cache import get_overview_data_version
+
+TRANSACTION_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name=name,
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description=filter_.label,
+        required=False,
+        many=isinstance(filter_, MultipleChoiceFilter),
+    )
+    for name, filter_ in TransactionsFilter.base_filters.items()
+]
+
+
+def _filtered_transactions(request):
+    filterset = TransactionsFilter(
+        request.query_params, queryset=Transaction.objects.all()
+    )
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+
+    return filterset.qs
+
+
+def _conditional_response(request, build):
+    """
+    Respond with `build()`, or with a 304 if the client already has it. The ETag
+    and Last-Modified come from the overview data version, so they only change
+    when the data the aggregations are built from does.
+    """
+    version, last_modified = get_overview_data_version(request.user)
+    etag = quote_etag(version)
+    last_modified = int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = Response(build())
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    # Clients have to check it's still fresh, costing a 304 if it is
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+class InsightsViewSet(viewsets.ViewSet):
+    """
+    Server-side aggregations of the transactions matching the same filters as
+    the transactions page, with ETag and Last-Modified support.
+    """
+
+    permission_classes = [NotInDemoMode, IsAuthenticated]
+
+    @extend_schema(
+        summary="Totals per currency",
+        description=(
+            "Income, expense and balance totals of the matching transactions "
+            "per currency, converted to their exchange currencies."
+        ),
+        parameters=TRANSACTION_FILTER_PARAMETERS,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, url_path="currency-totals")
+    def currency_totals(self, request):
+        transactions = _filtered_transactions(request)
+        return _conditional_response(
+            request,
+            lambda: calculate_currency_totals(transactions, ignore_empty=True),
+        )
+
+    @extend_schema(
+        summary="Totals per account",
+        description=(
+            "Income, expense and balance totals of the matching transactions "
+            "per account."
+        ),
+        parameters=TRANSACTION_FILTER_PARAMETERS,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, url_path="account-totals")
+    def account_totals(self, request):
+        transactions = _filtered_transactions(request)
+        return _conditional_response(
+            request, lambda: calculate_account_totals(transactions)
+        )
+
+    @extend_schema(
+        summary="Historical net worth",
+        description=(
+            "The cumulative balance per currency of the matching transactions, "
+            "month by month."
+        ),
+        parameters=TRANSACTION_FILTER_PARAMETERS,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, url_path="net-worth")
+    def net_worth(self, request):
+        transactions = _filtered_transactions(request)
+        return _conditional_response(
+            request, lambda: calculate_historical_currency_net_worth(transactions)
+        )
+
+    @extend_schema(
+        summary="Month by month",
+        description=(
+            "The monthly totals of the matching paid transactions of a year, "
+            "per category, tag or entity."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="year",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Defaults to the current year",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="group_by",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=["categories", "tags", "entities"],
+                required=False,
+            ),
+            *TRANSACTION_FILTER_PARAMETERS,
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, url_path="month-by-month")
+    def month_by_month(self, request):
+        transactions = _filtered_transactions(request)
+
+        year = request.query_params.get("year")
+        if year is not None and not year.isdigit():
+            raise ValidationError({"year": ["A valid year is required."]})
+
+        group_by = request.query_params.get("group_by", "categories")
+        if group_by not in ("categories", "tags", "entities"):
+            raise ValidationError(
+                {"group_by": ["Must be one of categories, tags or entities."]}
+            )
+
+        return _conditional_response(
+            request,
+            lambda: get_month_by_month_data(
+                year=int(year) if year is not None else None,
+                group_by=group_by,
+                queryset=transactions,
+            ),
+        )
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.accounts.models import Account
+from apps.api.models import Tombstone, get_tombstone_retention
+from apps.api.permissions import NotInDemoMode
+from apps.api.serializers import (
+    AccountSerializer,
+    TransactionCategorySerializer,
+    TransactionEntitySerializer,
+    TransactionSerializer,
+    TransactionTagSerializer,
+)
+from apps.common.utils.visibility import get_accessible_ids
+from apps.transactions.models import (
+    Transaction,
+    TransactionCategory,
+    TransactionEntity,
+    TransactionTag,
+)
+from apps.transactions.utils.keyset_pagination import (
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+)
+
+SYNC_PAGE_SIZE = 500
+
+# Rows written this recently are left for the next sync, so one saved with an
+# earlier timestamp by a slower, still running transaction isn't skipped
+SYNC_LAG = timedelta(seconds=10)
+
+SYNCED_MODELS = {
+    "accounts": (Account, AccountSerializer),
+    "categories": (TransactionCategory, TransactionCategorySerializer),
+    "tags": (TransactionTag, TransactionTagSerializer),
+    "entities": (TransactionEntity, TransactionEntitySerializer),
+    "transactions": (Transaction, TransactionSerializer),
+}
+
+STREAMS = [*SYNCED_MODELS, "deleted_transactions", "tombstones"]
+
+TOMBSTONE_STREAMS = {
+    model._meta.label_lower: name for name, (model, _) in SYNCED_MODELS.items()
+}
+
+
+def _changed(name):
+    model = SYNCED_MODELS[name][0]
+    queryset = model.objects.all()
+    if model is Account:
+        queryset = queryset.select_related("group", "currency", "exchange_currency")
+    elif model is Transaction:
+        queryset = queryset.select_related(
+            "account",
+            "account__group",
+            "account__currency",
+            "account__exchange_currency",
+            "category",
+        ).prefetch_related("tags", "entities")
+
+    return queryset.order_by("updated_at", "id")
+
+
+def _tombstones(user):
+    visible = Q(user_ids__isnull=True) | Q(user_ids__contains=[user.pk])
+    deleted_accounts = Tombstone.objects.filter(
+        visible, model=Account._meta.label_lower
+    ).values("object_id")
+
+    return Tombstone.objects.filter(
+        (Q(account_id__isnull=True) & visible)
+        | Q(account_id__in=get_accessible_ids(Account, user))
+        | Q(account_id__in=deleted_accounts)
+    ).order_by("deleted_at", "id")
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Incremental sync of accounts, categories, tags, entities and transactions."""
+
+    permission_classes = [NotInDemoMode, IsAuthenticated]
+
+    @extend_schema(
+        summary="Sync changes",
+        description=(
+            "Returns what changed since `cursor`: the created or updated objects "
+            "under `changed` and the IDs of the deleted (or unshared) ones under "
+            "`deleted`, per type. Without a cursor everything is returned and "
+            "nothing is deleted. Call again with the returned `cursor` while "
+            "`has_more` is true, and later on to get the next changes. Apply "
+            "`deleted` before `changed`, and drop an account's transactions when "
+            "the account is deleted. An expired cursor returns 410, sync from "
+            "scratch then."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="The cursor returned by the previous sync",
+                required=False,
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def list(self, request):
+        now = timezone.now()
+        until = now - SYNC_LAG
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            positions = decode_cursor(cursor, 1 + len(STREAMS))
+            retention = get_tombstone_retention()
+            try:
+                issued_at, *positions = positions
+                expired = (
+                    retention is not None
+                    and datetime.fromisoformat(issued_at) < now - retention
+                )
+            except (TypeError, ValueError):
+                return Response(
+                    {"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if expired:
+                return Response(
+                    {"detail": "Cursor expired, sync from scratch."},
+                    status=status.HTTP_410_GONE,
+                )
+        else:
+            # Deletions before the first sync don't concern the client
+            after_now = encode_cursor([until, 0])
+            positions = [
+                after_now if name in ("deleted_transactions", "tombstones") else None
+                for name in STREAMS
+            ]
+
+        context = {"request": request}
+        changed = {}
+        deleted = {name: [] for name in SYNCED_MODELS}
+        next_positions = []
+        has_more = False
+
+        for name, position in zip(STREAMS, positions):
+            if name in SYNCED_MODELS:
+                queryset = _changed(name).filter(updated_at__lte=until)
+            elif name == "deleted_transactions":
+                queryset = Transaction.deleted_objects.filter(
+                    deleted_at__lte=until
+                ).order_by("deleted_at", "id")
+            else:
+                queryset = _tombstones(request.user).filter(deleted_at__lte=until)
+
+            page = paginate_keyset(queryset, position, per_page=SYNC_PAGE_SIZE)
+            next_positions.append(page.end_cursor)
+            has_more = has_more or page.has_next()
+
+            if name in SYNCED_MODELS:
+                serializer_class = SYNCED_MODELS[name][1]
+                changed[name] = serializer_class(
+                    page.object_list, many=True, context=context
+                ).data
+            elif name == "deleted_transactions":
+                deleted["transactions"] += [obj.pk for obj in page]
+            else:
+                for tombstone in page:
+                    deleted[TOMBSTONE_STREAMS[tombstone.model]].append(
+                        tombstone.object_id
+                    )
+
+        return Response(
+            {
+                "cursor": encode_cursor([now, *next_positions]),
+                "has_more": has_more,
+                "changed": changed,
+                "deleted": deleted,
+            }
+        )
@@ -1,8 +1,15 @@
 from copy import deepcopy
 
-from rest_framework import viewsets
+from django.db import transaction as db_transaction
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from apps.api.custom.pagination import CursorOrPageNumberPagination
+from apps.api.fields.transactions import TransactionLookups
 from apps.api.serializers import (
+    TransactionFlatSerializer,
     TransactionSerializer,
     TransactionCategorySerializer,
     TransactionTagSerializer,
@@ -20,10 +27,37 @@ from apps.transactions.models import (
 )
 from apps.rules.signals import transaction_updated, transaction_created
 
+BULK_MAX_ITEMS = 5000
+
+
+def _get_list_param(request, name, choices):
+    values = [
+        value.strip()
+        for param in request.query_params.getlist(name)
+        for value in param.split(",")
+        if value.strip()
+    ]
+    invalid = [value for value in values if value not in choices]
+    if invalid:
+        raise serializers.ValidationError(
+            {name: [f"Unknown values: {', '.join(invalid)}."]}
+        )
+
+    return values
+
+
+class TransactionBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
 
 class TransactionViewSet(viewsets.ModelViewSet):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
+    pagination_class = CursorOrPageNumberPagination
     filterset_fields = {
         "account": ["exact"],
         "type": ["exact"],
@@ -51,7 +85,67 @@ class TransactionViewSet(viewsets.ModelViewSet):
     ordering = ["-id"]
 
     def get_queryset(self):
-        return Transaction.objects.all()
+        return Transaction.objects.select_related(
+            "account",
+            "account__group",
+            "account__currency",
+            "account__exchange_currency",
+            "category",
+        ).prefetch_related("tags", "entities")
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Comma-separated fields to return, with relations as IDs: "
+                    f"{', '.join(TransactionFlatSerializer.FIELDS)}. Returns a "
+                    "lighter, flat representation of the transactions."
+                ),
+                required=False,
+            ),
+            OpenApiParameter(
+                name="expand",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Comma-separated relations to return in full in the flat "
+                    f"representation: {', '.join(TransactionFlatSerializer.EXPANDABLE)}."
+                ),
+                required=False,
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        if not {"fields", "expand"} & request.query_params.keys():
+            return super().list(request, *args, **kwargs)
+
+        fields = _get_list_param(request, "fields", TransactionFlatSerializer.FIELDS)
+        expand = _get_list_param(
+            request, "expand", TransactionFlatSerializer.EXPANDABLE
+        )
+
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .prefetch_related(None)
+            .values(*TransactionFlatSerializer.COLUMNS)
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = TransactionFlatSerializer(
+            page if page is not None else queryset,
+            many=True,
+            fields=fields,
+            expand=expand,
+            context=self.get_serializer_context(),
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
         instance = serializer.save()
@@ -66,6 +160,93 @@ class TransactionViewSet(viewsets.ModelViewSet):
         kwargs["partial"] = True
         return self.update(request, *args, **kwargs)
 
+    @extend_schema(
+        methods=["POST"],
+        summary="Create transactions in bulk",
+        description=(
+            f"Creates up to {BULK_MAX_ITEMS} transactions at once. Nothing is "
+            "created if any of them is invalid, the errors are returned in the "
+            "same order as the transactions."
+        ),
+        request=TransactionSerializer(many=True),
+        responses={201: TransactionSerializer(many=True)},
+    )
+    @extend_schema(
+        methods=["PATCH"],
+        summary="Update transactions in bulk",
+        description=(
+            f"Partially updates up to {BULK_MAX_ITEMS} transactions at once, "
+            "each identified by its `id`. Nothing is updated if any of them is "
+            "invalid."
+        ),
+        request=TransactionSerializer(many=True, partial=True),
+        responses={200: TransactionSerializer(many=True)},
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        summary="Delete transactions in bulk",
+        description=f"Deletes up to {BULK_MAX_ITEMS} transactions by ID at once.",
+        request=TransactionBulkDeleteSerializer,
+        responses={
+            200: {"type": "object", "properties": {"deleted": {"type": "integer"}}}
+        },
+    )
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        with db_transaction.atomic():
+            if request.method == "DELETE":
+                return self._bulk_delete(request)
+            return self._bulk_write(request)
+
+    def _bulk_write(self, request):
+        items = request.data if isinstance(request.data, list) else []
+        instances = None
+        if request.method == "PATCH":
+            ids = [
+                item["id"]
+                for item in items
+                if isinstance(item, dict) and isinstance(item.get("id"), int)
+            ]
+            instances = self.get_queryset().filter(id__in=ids[:BULK_MAX_ITEMS])
+
+        serializer = self.get_serializer(
+            instances,
+            data=request.data,
+            many=True,
+            partial=instances is not None,
+            max_length=BULK_MAX_ITEMS,
+            context={
+                **self.get_serializer_context(),
+                "lookups": TransactionLookups(items),
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        saved = serializer.save()
+
+        # Read them back like the list does, with their relations loaded
+        fetched = self.get_queryset().in_bulk([obj.pk for obj in saved])
+        data = self.get_serializer([fetched[obj.pk] for obj in saved], many=True).data
+
+        return Response(
+            data,
+            status=(
+                status.HTTP_200_OK if instances is not None else status.HTTP_201_CREATED
+            ),
+        )
+
+    def _bulk_delete(self, request):
+        serializer = TransactionBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        transactions = Transaction.objects.filter(
+            id__in=serializer.validated_data["ids"]
+        )
+        # delete() also counts the cascaded tag, entity and DCA rows
+        deleted = transactions.count()
+        transactions.delete()
+
+        return Response({"deleted": deleted})
+
 
 class TransactionCategoryViewSet(viewsets.ModelViewSet):
     queryset = TransactionCategory.objects.all()
@@ -14,7 +14,7 @@ def get_transactions_by_day(year, month):
 
     # Get all transactions for the month
     transactions = Transaction.objects.filter(
-        date__year=year, date__month=month
+        date__gte=first_day, date__lte=last_day
     ).order_by(
         "date",
         "-type",
@@ -1,15 +1,19 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.utils.visibility import clear_accessible_ids
+
 
 @admin.action(description=_("Make public"))
 def make_public(modeladmin, request, queryset):
     queryset.update(visibility="public")
+    clear_accessible_ids(queryset.model)
 
 
 @admin.action(description=_("Make private"))
 def make_private(modeladmin, request, queryset):
     queryset.update(visibility="private")
+    clear_accessible_ids(queryset.model)
 
 
 class SharedObjectModelAdmin(admin.ModelAdmin):
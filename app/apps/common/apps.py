@@ -26,3 +26,4 @@ class CommonConfig(AppConfig):
 
         # Register system checks for required environment variables
         from apps.common import checks  # noqa: F401
+        import apps.common.signals  # noqa: F401
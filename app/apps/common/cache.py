@@ -0,0 +1,203 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+CACHALOT_TABLE_KEY_PREFIX = "cachalot-table:"
+
+_MISSING = object()
+
+
+def get_table_cache_key(db_alias, table):
+    """
+    CACHALOT_TABLE_KEYGEN with a recognizable prefix, so TieredCache can always
+    read table invalidation timestamps from the shared cache.
+    """
+    digest = hashlib.sha1(f"{db_alias}:{table}".encode()).hexdigest()
+    return f"{CACHALOT_TABLE_KEY_PREFIX}{digest}"
+
+
+class TieredCache(BaseCache):
+    """
+    An in-process LRU in front of another configured cache.
+
+    LOCATION is the alias of the shared cache. Values read from or written to it
+    are also kept in a small per-process LRU for at most LOCAL_TIMEOUT seconds,
+    so hot entries like cachalot query results don't cost a round trip (or a
+    disk read) every time.
+
+    Other processes don't see this tier, so anything that invalidates other
+    entries must never be served from it. Keys starting with one of the
+    READ_THROUGH_PREFIXES always go to the shared cache: cachalot's table
+    timestamps and version keys, which makes every stale local entry they guard
+    be ignored as soon as it's invalidated anywhere.
+
+    OPTIONS:
+        LOCAL_MAX_ENTRIES: entries kept in the local tier (default 1000).
+        LOCAL_TIMEOUT: seconds a local entry is trusted for (default 60).
+        READ_THROUGH_PREFIXES: key prefixes never kept locally.
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get("OPTIONS", {}))
+        self._shared_alias = location
+        self._local_max_entries = int(options.pop("LOCAL_MAX_ENTRIES", 1000))
+        self._local_timeout = int(options.pop("LOCAL_TIMEOUT", 60))
+        self._read_through_prefixes = tuple(
+            options.pop("READ_THROUGH_PREFIXES", (CACHALOT_TABLE_KEY_PREFIX,))
+        )
+        super().__init__({**params, "OPTIONS": options})
+
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    # Local tier
+
+    def _is_local(self, key) -> bool:
+        return self._local_max_entries > 0 and not key.startswith(
+            self._read_through_prefixes
+        )
+
+    def _local_key(self, key, version):
+        return key, self.version if version is None else version
+
+    def _local_get(self, key, version):
+        local_key = self._local_key(key, version)
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return _MISSING
+
+            expires, pickled = entry
+            if expires <= time.monotonic():
+                del self._local[local_key]
+                return _MISSING
+
+            self._local.move_to_end(local_key)
+
+        return pickle.loads(pickled)
+
+    def _local_set(self, key, value, version, timeout=DEFAULT_TIMEOUT):
+        if not self._is_local(key):
+            return
+
+        local_timeout = self._local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            local_timeout = min(local_timeout, timeout)
+        if local_timeout <= 0:
+            self._local_delete(key, version)
+            return
+
+        # Stored pickled, like LocMemCache, so callers can't mutate cached values
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        local_key = self._local_key(key, version)
+        with self._lock:
+            self._local[local_key] = (time.monotonic() + local_timeout, pickled)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key, version):
+        with self._lock:
+            self._local.pop(self._local_key(key, version), None)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        if self._is_local(key):
+            value = self._local_get(key, version)
+            if value is not _MISSING:
+                return value
+
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+
+        self._local_set(key, value, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote_keys = []
+        for key in keys:
+            value = self._local_get(key, version) if self._is_local(key) else _MISSING
+            if value is _MISSING:
+                remote_keys.append(key)
+            else:
+                found[key] = value
+
+        if remote_keys:
+            remote = self.shared.get_many(remote_keys, version=version)
+            for key, value in remote.items():
+                self._local_set(key, value, version)
+            found.update(remote)
+
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._local_set(key, value, version, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed_keys = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key in failed_keys:
+                self._local_delete(key, version)
+            else:
+                self._local_set(key, value, version, timeout)
+
+        return failed_keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local_set(key, value, version, timeout)
+        else:
+            # Someone else holds the key, whatever we had locally may be stale
+            self._local_delete(key, version)
+
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._local_delete(key, version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._local_delete(key, version)
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        if self._is_local(key) and self._local_get(key, version) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local_delete(key, version)
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._local_delete(key, version)
+        return self.shared.decr(key, delta, version=version)
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
@@ -2,12 +2,15 @@
 Django System Checks for required environment variables.
 
 This module validates that required environment variables (those without defaults)
-are present before the application starts.
+are present before the application starts, and that the cache configuration is
+supported.
 """
 
 import os
 
-from django.core.checks import Error, register
+from cachalot.settings import SUPPORTED_CACHE_BACKENDS, cachalot_settings
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
 
 
 # List of environment variables that are required (no default values)
@@ -23,6 +26,8 @@ INT_ENV_VARS = [
     ("SESSION_EXPIRY_TIME", "The age of session cookies, in seconds."),
     ("INTERNAL_PORT", "The port on which the app listens on."),
     ("DJANGO_VITE_DEV_SERVER_PORT", "The port where Vite's dev server is running"),
+    ("CACHE_LOCAL_MAX_ENTRIES", "How many entries each process keeps in memory."),
+    ("CACHE_LOCAL_TIMEOUT", "How long, in seconds, in-memory entries are trusted."),
 ]
 
 
@@ -101,3 +106,28 @@ def check_soft_delete_config(app_configs, **kwargs):
                 )
 
     return errors
+
+
+@register(Tags.caches, Tags.compatibility)
+def check_tiered_cache_compatibility(app_configs, **kwargs):
+    """
+    Run cachalot's cache backend check against the shared cache a TieredCache
+    wraps, since cachalot.W001 is silenced for the TieredCache itself.
+
+    Returns a list of Warning objects if the shared cache isn't supported.
+    """
+    cache = settings.CACHES[cachalot_settings.CACHALOT_CACHE]
+    if cache["BACKEND"] != "apps.common.cache.TieredCache":
+        return []
+
+    shared_backend = settings.CACHES[cache["LOCATION"]]["BACKEND"]
+    if shared_backend not in SUPPORTED_CACHE_BACKENDS:
+        return [
+            Warning(
+                f"Cache backend '{shared_backend}' is not supported by django-cachalot.",
+                hint="Set CACHE_BACKEND to locmem, file, memcached or redis.",
+                id="wygiwyh.W001",
+            )
+        ]
+
+    return []
@@ -15,3 +15,15 @@ def remaining_days_in_month(year, month, current_date: datetime.date):
         remaining_days = days_in_month
 
     return remaining_days
+
+
+def month_bounds(year, month) -> tuple[datetime.date, datetime.date]:
+    """
+    Return the first and last day of a month.
+
+    Filtering with these bounds (`__gte`/`__lte`) instead of `__year`/`__month`
+    lets the database use the date indexes.
+    """
+    _, days_in_month = calendar.monthrange(year, month)
+
+    return datetime.date(year, month, 1), datetime.date(year, month, days_in_month)
@@ -0,0 +1,157 @@
+import shutil
+import tempfile
+import time
+
+from cachalot.api import cachalot_disabled, invalidate
+from cachalot.settings import cachalot_settings
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.currencies.models import Currency
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how long a query cached by cachalot takes to be served on a hit "
+        "and on a miss for each cache backend, with and without the in-process "
+        "tier."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "backends",
+            nargs="*",
+            default=["locmem", "file"],
+            help=(
+                "Backends to measure, any of "
+                f"{', '.join(settings.CACHE_BACKENDS)}. Defaults to locmem and file."
+            ),
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Queries run for each measurement.",
+        )
+        parser.add_argument(
+            "--memcached-location",
+            default="127.0.0.1:11211",
+            help="Server used for the memcached backend.",
+        )
+        parser.add_argument(
+            "--redis-location",
+            default="redis://127.0.0.1:6379/0",
+            help="Server used for the redis backend.",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["backends"]) - set(settings.CACHE_BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(sorted(unknown))}.")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        iterations = options["iterations"]
+        directory = tempfile.mkdtemp(prefix="wygiwyh-cache-benchmark-")
+        locations = {
+            "locmem": "wygiwyh-cache-benchmark",
+            "file": directory,
+            "memcached": options["memcached_location"],
+            "redis": options["redis_location"],
+        }
+
+        try:
+            self._write_row("backend", "hit avg", "hit p95", "miss avg", "miss p95")
+            self._write_timings("database", self._measure_database(iterations))
+
+            for backend in options["backends"]:
+                configs = {
+                    "shared": {
+                        "BACKEND": settings.CACHE_BACKENDS[backend],
+                        "LOCATION": locations[backend],
+                    }
+                }
+                self._benchmark(backend, configs, iterations)
+
+                if backend != "locmem":
+                    configs["default"] = {
+                        "BACKEND": "apps.common.cache.TieredCache",
+                        "LOCATION": "shared",
+                        "OPTIONS": {
+                            "LOCAL_MAX_ENTRIES": settings.CACHE_LOCAL_MAX_ENTRIES
+                            or 1000,
+                            "LOCAL_TIMEOUT": settings.CACHE_LOCAL_TIMEOUT,
+                        },
+                    }
+                    self._benchmark(f"{backend} + local", configs, iterations)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _benchmark(self, name, configs, iterations):
+        configs.setdefault("default", configs["shared"])
+        previous_cache = cachalot_settings.CACHALOT_CACHE
+        try:
+            with override_settings(CACHES=configs):
+                cachalot_settings.CACHALOT_CACHE = "default"
+                timings = self._measure_cachalot(iterations)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"{name}: {e}"))
+            return
+        finally:
+            cachalot_settings.CACHALOT_CACHE = previous_cache
+
+        self._write_timings(name, timings)
+
+    @staticmethod
+    def _query():
+        return list(Currency.objects.order_by("id"))
+
+    def _measure_database(self, iterations):
+        with cachalot_disabled():
+            timings = self._time(self._query, iterations)
+
+        return timings, timings
+
+    def _measure_cachalot(self, iterations):
+        invalidate(Currency, cache_alias="default")
+        self._query()
+        hits = self._time(self._query, iterations)
+
+        misses = []
+        for _ in range(iterations):
+            invalidate(Currency, cache_alias="default")
+            misses.extend(self._time(self._query, 1))
+
+        invalidate(Currency, cache_alias="default")
+        return hits, misses
+
+    @staticmethod
+    def _time(func, iterations) -> list[float]:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        return timings
+
+    def _write_timings(self, name, timings):
+        hits, misses = timings
+        self._write_row(
+            name,
+            *(
+                f"{value:.3f} ms"
+                for values in (hits, misses)
+                for value in (sum(values) / len(values), self._p95(values))
+            ),
+        )
+
+    def _write_row(self, *columns):
+        name, *values = columns
+        self.stdout.write(f"{name:<20}" + "".join(f"{v:>14}" for v in values))
+
+    @staticmethod
+    def _p95(values) -> float:
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * 0.95))]
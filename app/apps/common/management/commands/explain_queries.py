@@ -0,0 +1,139 @@
+from cachalot.api import cachalot_disabled
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.common.functions.dates import month_bounds
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the query plans of the main overview queries, so missing or unused "
+        "indexes are easy to spot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "email", help="WYGIWYH user whose visibility rules are applied."
+        )
+        parser.add_argument(
+            "--year",
+            type=int,
+            default=None,
+            help="Year to query. Defaults to the current year.",
+        )
+        parser.add_argument(
+            "--month",
+            type=int,
+            default=None,
+            help="Month to query. Defaults to the current month.",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries and include actual timings (EXPLAIN ANALYZE).",
+        )
+
+    def handle(self, *args, **options):
+        email = options["email"].strip()
+        today = timezone.localdate(timezone.now())
+        year = options["year"] or today.year
+        month = options["month"] or today.month
+
+        if not 1 <= month <= 12:
+            raise CommandError("--month must be between 1 and 12.")
+
+        user = get_user_model().objects.filter(email__iexact=email).first()
+        if user is None:
+            raise CommandError(f"No WYGIWYH user exists for '{email}'.")
+
+        write_current_user(user)
+        try:
+            with cachalot_disabled():
+                for name, queryset in self._get_queries(year, month, today):
+                    self.stdout.write(self.style.MIGRATE_HEADING(name))
+                    self.stdout.write(queryset.explain(analyze=options["analyze"]))
+                    self.stdout.write("")
+        finally:
+            delete_current_user()
+
+    @staticmethod
+    def _get_queries(year, month, today):
+        month_start, month_end = month_bounds(year, month)
+        monthly = Transaction.objects.filter(
+            reference_date__gte=month_start, reference_date__lte=month_end
+        )
+        totals = {
+            "expense_current": Sum(
+                "amount", filter=Q(type=Transaction.Type.EXPENSE, is_paid=True)
+            ),
+            "expense_projected": Sum(
+                "amount", filter=Q(type=Transaction.Type.EXPENSE, is_paid=False)
+            ),
+            "income_current": Sum(
+                "amount", filter=Q(type=Transaction.Type.INCOME, is_paid=True)
+            ),
+            "income_projected": Sum(
+                "amount", filter=Q(type=Transaction.Type.INCOME, is_paid=False)
+            ),
+        }
+
+        return [
+            (
+                "Monthly overview: transactions list",
+                monthly.select_related("account", "category").order_by("date", "id"),
+            ),
+            (
+                "Monthly overview: late transactions",
+                monthly.filter(date__lt=today, is_paid=False).order_by("date", "id"),
+            ),
+            (
+                "Monthly overview: currency summary",
+                monthly.values("account__currency").annotate(**totals).order_by(),
+            ),
+            (
+                "Monthly overview: account summary",
+                monthly.values("account").annotate(**totals).order_by(),
+            ),
+            (
+                "Yearly overview",
+                Transaction.objects.filter(reference_date__year=year)
+                .values("account")
+                .annotate(**totals)
+                .order_by(),
+            ),
+            (
+                "Calendar",
+                Transaction.objects.filter(
+                    date__gte=month_start, date__lte=month_end
+                ).order_by("date", "-type", "-is_paid", "id"),
+            ),
+            (
+                "Account balances",
+                Transaction.objects.filter(is_paid=True)
+                .values("account", "type")
+                .annotate(total=Sum("amount"))
+                .order_by(),
+            ),
+            (
+                "Net worth",
+                Transaction.objects.filter(is_paid=True)
+                .annotate(month=TruncMonth("reference_date"))
+                .values("account__currency__name", "month")
+                .annotate(
+                    balance=Sum(
+                        Case(
+                            When(type=Transaction.Type.INCOME, then=F("amount")),
+                            When(type=Transaction.Type.EXPENSE, then=-F("amount")),
+                            default=Value(0),
+                            output_field=DecimalField(),
+                        )
+                    )
+                )
+                .order_by("month", "account__currency__name"),
+            ),
+        ]
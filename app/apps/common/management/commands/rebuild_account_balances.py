@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import Account
+from apps.accounts.services import rebuild_account_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the monthly account balances from transactions. Use it to repair "
+        "balances after transactions were changed outside of WYGIWYH."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--account",
+            type=int,
+            action="append",
+            dest="accounts",
+            help="Only rebuild the account with this id. Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        accounts = None
+        if options["accounts"]:
+            accounts = list(Account.all_objects.filter(id__in=options["accounts"]))
+            missing = set(options["accounts"]) - {account.id for account in accounts}
+            if missing:
+                raise CommandError(
+                    f"No account exists with id {', '.join(map(str, sorted(missing)))}."
+                )
+
+        count = rebuild_account_balances(accounts=accounts)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {count} monthly account balance(s).")
+        )
@@ -4,6 +4,7 @@ from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.middleware.thread_local import get_current_user
+from apps.common.utils.visibility import get_accessible_ids
 
 
 class SharedObjectManager(models.Manager):
@@ -13,12 +14,7 @@ class SharedObjectManager(models.Manager):
         base_qs = super().get_queryset()
 
         if user and user.is_authenticated:
-            return base_qs.filter(
-                Q(visibility="public")
-                | Q(owner=user)
-                | Q(shared_with=user)
-                | Q(visibility="private", owner=None)
-            ).distinct()
+            return base_qs.filter(id__in=get_accessible_ids(self.model, user))
 
         return base_qs.filter(visibility="public")
 
@@ -0,0 +1,23 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.models import SharedObject
+from apps.common.utils.visibility import clear_accessible_ids
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def shared_object_changed_receiver(sender, instance, **kwargs):
+    if isinstance(instance, SharedObject):
+        clear_accessible_ids(type(instance))
+
+
+@receiver(m2m_changed)
+def shared_object_sharing_changed_receiver(sender, instance, action, model, **kwargs):
+    if not action.startswith("post_"):
+        return
+
+    if isinstance(instance, SharedObject):
+        clear_accessible_ids(type(instance))
+    elif issubclass(model, SharedObject):
+        clear_accessible_ids(model)
@@ -0,0 +1,135 @@
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.common.cache import get_table_cache_key
+from apps.common.checks import check_tiered_cache_compatibility
+
+TIERED_CACHES = {
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiered-cache-tests",
+    },
+    "default": {
+        "BACKEND": "apps.common.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "LOCAL_MAX_ENTRIES": 2,
+            "LOCAL_TIMEOUT": 60,
+            "READ_THROUGH_PREFIXES": ("cachalot-table:", "version:"),
+        },
+    },
+}
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches["default"]
+        self.shared = caches["shared"]
+        self.cache.clear()
+
+    def test_values_are_written_to_both_tiers(self):
+        self.cache.set("key", {"a": 1})
+
+        self.assertEqual(self.shared.get("key"), {"a": 1})
+        self.shared.delete("key")
+        self.assertEqual(self.cache.get("key"), {"a": 1})
+
+    def test_shared_reads_are_kept_locally(self):
+        self.shared.set("key", "value")
+
+        self.assertEqual(self.cache.get_many(["key", "missing"]), {"key": "value"})
+        self.shared.delete("key")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_local_values_cant_be_mutated(self):
+        self.cache.set("key", ["a"])
+
+        self.cache.get("key").append("b")
+
+        self.assertEqual(self.cache.get("key"), ["a"])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.shared.clear()
+
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": 1, "c": 3})
+
+    def test_read_through_keys_always_come_from_the_shared_cache(self):
+        table_key = get_table_cache_key("default", "transactions_transaction")
+        self.cache.set_many({table_key: 1, "version:1": 1})
+        self.shared.set_many({table_key: 2, "version:1": 2})
+
+        self.assertEqual(self.cache.get(table_key), 2)
+        self.assertEqual(
+            self.cache.get_many([table_key, "version:1"]),
+            {table_key: 2, "version:1": 2},
+        )
+
+    def test_deletes_reach_both_tiers(self):
+        self.cache.set("key", "value")
+
+        self.cache.delete("key")
+
+        self.assertIsNone(self.shared.get("key"))
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_non_positive_timeouts_arent_kept_locally(self):
+        self.cache.set("key", "value")
+        self.cache.set("key", "value", timeout=0)
+
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_incr_goes_to_the_shared_cache(self):
+        self.cache.set("counter", 1)
+        self.shared.incr("counter")
+
+        self.assertEqual(self.cache.incr("counter"), 3)
+        self.assertEqual(self.cache.get("counter"), 3)
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class BenchmarkCacheCommandTests(TestCase):
+    def test_prints_timings_for_each_backend(self):
+        out = StringIO()
+
+        call_command("benchmark_cache", "locmem", "file", iterations=2, stdout=out)
+
+        output = out.getvalue()
+        for name in ["database", "locmem", "file", "file + local"]:
+            self.assertIn(f"\n{name} ", output)
+        self.assertIn("ms", output)
+
+    def test_rejects_unknown_backends(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_cache", "floppy", stdout=StringIO())
+
+
+class TieredCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES=TIERED_CACHES)
+    def test_supported_shared_cache(self):
+        self.assertEqual(check_tiered_cache_compatibility(None), [])
+
+    @override_settings(
+        CACHES={
+            **TIERED_CACHES,
+            "shared": {"BACKEND": "myproject.cache.UnknownCache"},
+        }
+    )
+    def test_unsupported_shared_cache(self):
+        warnings = check_tiered_cache_compatibility(None)
+
+        self.assertEqual([warning.id for warning in warnings], ["wygiwyh.W001"])
+        self.assertIn("myproject.cache.UnknownCache", warnings[0].msg)
+
+    @override_settings(CACHES={"default": {"BACKEND": "myproject.cache.UnknownCache"}})
+    def test_other_caches_are_left_to_cachalot(self):
+        self.assertEqual(check_tiered_cache_compatibility(None), [])
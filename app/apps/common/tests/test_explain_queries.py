@@ -0,0 +1,46 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from apps.common.functions.dates import month_bounds
+
+
+class MonthBoundsTests(SimpleTestCase):
+    def test_returns_first_and_last_day(self):
+        self.assertEqual(month_bounds(2024, 2), (date(2024, 2, 1), date(2024, 2, 29)))
+        self.assertEqual(
+            month_bounds(2025, 12), (date(2025, 12, 1), date(2025, 12, 31))
+        )
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="explain@example.com", password="testpass123"
+        )
+
+    def test_prints_a_plan_for_each_query(self):
+        out = StringIO()
+
+        call_command(
+            "explain_queries", "explain@example.com", year=2025, month=1, stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn("Monthly overview: transactions list", output)
+        self.assertIn("Net worth", output)
+        self.assertIn("Scan", output)
+
+    def test_rejects_unknown_users(self):
+        with self.assertRaises(CommandError):
+            call_command("explain_queries", "nobody@example.com", stdout=StringIO())
+
+    def test_rejects_invalid_months(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "explain_queries", "explain@example.com", month=13, stdout=StringIO()
+            )
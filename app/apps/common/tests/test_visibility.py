@@ -0,0 +1,80 @@
+from cachalot.api import cachalot_disabled
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from apps.accounts.models import Account
+from apps.common.middleware.thread_local import ThreadLocalMiddleware
+from apps.common.utils.visibility import get_accessible_ids
+from apps.currencies.models import Currency
+from apps.transactions.models import Transaction, TransactionTag
+
+
+class AccessibleIdsTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        User = get_user_model()
+        self.user = User.objects.create_user(email="one@test.com", password="x")
+        self.other_user = User.objects.create_user(email="two@test.com", password="x")
+        currency = Currency.objects.create(code="USD", name="US Dollar")
+        self.account = Account.objects.create(
+            name="Mine", currency=currency, owner=self.user
+        )
+        self.public_account = Account.objects.create(
+            name="Public", currency=currency, owner=self.other_user, visibility="public"
+        )
+        self.other_account = Account.objects.create(
+            name="Theirs", currency=currency, owner=self.other_user
+        )
+
+    def _in_request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        middleware = ThreadLocalMiddleware(lambda request: HttpResponse())
+        middleware.process_request(request)
+        self.addCleanup(middleware.process_response, request, HttpResponse())
+
+    def test_outside_requests_a_subquery_is_used(self):
+        ids = get_accessible_ids(Account, self.user)
+
+        self.assertCountEqual(
+            ids.values_list("id", flat=True), [self.account.id, self.public_account.id]
+        )
+
+    def test_ids_are_loaded_once_per_request(self):
+        self._in_request()
+
+        with cachalot_disabled(), self.assertNumQueries(1):
+            ids = get_accessible_ids(Account, self.user)
+            get_accessible_ids(Account, self.user)
+
+        self.assertEqual(ids, sorted([self.account.id, self.public_account.id]))
+
+    def test_sharing_changes_reload_the_ids(self):
+        self._in_request()
+        get_accessible_ids(Account, self.user)
+
+        self.other_account.shared_with.add(self.user)
+
+        self.assertIn(self.other_account.id, get_accessible_ids(Account, self.user))
+
+    def test_transaction_queries_filter_on_the_ids(self):
+        self._in_request()
+
+        sql = str(Transaction.objects.all().query).upper()
+
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("JOIN", sql)
+        self.assertIn(f"IN ({self.account.id}, {self.public_account.id})", sql)
+
+    def test_shared_object_managers_share_the_request_cache(self):
+        self._in_request()
+
+        with cachalot_disabled(), self.assertNumQueries(2):
+            for _ in range(2):
+                accounts = Account.objects.filter(is_archived=False)
+                tags = TransactionTag.objects.all()
+
+        self.assertNotIn("DISTINCT", str(accounts.query).upper())
+        self.assertCountEqual(accounts, [self.account, self.public_account])
+        self.assertEqual(list(tags), [])
@@ -4,8 +4,8 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Count
 from django.db.models.functions import ExtractYear, ExtractMonth
-from django.http import HttpResponse
-from django.shortcuts import render
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
@@ -13,8 +13,13 @@ from django.utils.translation import gettext_lazy as _
 
 from cachalot.api import invalidate
 
+from apps.accounts.models import Account
 from apps.common.decorators.htmx import only_htmx
 from apps.transactions.models import Transaction
+from apps.transactions.utils.overview_cache import (
+    bump_overview_versions,
+    bump_user_overview_versions,
+)
 from apps.common.decorators.user import htmx_login_required
 
 
@@ -113,7 +118,33 @@ def month_year_picker(request):
 @login_required
 @require_http_methods(["GET"])
 def invalidate_cache(request):
-    invalidate()
+    """
+    Without parameters, clears cachalot's cache and every overview cached for
+    the user. With `account` (and optionally `year` and `month`), only the
+    overviews covering that account, or that account's month, are rebuilt.
+    """
+    try:
+        account_id, year, month = (
+            int(request.GET[name]) if request.GET.get(name) else None
+            for name in ("account", "year", "month")
+        )
+    except ValueError:
+        raise Http404("Invalid cache scope")
+
+    if account_id:
+        account = get_object_or_404(Account, id=account_id)
+        transactions = Transaction.objects.filter(account=account)
+        if year and month:
+            transactions = transactions.filter(
+                reference_date__year=year, reference_date__month=month
+            )
+        bump_overview_versions(
+            (account.id, month)
+            for month in transactions.dates("reference_date", "month")
+        )
+    else:
+        invalidate()
+        bump_user_overview_versions([request.user.id])
 
     messages.success(request, _("Cache cleared successfully"))
 
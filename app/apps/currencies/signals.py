@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.currencies.models import ExchangeRate
+from apps.currencies.utils.convert import invalidate_exchange_rate_resolver
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def exchange_rate_changed_receiver(sender, instance, **kwargs):
+    invalidate_exchange_rate_resolver()
@@ -0,0 +1,160 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from cachalot.api import cachalot_disabled
+from django.test import RequestFactory, TestCase
+
+from apps.currencies.models import Currency, ExchangeRate
+from apps.currencies.utils.convert import (
+    ExchangeRateResolver,
+    batch_convert,
+    convert,
+    get_exchange_rate,
+    get_exchange_rate_resolver,
+)
+
+
+class ExchangeRateResolverTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.usd = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.eur = Currency.objects.create(
+            code="EUR", name="Euro", decimal_places=2, suffix=" €"
+        )
+        self.brl = Currency.objects.create(code="BRL", name="Real", decimal_places=2)
+
+        ExchangeRate.objects.create(
+            from_currency=self.usd,
+            to_currency=self.eur,
+            rate=Decimal("0.80"),
+            date=datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+        )
+        ExchangeRate.objects.create(
+            from_currency=self.usd,
+            to_currency=self.eur,
+            rate=Decimal("0.90"),
+            date=datetime(2025, 3, 1, tzinfo=dt_timezone.utc),
+        )
+        ExchangeRate.objects.create(
+            from_currency=self.eur,
+            to_currency=self.usd,
+            rate=Decimal("1.25"),
+            date=datetime(2025, 6, 1, tzinfo=dt_timezone.utc),
+        )
+
+    def test_closest_rate_is_used(self):
+        """Test that the rate closest to the date is picked"""
+        amount, prefix, suffix, decimal_places = convert(
+            Decimal("100"), self.usd, self.eur, date=date(2025, 1, 20)
+        )
+        self.assertEqual(amount, Decimal("80.00"))
+        self.assertEqual(suffix, " €")
+        self.assertEqual(decimal_places, 2)
+
+        amount, _, _, _ = convert(
+            Decimal("100"), self.usd, self.eur, date=date(2025, 2, 20)
+        )
+        self.assertEqual(amount, Decimal("90.00"))
+
+    def test_inverse_rate_is_used(self):
+        """Test that rates stored in the opposite direction are inverted"""
+        amount, _, _, _ = convert(
+            Decimal("100"), self.usd, self.eur, date=date(2025, 7, 1)
+        )
+        self.assertEqual(amount, Decimal("100") / Decimal("1.25"))
+
+        amount, _, _, _ = convert(
+            Decimal("100"), self.eur, self.usd, date=date(2025, 1, 1)
+        )
+        self.assertEqual(amount, Decimal("100") / Decimal("0.80"))
+
+    def test_dates_outside_of_range(self):
+        """Test that the first and last rates are used outside of their range"""
+        resolver = ExchangeRateResolver()
+        self.assertEqual(
+            resolver.get_effective_rate(self.usd, self.eur, date(2000, 1, 1)),
+            Decimal("0.80"),
+        )
+        self.assertEqual(
+            resolver.get_effective_rate(self.eur, self.usd, date(2030, 1, 1)),
+            Decimal("1.25"),
+        )
+
+    def test_missing_pair_returns_none(self):
+        """Test that pairs without rates can't be converted"""
+        self.assertEqual(
+            convert(Decimal("100"), self.usd, self.brl), (None, None, None, None)
+        )
+        self.assertIsNone(get_exchange_rate(self.usd, self.brl, date(2025, 1, 1)))
+
+    def test_get_exchange_rate_is_annotated_per_direction(self):
+        """Test that both directions of a pair get their own effective rate"""
+        resolver = ExchangeRateResolver()
+        direct = get_exchange_rate(
+            self.usd, self.eur, date(2025, 1, 1), resolver=resolver
+        )
+        inverse = get_exchange_rate(
+            self.eur, self.usd, date(2025, 1, 1), resolver=resolver
+        )
+
+        self.assertEqual(direct.pk, inverse.pk)
+        self.assertEqual(direct.effective_rate, Decimal("0.80"))
+        self.assertEqual(inverse.effective_rate, 1 / Decimal("0.80"))
+
+    def test_pair_is_loaded_once(self):
+        """Test that repeated conversions don't query the database again"""
+        resolver = ExchangeRateResolver()
+        convert(Decimal("1"), self.usd, self.eur, resolver=resolver)
+
+        with self.assertNumQueries(0):
+            for month in range(1, 13):
+                convert(
+                    Decimal("1"),
+                    self.eur,
+                    self.usd,
+                    date=date(2025, month, 1),
+                    resolver=resolver,
+                )
+
+    def test_batch_convert_loads_every_pair_at_once(self):
+        """Test that converting many amounts queries the rates once"""
+        items = [
+            (Decimal("100"), self.usd, self.eur, date(2025, 1, 20)),
+            (Decimal("100"), self.eur, self.usd, date(2025, 7, 1)),
+            (Decimal("100"), self.usd, self.brl, date(2025, 1, 1)),
+            (Decimal("100"), self.usd, self.usd, date(2025, 1, 1)),
+        ]
+
+        with cachalot_disabled(), self.assertNumQueries(1):
+            results = batch_convert(items, resolver=ExchangeRateResolver())
+
+        self.assertEqual(
+            [amount for amount, _, _, _ in results],
+            [Decimal("80.00"), Decimal("125.00"), None, None],
+        )
+
+    def test_resolver_is_shared_and_invalidated_within_a_request(self):
+        """Test that a request keeps its resolver until an exchange rate changes"""
+        request = RequestFactory().get("/")
+
+        with patch(
+            "apps.currencies.utils.convert.get_current_request",
+            return_value=request,
+        ):
+            resolver = get_exchange_rate_resolver()
+            self.assertIs(get_exchange_rate_resolver(), resolver)
+
+            convert(Decimal("100"), self.usd, self.brl)
+            ExchangeRate.objects.create(
+                from_currency=self.usd,
+                to_currency=self.brl,
+                rate=Decimal("5"),
+                date=datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+            )
+
+            self.assertIsNot(get_exchange_rate_resolver(), resolver)
+            amount, _, _, _ = convert(Decimal("100"), self.usd, self.brl)
+            self.assertEqual(amount, Decimal("500"))
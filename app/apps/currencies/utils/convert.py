@@ -1,47 +1,165 @@
+import bisect
+import copy
 import datetime
 
-from django.db.models import Func, F, Value, Case, When, DecimalField, Q
-from django.db.models.functions import Extract
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.common.middleware.thread_local import get_current_request
 from apps.currencies.models import Currency
 from apps.currencies.models import ExchangeRate
 
 
-def get_exchange_rate(
-    from_currency: Currency, to_currency: Currency, date: datetime.date
-) -> ExchangeRate | None:
-    try:
-        exchange_rate = (
-            ExchangeRate.objects.filter(
-                Q(from_currency=from_currency, to_currency=to_currency)
-                | Q(from_currency=to_currency, to_currency=from_currency)
-            )
-            .annotate(
-                date_diff=Func(
-                    Extract(F("date") - Value(date), "epoch"), function="ABS"
-                ),
-                effective_rate=Case(
-                    When(from_currency=from_currency, then=F("rate")),
-                    default=1 / F("rate"),
-                    output_field=DecimalField(),
-                ),
+class ExchangeRateResolver:
+    """
+    Answers "closest exchange rate to a date" lookups from memory.
+
+    The rates of a currency pair are loaded once, in both directions, and kept
+    sorted by date. Every lookup after that is a binary search instead of a
+    query.
+    """
+
+    def __init__(self):
+        self._pairs = {}
+
+    @staticmethod
+    def _as_datetime(date) -> datetime.datetime:
+        if not isinstance(date, datetime.datetime):
+            # Postgres compares dates against timestamps at midnight UTC
+            return datetime.datetime.combine(
+                date, datetime.time.min, tzinfo=datetime.timezone.utc
             )
-            .order_by("date_diff")
-            .first()
+
+        if timezone.is_naive(date):
+            return timezone.make_aware(date)
+
+        return date
+
+    def load_pairs(self, pairs):
+        """
+        Load the rates of every (from_currency_id, to_currency_id) pair that isn't
+        loaded yet with a single query.
+        """
+        pending = {pair for pair in pairs if pair not in self._pairs}
+        if not pending:
+            return
+
+        entries = {}
+        rates_filter = Q()
+        for from_currency_id, to_currency_id in pending:
+            entries[(from_currency_id, to_currency_id)] = []
+            entries[(to_currency_id, from_currency_id)] = []
+            rates_filter |= Q(
+                from_currency_id=from_currency_id, to_currency_id=to_currency_id
+            ) | Q(from_currency_id=to_currency_id, to_currency_id=from_currency_id)
+
+        for rate in ExchangeRate.objects.filter(rates_filter).order_by("date", "id"):
+            direct = (rate.from_currency_id, rate.to_currency_id)
+            inverse = (rate.to_currency_id, rate.from_currency_id)
+            if direct in entries:
+                entries[direct].append((rate.date, rate.rate, rate))
+            if inverse in entries:
+                entries[inverse].append((rate.date, 1 / rate.rate, rate))
+
+        for key, pair_entries in entries.items():
+            self._pairs[key] = ([entry[0] for entry in pair_entries], pair_entries)
+
+    def _load_pair(self, from_currency_id, to_currency_id):
+        key = (from_currency_id, to_currency_id)
+        self.load_pairs([key])
+
+        return self._pairs[key]
+
+    def _closest(self, from_currency_id, to_currency_id, date):
+        dates, entries = self._load_pair(from_currency_id, to_currency_id)
+
+        if not entries:
+            return None
+
+        date = self._as_datetime(date)
+        index = bisect.bisect_left(dates, date)
+
+        # Ties go to the earlier rate
+        return min(
+            entries[max(index - 1, 0) : index + 1],
+            key=lambda entry: abs(entry[0] - date),
         )
 
-        if exchange_rate is None:
+    def get_rate(
+        self, from_currency: Currency, to_currency: Currency, date
+    ) -> ExchangeRate | None:
+        """
+        Return the rate closest to `date`, annotated with its `effective_rate`
+        for the from -> to direction.
+        """
+        entry = self._closest(from_currency.pk, to_currency.pk, date)
+
+        if entry is None:
             return None
 
-    except ExchangeRate.DoesNotExist:
-        return None
+        _, effective_rate, exchange_rate = entry
+        # Rates are shared by both directions of the pair, don't annotate them in place
+        exchange_rate = copy.copy(exchange_rate)
+        exchange_rate.effective_rate = effective_rate
 
-    else:
         return exchange_rate
 
+    def get_effective_rate(self, from_currency: Currency, to_currency: Currency, date):
+        entry = self._closest(from_currency.pk, to_currency.pk, date)
+
+        if entry is None:
+            return None
+
+        return entry[1]
 
-def convert(amount, from_currency: Currency, to_currency: Currency, date=None):
+
+def get_exchange_rate_resolver() -> ExchangeRateResolver:
+    """
+    Return the resolver of the current request, so every conversion made while
+    rendering a page shares the same loaded rates. Outside of a request a new
+    resolver is returned.
+    """
+    request = get_current_request()
+
+    if request is None:
+        return ExchangeRateResolver()
+
+    resolver = getattr(request, "_exchange_rate_resolver", None)
+    if resolver is None:
+        resolver = ExchangeRateResolver()
+        request._exchange_rate_resolver = resolver
+
+    return resolver
+
+
+def invalidate_exchange_rate_resolver():
+    request = get_current_request()
+
+    if request is not None and hasattr(request, "_exchange_rate_resolver"):
+        del request._exchange_rate_resolver
+
+
+def get_exchange_rate(
+    from_currency: Currency,
+    to_currency: Currency,
+    date: datetime.date,
+    resolver: ExchangeRateResolver | None = None,
+) -> ExchangeRate | None:
+    if resolver is None:
+        resolver = get_exchange_rate_resolver()
+
+    return resolver.get_rate(
+        from_currency=from_currency, to_currency=to_currency, date=date
+    )
+
+
+def convert(
+    amount,
+    from_currency: Currency,
+    to_currency: Currency,
+    date=None,
+    resolver: ExchangeRateResolver | None = None,
+):
     if from_currency == to_currency:
         return None, None, None, None
 
@@ -51,16 +169,43 @@ def convert(amount, from_currency: Currency, to_currency: Currency, date=None):
     if date is None:
         date = timezone.localtime(timezone.now())
 
-    exchange_rate = get_exchange_rate(
+    if resolver is None:
+        resolver = get_exchange_rate_resolver()
+
+    effective_rate = resolver.get_effective_rate(
         from_currency=from_currency, to_currency=to_currency, date=date
     )
 
-    if exchange_rate is None:
+    if effective_rate is None:
         return None, None, None, None
 
     return (
-        amount * exchange_rate.effective_rate,
+        amount * effective_rate,
         to_currency.prefix,
         to_currency.suffix,
         to_currency.decimal_places,
     )
+
+
+def batch_convert(items, resolver: ExchangeRateResolver | None = None) -> list:
+    """
+    convert() for a list of (amount, from_currency, to_currency, date) tuples.
+
+    The rates of every pair involved are loaded with a single query before
+    converting, so the cost doesn't grow with the number of distinct pairs.
+    """
+    if resolver is None:
+        resolver = get_exchange_rate_resolver()
+
+    resolver.load_pairs(
+        {
+            (from_currency.pk, to_currency.pk)
+            for amount, from_currency, to_currency, date in items
+            if from_currency != to_currency and amount != 0
+        }
+    )
+
+    return [
+        convert(amount, from_currency, to_currency, date=date, resolver=resolver)
+        for amount, from_currency, to_currency, date in items
+    ]
@@ -0,0 +1,136 @@
+from decimal import Decimal
+
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from apps.currencies.models import Currency
+from apps.currencies.utils.convert import (
+    ExchangeRateResolver,
+    get_exchange_rate_resolver,
+)
+
+
+class TotalsConverter:
+    """
+    Converts totals between currencies with a fixed number of queries.
+
+    Every currency is loaded once, the rates of the pairs a caller needs are
+    loaded together and each pair's rate is resolved once, so converting many
+    totals only costs the multiplications.
+    """
+
+    def __init__(self, resolver: ExchangeRateResolver | None = None, date=None):
+        self.resolver = resolver or get_exchange_rate_resolver()
+        self.date = date or timezone.localtime(timezone.now())
+        self._rates = {}
+
+    @cached_property
+    def currencies(self) -> dict[int, Currency]:
+        return {currency.id: currency for currency in Currency.objects.all()}
+
+    def get(self, currency_id) -> Currency | None:
+        return self.currencies.get(currency_id)
+
+    def get_exchange_currency(self, currency_id) -> Currency | None:
+        currency = self.get(currency_id)
+        if currency is None or currency.exchange_currency_id is None:
+            return None
+
+        return self.get(currency.exchange_currency_id)
+
+    def get_exchange_targets(self, currency_ids) -> list[int]:
+        """
+        Breadth-first walk of the exchange currency links starting at
+        currency_ids. Returns every currency reached that isn't in currency_ids.
+        """
+        seen = set(currency_ids)
+        targets = []
+        queue = list(currency_ids)
+        while queue:
+            exchange_currency = self.get_exchange_currency(queue.pop(0))
+            if exchange_currency is None or exchange_currency.id in seen:
+                continue
+
+            seen.add(exchange_currency.id)
+            targets.append(exchange_currency.id)
+            queue.append(exchange_currency.id)
+
+        return targets
+
+    def preload(self, pairs):
+        """Load the rates of every (from_id, to_id) pair with a single query."""
+        self.resolver.load_pairs(
+            [(from_id, to_id) for from_id, to_id in pairs if from_id != to_id]
+        )
+
+    def get_rate(self, from_currency_id, to_currency_id) -> Decimal | None:
+        key = (from_currency_id, to_currency_id)
+        if key not in self._rates:
+            self._rates[key] = self.resolver.get_effective_rate(
+                from_currency=self.get(from_currency_id),
+                to_currency=self.get(to_currency_id),
+                date=self.date,
+            )
+
+        return self._rates[key]
+
+    def convert_many(self, amounts, from_currency_id, to_currency_id) -> list:
+        """
+        Convert a list of amounts at once, with the same semantics as
+        apps.currencies.utils.convert.convert: an amount is None when the
+        currencies are the same, when it's zero or when there's no rate.
+        """
+        if from_currency_id == to_currency_id:
+            return [None] * len(amounts)
+
+        if all(amount == 0 for amount in amounts):
+            return [None] * len(amounts)
+
+        rate = self.get_rate(from_currency_id, to_currency_id)
+        if rate is None:
+            return [None] * len(amounts)
+
+        return [None if amount == 0 else amount * rate for amount in amounts]
+
+    def exchange(self, totals, fields, from_currency_id, to_currency_id) -> dict:
+        """
+        The given fields of totals converted to the target currency, along with
+        its info. Fields that can't be converted are left out and an empty dict
+        is returned when none could be.
+        """
+        converted = self.convert_many(
+            [totals[field] for field in fields], from_currency_id, to_currency_id
+        )
+        exchanged = {
+            field: amount
+            for field, amount in zip(fields, converted)
+            if amount is not None
+        }
+        if exchanged:
+            exchanged["currency"] = self.currency_info(to_currency_id)
+
+        return exchanged
+
+    def convert(self, amount, from_currency_id, to_currency_id):
+        """Drop-in for convert(), taking currency IDs."""
+        (converted,) = self.convert_many([amount], from_currency_id, to_currency_id)
+        if converted is None:
+            return None, None, None, None
+
+        to_currency = self.get(to_currency_id)
+        return (
+            converted,
+            to_currency.prefix,
+            to_currency.suffix,
+            to_currency.decimal_places,
+        )
+
+    def currency_info(self, currency_id) -> dict:
+        currency = self.get(currency_id)
+        return {
+            "code": currency.code,
+            "name": currency.name,
+            "decimal_places": currency.decimal_places,
+            "prefix": currency.prefix,
+            "suffix": currency.suffix,
+        }
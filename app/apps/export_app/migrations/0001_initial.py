@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUEUED", "Queued"),
+                            ("PROCESSING", "Processing"),
+                            ("FAILED", "Failed"),
+                            ("FINISHED", "Finished"),
+                        ],
+                        default="QUEUED",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("exports", models.JSONField(default=list)),
+                ("file_name", models.CharField(blank=True, max_length=255)),
+                ("file_size", models.BigIntegerField(default=0)),
+                ("processed_rows", models.IntegerField(default=0)),
+                ("total_rows", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(null=True)),
+                ("finished_at", models.DateTimeField(null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="export_runs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-id"],
+            },
+        ),
+    ]
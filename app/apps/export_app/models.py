@@ -1,3 +1,60 @@
+import os
+
+from django.conf import settings
 from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ExportRun(models.Model):
+    EXPORT_DIR = "/usr/src/app/temp/exports"
+    # Runs listed per user, cleanup_export_runs deletes the older ones
+    KEEP_RUNS = 10
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", _("Queued")
+        PROCESSING = "PROCESSING", _("Processing")
+        FAILED = "FAILED", _("Failed")
+        FINISHED = "FINISHED", _("Finished")
+
+    status = models.CharField(
+        max_length=10,
+        choices=Status,
+        default=Status.QUEUED,
+        verbose_name=_("Status"),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_runs",
+    )
+    # ExportForm fields selected for this export
+    exports = models.JSONField(default=list)
+    file_name = models.CharField(max_length=255, blank=True)
+    file_size = models.BigIntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    total_rows = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ["-id"]
+
+    def __str__(self):
+        return self.file_name or f"Export #{self.id}"
+
+    @property
+    def file_path(self) -> str:
+        return os.path.join(self.EXPORT_DIR, f"{self.id}.zip")
+
+    @property
+    def progress(self) -> int:
+        if not self.total_rows:
+            return 100 if self.status == self.Status.FINISHED else 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
 
-# Create your models here.
+    def delete(self, *args, **kwargs):
+        for path in (self.file_path, f"{self.file_path}.part"):
+            if os.path.exists(path):
+                os.remove(path)
+        return super().delete(*args, **kwargs)
@@ -0,0 +1,241 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connections
+from import_export.widgets import ForeignKeyWidget, ManyToManyWidget
+
+from apps.export_app.widgets.foreign_key import (
+    AllObjectsForeignKeyWidget,
+    AutoCreateForeignKeyWidget,
+)
+from apps.export_app.widgets.many_to_many import AutoCreateManyToManyWidget
+
+RESTORE_BATCH_SIZE = 1000
+
+
+class BulkRestoreMixin:
+    """
+    ModelResource mixin for restoring large backups.
+
+    Rows are imported in chunks with bulk_create/bulk_update and bulk
+    through-table inserts instead of being saved one by one, related objects are
+    looked up once per distinct value and no per-row model signals are sent.
+    """
+
+    restore_batch_size = RESTORE_BATCH_SIZE
+
+    def bulk_import_data(self, dataset, on_progress=None) -> int:
+        """
+        Import every row of the dataset, calling on_progress(done, total) after
+        each chunk. Returns the number of imported rows.
+        """
+        fields = [
+            field
+            for field in self.get_import_fields()
+            if field.attribute
+            and not field.readonly
+            and field.column_name in dataset.headers
+        ]
+        self._cache_related_lookups(fields, dataset)
+
+        total = len(dataset)
+        done = 0
+        created = False
+        rows = iter(dataset.dict)
+        while chunk := list(islice(rows, self.restore_batch_size)):
+            created |= self._bulk_import_chunk(chunk, fields)
+            done += len(chunk)
+            if on_progress:
+                on_progress(done, total)
+
+        if created:
+            self._reset_sequences()
+        self.after_bulk_import()
+
+        return done
+
+    def prepare_bulk_instance(self, instance):
+        """Normalize an instance before it's written. Does nothing by default."""
+        pass
+
+    def bulk_create_instances(self, instances):
+        return self.get_queryset().bulk_create(instances)
+
+    def bulk_update_instances(self, instances, fields):
+        self.get_queryset().bulk_update(instances, fields)
+
+    def after_bulk_import(self):
+        """
+        Override to replace the work the skipped post_save receivers would have
+        done. Does nothing by default.
+        """
+        pass
+
+    def _bulk_import_chunk(self, chunk, fields) -> bool:
+        model = self._meta.model
+        id_field = self.fields[self.get_import_id_fields()[0]]
+        m2m_fields = [f for f in fields if isinstance(f.widget, ManyToManyWidget)]
+
+        keys = [
+            id_field.clean(row) if id_field.column_name in row else None
+            for row in chunk
+        ]
+        existing = self.get_queryset().in_bulk(
+            [key for key in keys if key is not None], field_name=id_field.attribute
+        )
+
+        new, changed, related = [], [], []
+        for key, row in zip(keys, chunk):
+            instance = existing.get(key)
+            if instance is None:
+                instance = self.init_instance(row)
+                new.append(instance)
+            else:
+                changed.append(instance)
+
+            self.import_instance(instance, row)
+            self.prepare_bulk_instance(instance)
+            related.append(
+                (
+                    instance,
+                    {f.attribute: list(f.clean(row)) for f in m2m_fields},
+                )
+            )
+
+        if new:
+            self.bulk_create_instances(new)
+        if changed:
+            self.bulk_update_instances(
+                changed,
+                [f.name for f in model._meta.concrete_fields if not f.primary_key],
+            )
+
+        for field in m2m_fields:
+            self._bulk_set_m2m(field.attribute, related, [i.pk for i in changed])
+
+        return bool(new)
+
+    def _bulk_set_m2m(self, attribute, related, changed_ids):
+        m2m = self._meta.model._meta.get_field(attribute)
+        through = m2m.remote_field.through
+        source = m2m.m2m_field_name()
+        target = m2m.m2m_reverse_field_name()
+
+        if changed_ids:
+            # Mirrors the .set() of a row by row import
+            through.objects.filter(**{f"{source}_id__in": changed_ids}).delete()
+
+        through.objects.bulk_create(
+            [
+                through(**{f"{source}_id": instance.pk, f"{target}_id": obj.pk})
+                for instance, values in related
+                for obj in values[attribute]
+            ],
+            batch_size=self.restore_batch_size,
+            ignore_conflicts=True,
+        )
+
+    def _cache_related_lookups(self, fields, dataset):
+        """
+        Resolve related objects once per distinct value instead of once per cell.
+
+        Names in auto-created columns are preloaded with a single query, anything
+        missing or ambiguous is left to the widget, which creates it or raises as
+        it would on a row by row import.
+        """
+        for field in fields:
+            widget = field.widget
+            if isinstance(widget, AutoCreateManyToManyWidget):
+                widget.clean = _preloaded_m2m_clean(widget, dataset[field.column_name])
+            elif isinstance(widget, AutoCreateForeignKeyWidget):
+                widget.clean = _cached_clean(
+                    _preloaded_fk_clean(widget, dataset[field.column_name]),
+                    _value_key,
+                )
+            elif isinstance(widget, AllObjectsForeignKeyWidget):
+                widget.clean = _cached_clean(widget.clean, _owner_key)
+            elif isinstance(widget, (ForeignKeyWidget, ManyToManyWidget)):
+                widget.clean = _cached_clean(widget.clean, _value_key)
+
+    def _reset_sequences(self):
+        # Same as ModelResource.after_import, bulk_create doesn't move them
+        connection = connections[self.get_db_connection_name()]
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), [self._meta.model])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
+
+
+def _value_key(value, row):
+    return value
+
+
+def _owner_key(value, row):
+    # Everything AllObjectsForeignKeyWidget.get_queryset looks at in the row
+    row = row or {}
+    owner = row.get("owner") or row.get("account_owner")
+    return value, owner, None if owner else row.get("id")
+
+
+def _cached_clean(clean, key):
+    results = {}
+
+    def cached_clean(value, row=None, *args, **kwargs):
+        cache_key = key(value, row)
+        if cache_key not in results:
+            results[cache_key] = clean(value, row, *args, **kwargs)
+        return results[cache_key]
+
+    return cached_clean
+
+
+def _preload(queryset, field, names):
+    matches = defaultdict(list)
+    for obj in queryset.filter(**{f"{field}__in": names}):
+        matches[getattr(obj, field)].append(obj)
+
+    return {name: objs[0] for name, objs in matches.items() if len(objs) == 1}
+
+
+def _preloaded_fk_clean(widget, column):
+    names = {value for value in column if value}
+    found = _preload(widget.get_queryset(None, None), widget.field, names)
+    clean = widget.clean
+
+    def preloaded_clean(value, row=None, *args, **kwargs):
+        if value in found:
+            return found[value]
+        return clean(value, row, *args, **kwargs)
+
+    return preloaded_clean
+
+
+def _preloaded_m2m_clean(widget, column):
+    names = {
+        name.strip()
+        for value in column
+        if value
+        for name in value.split(widget.separator)
+        if name.strip()
+    }
+    found = _preload(widget.model.objects.all(), widget.field, names)
+    clean = widget.clean
+
+    def preloaded_clean(value, row=None, *args, **kwargs):
+        if not value:
+            return []
+
+        cleaned_values = []
+        for name in value.split(widget.separator):
+            name = name.strip()
+            if not name:
+                continue
+            if name not in found:
+                found[name] = clean(name, row, *args, **kwargs)[0]
+            cleaned_values.append(found[name])
+
+        return cleaned_values
+
+    return preloaded_clean
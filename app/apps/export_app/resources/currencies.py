@@ -2,8 +2,11 @@ from import_export import fields, resources, widgets
 
 from apps.accounts.models import Account
 from apps.currencies.models import Currency, ExchangeRate, ExchangeRateService
+from apps.currencies.utils.convert import invalidate_exchange_rate_resolver
+from apps.export_app.resources.bulk import BulkRestoreMixin
 from apps.export_app.widgets.foreign_key import SkipMissingForeignKeyWidget
 from apps.export_app.widgets.numbers import UniversalDecimalWidget
+from apps.transactions.utils.overview_cache import bump_global_overview_version
 
 
 class CurrencyResource(resources.ModelResource):
@@ -17,7 +20,7 @@ class CurrencyResource(resources.ModelResource):
         model = Currency
 
 
-class ExchangeRateResource(resources.ModelResource):
+class ExchangeRateResource(BulkRestoreMixin, resources.ModelResource):
     from_currency = fields.Field(
         attribute="from_currency",
         column_name="from_currency",
@@ -35,6 +38,10 @@ class ExchangeRateResource(resources.ModelResource):
     class Meta:
         model = ExchangeRate
 
+    def after_bulk_import(self):
+        invalidate_exchange_rate_resolver()
+        bump_global_overview_version()
+
 
 class ExchangeRateServiceResource(resources.ModelResource):
     target_currencies = fields.Field(
@@ -1,6 +1,7 @@
 from import_export import fields, resources
 
 from apps.accounts.models import Account
+from apps.export_app.resources.bulk import BulkRestoreMixin
 from apps.export_app.widgets.foreign_key import (
     AllObjectsForeignKeyWidget,
     AutoCreateForeignKeyWidget,
@@ -18,7 +19,7 @@ from apps.transactions.models import (
 from apps.export_app.widgets.numbers import UniversalDecimalWidget
 
 
-class TransactionResource(resources.ModelResource):
+class TransactionResource(BulkRestoreMixin, resources.ModelResource):
     account = fields.Field(
         attribute="account",
         column_name="account",
@@ -59,6 +60,33 @@ class TransactionResource(resources.ModelResource):
     def get_queryset(self):
         return Transaction.userless_all_objects.all()
 
+    def filter_export(self, queryset, **kwargs):
+        return queryset.select_related("account", "category").prefetch_related(
+            "tags", "entities"
+        )
+
+    def prepare_bulk_instance(self, instance):
+        # What Transaction.save does, minus the per-row relation and unique checks
+        if not instance.reference_date and instance.date:
+            instance.reference_date = instance.date.replace(day=1)
+
+        instance.full_clean(
+            exclude=[f.name for f in Transaction._meta.fields if f.is_relation],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+
+    def bulk_create_instances(self, instances):
+        # Balances are still refreshed by the queryset, rules aren't run on restore
+        return Transaction.userless_all_objects.bulk_create(
+            instances, emit_signal=False
+        )
+
+    def bulk_update_instances(self, instances, fields):
+        Transaction.userless_all_objects.bulk_update(
+            instances, fields, emit_signal=False
+        )
+
 
 class TransactionTagResource(resources.ModelResource):
     class Meta:
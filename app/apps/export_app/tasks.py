@@ -0,0 +1,95 @@
+import logging
+import os
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from procrastinate.contrib.django import app
+
+from apps.common.middleware.thread_local import write_current_user, delete_current_user
+from apps.export_app.models import ExportRun
+from apps.export_app.utils.exports import get_exports
+from apps.export_app.utils.streaming import iter_csv, iter_zip
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(name="build_export")
+def build_export(export_run_id: int):
+    try:
+        export_run = ExportRun.objects.select_related("user").get(id=export_run_id)
+    except ExportRun.DoesNotExist:
+        raise ValueError(f"ExportRun with id {export_run_id} not found")
+
+    write_current_user(export_run.user)
+    try:
+        _build_export(export_run)
+    finally:
+        delete_current_user()
+
+
+def _build_export(export_run: ExportRun):
+    exports = get_exports(export_run.exports)
+    timestamp = timezone.localtime(timezone.now()).strftime("%Y-%m-%dT%H-%M-%S")
+
+    export_run.status = ExportRun.Status.PROCESSING
+    export_run.started_at = timezone.now()
+    export_run.file_name = f"{timestamp}_WYGIWYH_export.zip"
+    export_run.total_rows = sum(
+        resource.filter_export(resource.get_queryset()).count()
+        for resource, _ in exports
+    )
+    export_run.save(update_fields=["status", "started_at", "file_name", "total_rows"])
+
+    def on_rows(count):
+        export_run.processed_rows += count
+        export_run.save(update_fields=["processed_rows"])
+
+    # Written next to the final file, which only appears once complete
+    part_path = f"{export_run.file_path}.part"
+    os.makedirs(ExportRun.EXPORT_DIR, exist_ok=True)
+
+    try:
+        with open(part_path, "wb") as archive:
+            for chunk in iter_zip(
+                (f"{name}.csv", iter_csv(resource, on_rows=on_rows))
+                for resource, name in exports
+            ):
+                archive.write(chunk)
+
+        os.replace(part_path, export_run.file_path)
+    except Exception:
+        logger.exception(f"Export {export_run.id} failed")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+        export_run.status = ExportRun.Status.FAILED
+        export_run.finished_at = timezone.now()
+        export_run.save(update_fields=["status", "finished_at"])
+        raise
+
+    export_run.status = ExportRun.Status.FINISHED
+    export_run.file_size = os.path.getsize(export_run.file_path)
+    export_run.finished_at = timezone.now()
+    export_run.save(update_fields=["status", "file_size", "finished_at"])
+
+
+@app.periodic(cron="30 1 * * *")
+@app.task(lock="cleanup_export_runs", name="cleanup_export_runs")
+def cleanup_export_runs(timestamp=None):
+    # Only the latest runs of each user are listed and can be downloaded
+    old_runs = (
+        ExportRun.objects.alias(
+            rank=Window(RowNumber(), partition_by=F("user_id"), order_by=F("id").desc())
+        )
+        .filter(rank__gt=ExportRun.KEEP_RUNS)
+        .exclude(status__in=[ExportRun.Status.QUEUED, ExportRun.Status.PROCESSING])
+    )
+
+    deleted_count = 0
+    for export_run in old_runs:
+        # Removes the archive along with the run
+        export_run.delete()
+        deleted_count += 1
+
+    return f"Deleted {deleted_count} export runs."
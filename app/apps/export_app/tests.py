@@ -1,3 +1,360 @@
-from django.test import TestCase
+import csv
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.accounts.models import Account, AccountMonthlyBalance
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.currencies.models import Currency
+from apps.export_app.models import ExportRun
+from apps.export_app.resources.accounts import AccountResource
+from apps.export_app.resources.transactions import TransactionResource
+from apps.export_app.tasks import build_export, cleanup_export_runs
+from apps.export_app.utils import streaming
+from apps.export_app.views import process_imports
+from apps.transactions.models import Transaction, TransactionTag
+
+
+def run_build_export_without_worker_wrapper(**kwargs):
+    task_func = build_export.func
+    task_func = getattr(task_func, "__wrapped__", task_func)
+
+    return task_func(**kwargs)
+
+
+class StreamingExportTests(TestCase):
+    """Tests for the streamed CSV and ZIP exports."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        write_current_user(self.user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+        tag = TransactionTag.objects.create(name="Food", owner=self.user)
+        for day in range(1, 6):
+            transaction = Transaction.objects.create(
+                account=self.account,
+                type=Transaction.Type.EXPENSE,
+                date=date(2024, 1, day),
+                amount=Decimal(f"{day}.50"),
+                description=f'Row "{day}", with a comma',
+                owner=self.user,
+            )
+            transaction.tags.add(tag)
+
+    def tearDown(self):
+        delete_current_user()
+
+    def test_streamed_csv_matches_the_dataset_export(self):
+        """Test that chunked CSV output is identical to Resource.export()."""
+        streaming.EXPORT_CHUNK_SIZE, chunk_size = 2, streaming.EXPORT_CHUNK_SIZE
+        try:
+            chunks = list(streaming.iter_csv(TransactionResource()))
+        finally:
+            streaming.EXPORT_CHUNK_SIZE = chunk_size
+
+        # Header, then rows 2 by 2. Neither query is ordered, so compare the rows
+        # regardless of their order
+        self.assertEqual(len(chunks), 4)
+        streamed = b"".join(chunks).decode().splitlines()
+        exported = TransactionResource().export().csv.splitlines()
+        self.assertEqual(streamed[0], exported[0])
+        self.assertEqual(sorted(streamed[1:]), sorted(exported[1:]))
+
+    def test_streamed_zip_contains_every_file(self):
+        """Test that the streamed archive is a valid zip of the CSV files."""
+        archive = b"".join(
+            streaming.iter_zip(
+                [
+                    ("accounts.csv", streaming.iter_csv(AccountResource())),
+                    ("transactions.csv", streaming.iter_csv(TransactionResource())),
+                ]
+            )
+        )
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            self.assertEqual(zip_file.namelist(), ["accounts.csv", "transactions.csv"])
+            rows = list(
+                csv.DictReader(io.StringIO(zip_file.read("transactions.csv").decode()))
+            )
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["tags"], "Food")
+
+    @override_settings(
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        },
+        WHITENOISE_AUTOREFRESH=True,
+    )
+    def test_export_view_streams_the_response(self):
+        """Test that the export view returns a streaming zip response."""
+        delete_current_user()
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse("export_form"), {"accounts": "on", "transactions": "on"}
+        )
+        archive = b"".join(response.streaming_content)
+        write_current_user(self.user)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            self.assertEqual(zip_file.namelist(), ["accounts.csv", "transactions.csv"])
+            transactions = zip_file.read("transactions.csv").decode()
+
+        # Rows are read with the requesting user, after the request has ended
+        self.assertEqual(transactions.count("Food"), 5)
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+    WHITENOISE_AUTOREFRESH=True,
+)
+class ExportRunTests(TestCase):
+    """Tests for background exports and their resumable downloads."""
+
+    def setUp(self):
+        self.original_export_dir = ExportRun.EXPORT_DIR
+        ExportRun.EXPORT_DIR = tempfile.mkdtemp()
+
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.client.force_login(self.user)
+
+        write_current_user(self.user)
+        currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        account = Account.objects.create(
+            name="Checking", currency=currency, owner=self.user
+        )
+        for day in range(1, 6):
+            Transaction.objects.create(
+                account=account,
+                type=Transaction.Type.EXPENSE,
+                date=date(2024, 1, day),
+                amount=Decimal("1.00"),
+                description=f"Row {day}",
+                owner=self.user,
+            )
+        delete_current_user()
+
+        self.export_run = ExportRun.objects.create(
+            user=self.user, exports=["accounts", "transactions"]
+        )
+        run_build_export_without_worker_wrapper(export_run_id=self.export_run.id)
+        self.export_run.refresh_from_db()
+
+    def tearDown(self):
+        shutil.rmtree(ExportRun.EXPORT_DIR, ignore_errors=True)
+        ExportRun.EXPORT_DIR = self.original_export_dir
+
+    def _download(self, **headers):
+        response = self.client.get(
+            reverse("export_run_download", args=[self.export_run.id]), headers=headers
+        )
+        return response, b"".join(response.streaming_content)
+
+    def test_export_is_built_to_disk(self):
+        """Test that the task writes the archive and records its progress."""
+        self.assertEqual(self.export_run.status, ExportRun.Status.FINISHED)
+        self.assertEqual(self.export_run.total_rows, 6)
+        self.assertEqual(self.export_run.processed_rows, 6)
+        self.assertEqual(
+            self.export_run.file_size, os.path.getsize(self.export_run.file_path)
+        )
+        self.assertFalse(os.path.exists(f"{self.export_run.file_path}.part"))
+
+        with zipfile.ZipFile(self.export_run.file_path) as zip_file:
+            self.assertEqual(zip_file.namelist(), ["accounts.csv", "transactions.csv"])
+
+    def test_download_resumes_from_a_range(self):
+        """Test that a Range request gets the rest of the file."""
+        with open(self.export_run.file_path, "rb") as archive:
+            content = archive.read()
+
+        response, body = self._download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(body, content)
+
+        response, body = self._download(Range="bytes=100-", If_Range=response["ETag"])
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(
+            response["Content-Range"], f"bytes 100-{len(content) - 1}/{len(content)}"
+        )
+        self.assertEqual(body, content[100:])
+
+        response, body = self._download(Range="bytes=-10")
+        self.assertEqual(body, content[-10:])
+
+    def test_download_ignores_stale_or_invalid_ranges(self):
+        """Test that a changed file or bad range falls back to the full file."""
+        response, _ = self._download(Range="bytes=100-", If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        response, _ = self._download(Range="bytes=0-1,5-6")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            reverse("export_run_download", args=[self.export_run.id]),
+            headers={"Range": f"bytes={self.export_run.file_size}-"},
+        )
+        self.assertEqual(response.status_code, 416)
+
+    def test_deleting_a_run_removes_its_file(self):
+        """Test that the archive goes away with its export run."""
+        self.export_run.delete()
+
+        self.assertFalse(os.path.exists(self.export_run.file_path))
+
+    def test_cleanup_keeps_the_latest_runs(self):
+        """Test that runs older than the listed ones are deleted with their files."""
+        newer_runs = [
+            ExportRun.objects.create(user=self.user, status=ExportRun.Status.FINISHED)
+            for _ in range(ExportRun.KEEP_RUNS)
+        ]
+        other_user = get_user_model().objects.create_user(
+            email="other@example.com", password="password"
+        )
+        other_run = ExportRun.objects.create(user=other_user)
+
+        task_func = cleanup_export_runs.func
+        task_func = getattr(task_func, "__wrapped__", task_func)
+        task_func()
+
+        self.assertEqual(
+            set(ExportRun.objects.values_list("id", flat=True)),
+            {run.id for run in newer_runs} | {other_run.id},
+        )
+        self.assertFalse(os.path.exists(self.export_run.file_path))
+
+
+class BulkRestoreTests(TestCase):
+    """Tests for the batched restore of transactions."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        write_current_user(self.user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+        self.tag = TransactionTag.objects.create(name="Food", owner=self.user)
+        for day in range(1, 4):
+            transaction = Transaction.objects.create(
+                account=self.account,
+                type=Transaction.Type.EXPENSE,
+                date=date(2024, 1, day),
+                amount=Decimal("10.00"),
+                description=f"Row {day}",
+                owner=self.user,
+            )
+            transaction.tags.add(self.tag)
+
+        self.dataset = TransactionResource().export()
+
+    def tearDown(self):
+        delete_current_user()
+
+    @staticmethod
+    def _replace(dataset, **values):
+        columns = {dataset.headers.index(name): value for name, value in values.items()}
+        rows = [
+            [columns.get(i, value) for i, value in enumerate(row)] for row in dataset
+        ]
+        return dataset.__class__(*rows, headers=dataset.headers)
+
+    def _restore(self, dataset):
+        process_imports(
+            None,
+            {
+                "transactions": SimpleUploadedFile(
+                    "transactions.csv", dataset.csv.encode("utf-8")
+                )
+            },
+        )
+
+    def test_restore_creates_rows_in_bulk(self):
+        """Test that rows without an id are created with their tags and balances."""
+        del self.dataset["id"]
+
+        self._restore(self._replace(self.dataset, tags="Food, Travel"))
+
+        self.assertEqual(Transaction.userless_all_objects.count(), 6)
+        self.assertEqual(TransactionTag.all_objects.filter(name="Travel").count(), 1)
+        restored = Transaction.userless_all_objects.filter(tags__name="Travel")
+        self.assertEqual(restored.count(), 3)
+        balance = AccountMonthlyBalance.all_objects.get(account=self.account)
+        self.assertEqual(
+            balance.expense_current + balance.expense_projected, Decimal("60.00")
+        )
+
+        # The sequence was moved past the restored rows
+        Transaction.objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            date=date(2024, 1, 9),
+            amount=Decimal("1.00"),
+            owner=self.user,
+        )
+
+    def test_restore_updates_existing_rows(self):
+        """Test that rows with a known id are updated and their tags replaced."""
+        self._restore(self._replace(self.dataset, amount="25.00", tags="Travel"))
+
+        self.assertEqual(Transaction.userless_all_objects.count(), 3)
+        for transaction in Transaction.userless_all_objects.all():
+            self.assertEqual(transaction.amount, Decimal("25.00"))
+            self.assertEqual(
+                list(transaction.tags.values_list("name", flat=True)), ["Travel"]
+            )
+
+    def test_lookups_dont_grow_with_rows(self):
+        """Test that related names are resolved once, not once per row."""
+        del self.dataset["id"]
+
+        with CaptureQueriesContext(connection) as small:
+            self._restore(self.dataset)
+
+        larger = self.dataset.__class__(
+            *(list(self.dataset) * 5), headers=self.dataset.headers
+        )
+        with CaptureQueriesContext(connection) as large:
+            self._restore(larger)
+
+        self.assertEqual(len(small), len(large))
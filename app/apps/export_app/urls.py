@@ -4,5 +4,17 @@ import apps.export_app.views as views
 urlpatterns = [
     path("export/", views.export_index, name="export_index"),
     path("export/form/", views.export_form, name="export_form"),
+    path("export/runs/", views.export_runs_list, name="export_runs_list"),
+    path("export/runs/add/", views.export_run_add, name="export_run_add"),
+    path(
+        "export/runs/<int:run_id>/download/",
+        views.export_run_download,
+        name="export_run_download",
+    ),
+    path(
+        "export/runs/<int:run_id>/delete/",
+        views.export_run_delete,
+        name="export_run_delete",
+    ),
     path("export/restore/", views.import_form, name="restore_form"),
 ]
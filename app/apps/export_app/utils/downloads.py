@@ -0,0 +1,85 @@
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, quote_etag
+
+# Single byte ranges only: "bytes=start-end", "bytes=start-" or "bytes=-suffix"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_file_range(path: str, start: int, length: int):
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            data = file.read(min(READ_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """The (start, end) bytes of a Range header, end included."""
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+
+    start, end = match.groups()
+    if not start:
+        # Suffix range, the last n bytes
+        return max(0, size - int(end)), size - 1
+
+    return int(start), min(int(end), size - 1) if end else size - 1
+
+
+def ranged_file_response(request, path: str, file_name: str, content_type: str):
+    """
+    Serve a file as an attachment, honoring single byte Range requests so an
+    interrupted download can be resumed.
+    """
+    stat = os.stat(path)
+    etag = quote_etag(f"{int(stat.st_mtime)}-{stat.st_size}")
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+    }
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # A resumed download of a file that has changed since restarts from scratch
+    if range_header and (not if_range or if_range in (etag, headers["Last-Modified"])):
+        # Ranges we don't support are ignored, ranges past the end refused
+        byte_range = _parse_range(range_header, stat.st_size)
+        if byte_range is not None and byte_range[0] > byte_range[1]:
+            return HttpResponse(
+                status=416, headers={"Content-Range": f"bytes */{stat.st_size}"}
+            )
+
+    if byte_range is None:
+        response = FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=file_name,
+            content_type=content_type,
+        )
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        _iter_file_range(path, start, end - start + 1),
+        status=206,
+        content_type=content_type,
+        headers={
+            **headers,
+            "Content-Length": str(end - start + 1),
+            "Content-Range": f"bytes {start}-{end}/{stat.st_size}",
+            "Content-Disposition": f'attachment; filename="{file_name}"',
+        },
+    )
+    return response
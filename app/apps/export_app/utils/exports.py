@@ -0,0 +1,74 @@
+from typing import Iterable
+
+from import_export.resources import ModelResource
+
+from apps.export_app.resources.accounts import AccountResource
+from apps.export_app.resources.currencies import (
+    CurrencyResource,
+    ExchangeRateResource,
+    ExchangeRateServiceResource,
+)
+from apps.export_app.resources.dca import (
+    DCAStrategyResource,
+    DCAEntryResource,
+)
+from apps.export_app.resources.import_app import (
+    ImportProfileResource,
+)
+from apps.export_app.resources.rules import (
+    TransactionRuleResource,
+    TransactionRuleActionResource,
+    UpdateOrCreateTransactionRuleResource,
+)
+from apps.export_app.resources.transactions import (
+    TransactionResource,
+    TransactionTagResource,
+    TransactionEntityResource,
+    TransactionCategoyResource,
+    InstallmentPlanResource,
+    RecurringTransactionResource,
+)
+from apps.export_app.resources.users import UserResource
+
+# Files exported for each ExportForm field, as (resource, file name) pairs
+EXPORTS = {
+    "users": [(UserResource, "users")],
+    "accounts": [(AccountResource, "accounts")],
+    "currencies": [(CurrencyResource, "currencies")],
+    "transactions": [(TransactionResource, "transactions")],
+    "categories": [(TransactionCategoyResource, "transactions_categories")],
+    "tags": [(TransactionTagResource, "transactions_tags")],
+    "entities": [(TransactionEntityResource, "transactions_entities")],
+    "installment_plans": [(InstallmentPlanResource, "installment_plans")],
+    "recurring_transactions": [
+        (RecurringTransactionResource, "recurring_transactions")
+    ],
+    "exchange_rates_services": [
+        (ExchangeRateServiceResource, "automatic_exchange_rates")
+    ],
+    "exchange_rates": [(ExchangeRateResource, "exchange_rates")],
+    "rules": [
+        (TransactionRuleResource, "transaction_rules"),
+        (TransactionRuleActionResource, "transaction_rules_actions"),
+        (
+            UpdateOrCreateTransactionRuleResource,
+            "transaction_rules_update_or_create",
+        ),
+    ],
+    "dca": [
+        (DCAStrategyResource, "dca_strategies"),
+        (DCAEntryResource, "dca_entries"),
+    ],
+    "import_profiles": [(ImportProfileResource, "import_profiles")],
+}
+
+
+def get_exports(selected: Iterable[str]) -> list[tuple[ModelResource, str]]:
+    """The (resource, file name) pairs to export for the selected form fields."""
+    selected = set(selected)
+    return [
+        (resource(), name)
+        for field, exports in EXPORTS.items()
+        if field in selected
+        for resource, name in exports
+    ]
@@ -0,0 +1,113 @@
+import csv
+import zipfile
+from typing import Callable, Iterable, Iterator
+
+from import_export.resources import ModelResource
+
+from apps.common.middleware.thread_local import (
+    delete_current_user,
+    get_current_user,
+    write_current_user,
+)
+
+# Rows fetched from the database, and serialized, per chunk
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object handing back what the csv writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+class _ZipStream:
+    """
+    Write-only, unseekable file for zipfile to write to, emptied after every
+    chunk so only that chunk is held in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_csv(
+    resource: ModelResource,
+    queryset=None,
+    on_rows: Callable[[int], None] | None = None,
+) -> Iterator[bytes]:
+    """
+    Yield the same CSV as resource.export().csv, EXPORT_CHUNK_SIZE rows at a
+    time, without loading the whole queryset or dataset in memory. on_rows is
+    called with the number of rows in each chunk.
+    """
+    if queryset is None:
+        queryset = resource.get_queryset()
+    queryset = resource.filter_export(queryset)
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(resource.get_export_headers()).encode()
+
+    rows = []
+    for instance in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        rows.append(writer.writerow(resource.export_resource(instance)))
+        if len(rows) >= EXPORT_CHUNK_SIZE:
+            yield "".join(rows).encode()
+            if on_rows:
+                on_rows(len(rows))
+            rows = []
+
+    if rows:
+        yield "".join(rows).encode()
+        if on_rows:
+            on_rows(len(rows))
+
+
+def iter_zip(files: Iterable[tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """Yield a zip archive of the given (name, chunks) files as it is written."""
+    stream = _ZipStream()
+
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, chunks in files:
+            with zip_file.open(name, "w", force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    if data := stream.pop():
+                        yield data
+
+    # Rest of the last file and the central directory
+    yield stream.pop()
+
+
+def with_current_user(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Keep the requesting user as the current user while a streamed response is
+    produced, which happens after the request has left the middleware.
+    """
+    user = get_current_user()
+
+    def stream():
+        if get_current_user() is not None:
+            # Still inside the request, e.g. when the content is consumed eagerly
+            yield from chunks
+            return
+
+        write_current_user(user)
+        try:
+            yield from chunks
+        finally:
+            delete_current_user()
+
+    return stream()
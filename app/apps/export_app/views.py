@@ -1,20 +1,23 @@
 import logging
 import zipfile
-from io import BytesIO
 
+from cachalot.api import cachalot_disabled
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db import transaction
-from django.http import HttpResponse
-from django.shortcuts import render
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 from tablib import Dataset
 
+from apps.accounts.services import deferred_account_balance_refresh
 from apps.common.decorators.htmx import only_htmx
 from apps.export_app.forms import ExportForm, RestoreForm
+from apps.export_app.models import ExportRun
 from apps.export_app.resources.accounts import AccountResource
+from apps.export_app.resources.bulk import BulkRestoreMixin
 from apps.export_app.resources.currencies import (
     CurrencyResource,
     ExchangeRateResource,
@@ -41,6 +44,10 @@ from apps.export_app.resources.transactions import (
     RecurringTransactionResource,
 )
 from apps.export_app.resources.users import UserResource
+from apps.export_app.tasks import build_export
+from apps.export_app.utils.downloads import ranged_file_response
+from apps.export_app.utils.exports import get_exports
+from apps.export_app.utils.streaming import iter_csv, iter_zip, with_current_user
 from apps.common.decorators.demo import disabled_on_demo
 
 logger = logging.getLogger()
@@ -64,95 +71,18 @@ def export_form(request):
     if request.method == "POST":
         form = ExportForm(request.POST)
         if form.is_valid():
-            zip_buffer = BytesIO()
-
-            export_users = form.cleaned_data.get("users", False)
-            export_accounts = form.cleaned_data.get("accounts", False)
-            export_currencies = form.cleaned_data.get("currencies", False)
-            export_transactions = form.cleaned_data.get("transactions", False)
-            export_categories = form.cleaned_data.get("categories", False)
-            export_tags = form.cleaned_data.get("tags", False)
-            export_entities = form.cleaned_data.get("entities", False)
-            export_installment_plans = form.cleaned_data.get("installment_plans", False)
-            export_recurring_transactions = form.cleaned_data.get(
-                "recurring_transactions", False
+            exports = get_exports(
+                field for field, selected in form.cleaned_data.items() if selected
             )
 
-            export_exchange_rates_services = form.cleaned_data.get(
-                "exchange_rates_services", False
-            )
-            export_exchange_rates = form.cleaned_data.get("exchange_rates", False)
-            export_rules = form.cleaned_data.get("rules", False)
-            export_dca = form.cleaned_data.get("dca", False)
-            export_import_profiles = form.cleaned_data.get("import_profiles", False)
-
-            exports = []
-            if export_users:
-                exports.append((UserResource().export(), "users"))
-            if export_accounts:
-                exports.append((AccountResource().export(), "accounts"))
-            if export_currencies:
-                exports.append((CurrencyResource().export(), "currencies"))
-            if export_transactions:
-                exports.append((TransactionResource().export(), "transactions"))
-            if export_categories:
-                exports.append(
-                    (TransactionCategoyResource().export(), "transactions_categories")
-                )
-            if export_tags:
-                exports.append((TransactionTagResource().export(), "transactions_tags"))
-            if export_entities:
-                exports.append(
-                    (TransactionEntityResource().export(), "transactions_entities")
-                )
-            if export_installment_plans:
-                exports.append(
-                    (InstallmentPlanResource().export(), "installment_plans")
-                )
-            if export_recurring_transactions:
-                exports.append(
-                    (RecurringTransactionResource().export(), "recurring_transactions")
-                )
-            if export_exchange_rates_services:
-                exports.append(
-                    (ExchangeRateServiceResource().export(), "automatic_exchange_rates")
-                )
-            if export_exchange_rates:
-                exports.append((ExchangeRateResource().export(), "exchange_rates"))
-            if export_rules:
-                exports.append(
-                    (TransactionRuleResource().export(), "transaction_rules")
-                )
-                exports.append(
-                    (
-                        TransactionRuleActionResource().export(),
-                        "transaction_rules_actions",
-                    )
-                )
-                exports.append(
-                    (
-                        UpdateOrCreateTransactionRuleResource().export(),
-                        "transaction_rules_update_or_create",
-                    )
-                )
-            if export_dca:
-                exports.append((DCAStrategyResource().export(), "dca_strategies"))
-                exports.append(
-                    (
-                        DCAEntryResource().export(),
-                        "dca_entries",
-                    )
-                )
-            if export_import_profiles:
-                exports.append((ImportProfileResource().export(), "import_profiles"))
-
             if len(exports) >= 2:
-                with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                    for dataset, name in exports:
-                        zip_file.writestr(f"{name}.csv", dataset.csv)
-
-                response = HttpResponse(
-                    zip_buffer.getvalue(),
+                response = StreamingHttpResponse(
+                    with_current_user(
+                        iter_zip(
+                            (f"{name}.csv", iter_csv(resource))
+                            for resource, name in exports
+                        )
+                    ),
                     content_type="application/zip",
                     headers={
                         "HX-Trigger": "hide_offcanvas, updated",
@@ -161,10 +91,10 @@ def export_form(request):
                 )
                 return response
             elif len(exports) == 1:
-                dataset, name = exports[0]
+                resource, name = exports[0]
 
-                response = HttpResponse(
-                    dataset.csv,
+                response = StreamingHttpResponse(
+                    with_current_user(iter_csv(resource)),
                     content_type="text/csv",
                     headers={
                         "HX-Trigger": "hide_offcanvas, updated",
@@ -183,6 +113,83 @@ def export_form(request):
     return render(request, "export_app/fragments/export.html", context={"form": form})
 
 
+@only_htmx
+@login_required
+@disabled_on_demo
+@user_passes_test(lambda u: u.is_superuser)
+@require_http_methods(["GET"])
+def export_runs_list(request):
+    runs = ExportRun.objects.filter(user=request.user)[: ExportRun.KEEP_RUNS]
+
+    return render(
+        request,
+        "export_app/fragments/runs/list.html",
+        {
+            "runs": runs,
+            "running": any(
+                run.status in (ExportRun.Status.QUEUED, ExportRun.Status.PROCESSING)
+                for run in runs
+            ),
+        },
+    )
+
+
+@only_htmx
+@login_required
+@disabled_on_demo
+@user_passes_test(lambda u: u.is_superuser)
+@require_http_methods(["POST"])
+def export_run_add(request):
+    form = ExportForm(request.POST)
+    if form.is_valid():
+        selected = [field for field, value in form.cleaned_data.items() if value]
+        if not selected:
+            return HttpResponse(_("You have to select at least one export"))
+
+        export_run = ExportRun.objects.create(user=request.user, exports=selected)
+        build_export.defer(export_run_id=export_run.id)
+        messages.success(
+            request, _("Export queued, it will be ready to download shortly")
+        )
+
+    return HttpResponse(
+        status=204,
+        headers={"HX-Trigger": "updated"},
+    )
+
+
+@login_required
+@disabled_on_demo
+@user_passes_test(lambda u: u.is_superuser)
+@require_http_methods(["GET"])
+def export_run_download(request, run_id):
+    run = get_object_or_404(
+        ExportRun, id=run_id, user=request.user, status=ExportRun.Status.FINISHED
+    )
+
+    return ranged_file_response(
+        request, run.file_path, run.file_name, content_type="application/zip"
+    )
+
+
+@only_htmx
+@login_required
+@disabled_on_demo
+@user_passes_test(lambda u: u.is_superuser)
+@require_http_methods(["DELETE"])
+def export_run_delete(request, run_id):
+    run = get_object_or_404(ExportRun, id=run_id, user=request.user)
+
+    run.delete()
+
+    messages.success(request, _("Export deleted successfully"))
+
+    return HttpResponse(
+        status=204,
+        headers={"HX-Trigger": "updated"},
+    )
+
+
 @only_htmx
 @login_required
 @disabled_on_demo
@@ -252,6 +259,13 @@ def process_imports(request, cleaned_data):
             dataset = Dataset()
             dataset.load(content, format="csv")
 
+            if isinstance(resource, BulkRestoreMixin):
+
+                def log_progress(done, total):
+                    logger.info(f"Restoring {field_name}: {done}/{total} rows")
+
+                return resource.bulk_import_data(dataset, on_progress=log_progress)
+
             # Perform the import
             result = resource.import_data(
                 dataset,
@@ -271,7 +285,9 @@ def process_imports(request, cleaned_data):
             logger.error(f"Error importing {field_name}: {str(e)}")
             raise ImportError(f"Error importing {field_name}: {str(e)}")
 
-    with transaction.atomic():
+    # Cachalot invalidates the restored tables once, when the transaction commits,
+    # and the account balances are refreshed once for the whole restore
+    with cachalot_disabled(), transaction.atomic(), deferred_account_balance_refresh():
         files = {}
 
         if zip_file := cleaned_data.get("zip_file"):
@@ -4,3 +4,4 @@ from apps.import_app import models
 # Register your models here.
 admin.site.register(models.ImportRun)
 admin.site.register(models.ImportProfile)
+admin.site.register(models.ImportRunLog)
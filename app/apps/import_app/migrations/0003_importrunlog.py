@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:46
+
+import re
+from datetime import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+LOG_LINE = re.compile(r"^\[(.+?)\] (INFO|WARNING|ERROR): (.*)$")
+
+
+def split_logs(apps, schema_editor):
+    ImportRun = apps.get_model("import_app", "ImportRun")
+    ImportRunLog = apps.get_model("import_app", "ImportRunLog")
+
+    for run in ImportRun.objects.exclude(logs="").only("id", "logs").iterator():
+        entries = []
+        for line in run.logs.splitlines():
+            if not line.strip():
+                continue
+
+            match = LOG_LINE.match(line)
+            if match is None:
+                # Continuation of a multi-line message
+                if entries:
+                    entries[-1].message += "\n" + line
+                continue
+
+            try:
+                created_at = timezone.make_aware(
+                    datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+                )
+            except ValueError:
+                created_at = timezone.now()
+
+            entries.append(
+                ImportRunLog(
+                    import_run_id=run.id,
+                    level=match.group(2).lower(),
+                    message=match.group(3),
+                    created_at=created_at,
+                )
+            )
+
+        ImportRunLog.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("import_app", "0002_alter_importprofile_name_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportRunLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "level",
+                    models.CharField(
+                        choices=[
+                            ("info", "Info"),
+                            ("warning", "Warning"),
+                            ("error", "Error"),
+                        ],
+                        default="info",
+                        max_length=10,
+                        verbose_name="Level",
+                    ),
+                ),
+                ("message", models.TextField(verbose_name="Message")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "import_run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="log_entries",
+                        to="import_app.importrun",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+        migrations.RunPython(split_logs, reverse_code=migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="importrun",
+            name="logs",
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("import_app", "0003_importrunlog"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importrun",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="shards",
+                to="import_app.importrun",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importrun",
+            name="shard_end",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="importrun",
+            name="shard_start",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -2,6 +2,7 @@ import yaml
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.import_app.schemas import version_1
@@ -76,8 +77,17 @@ class ImportRun(models.Model):
     currencies = models.ManyToManyField(
         "currencies.Currency", related_name="import_runs"
     )
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="shards",
+    )
+    # Rows (shard_start, shard_end] of the parent's file, open ended if no end
+    shard_start = models.IntegerField(null=True, blank=True)
+    shard_end = models.IntegerField(null=True, blank=True)
 
-    logs = models.TextField(blank=True)
     processed_rows = models.IntegerField(default=0)
     total_rows = models.IntegerField(default=0)
     successful_rows = models.IntegerField(default=0)
@@ -85,3 +95,31 @@ class ImportRun(models.Model):
     failed_rows = models.IntegerField(default=0)
     started_at = models.DateTimeField(null=True)
     finished_at = models.DateTimeField(null=True)
+
+
+class ImportRunLog(models.Model):
+    class Level(models.TextChoices):
+        INFO = "info", _("Info")
+        WARNING = "warning", _("Warning")
+        ERROR = "error", _("Error")
+
+    import_run = models.ForeignKey(
+        ImportRun,
+        on_delete=models.CASCADE,
+        related_name="log_entries",
+    )
+    level = models.CharField(
+        max_length=10,
+        choices=Level,
+        default=Level.INFO,
+        verbose_name=_("Level"),
+    )
+    message = models.TextField(verbose_name=_("Message"))
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        timestamp = timezone.localtime(self.created_at).strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{timestamp}] {self.level.upper()}: {self.message}"
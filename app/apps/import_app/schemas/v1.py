@@ -87,6 +87,19 @@ class CSVImportSettings(BaseModel):
         default=0, description="Number of rows to skip at the beginning of the file"
     )
     trigger_transaction_rules: bool = True
+    batch_size: int = Field(
+        default=0,
+        ge=0,
+        description="Import transactions in chunks of this many rows using bulk "
+        "inserts. 0 imports them one row at a time",
+    )
+    shard_size: int = Field(
+        default=0,
+        ge=0,
+        description="Split transaction files with more rows than this into shards "
+        "of this many rows, imported by parallel jobs. 0 imports the whole file "
+        "in one job",
+    )
     importing: Literal[
         "transactions", "accounts", "currencies", "categories", "tags", "entities"
     ]
@@ -99,6 +112,19 @@ class ExcelImportSettings(BaseModel):
     )
     file_type: Literal["xls", "xlsx"]
     trigger_transaction_rules: bool = True
+    batch_size: int = Field(
+        default=0,
+        ge=0,
+        description="Import transactions in chunks of this many rows using bulk "
+        "inserts. 0 imports them one row at a time",
+    )
+    shard_size: int = Field(
+        default=0,
+        ge=0,
+        description="Split transaction files with more rows than this into shards "
+        "of this many rows, imported by parallel jobs. 0 imports the whole file "
+        "in one job",
+    )
     importing: Literal[
         "transactions", "accounts", "currencies", "categories", "tags", "entities"
     ]
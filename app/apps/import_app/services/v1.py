@@ -3,8 +3,12 @@ import hashlib
 import logging
 import os
 import re
+import time
 import zipfile
-from django.db import transaction
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from typing import Dict, Any, Literal, Union
@@ -18,8 +22,9 @@ from django.utils import timezone
 from openpyxl.utils.exceptions import InvalidFileException
 
 from apps.accounts.models import Account, AccountGroup
+from apps.common.middleware.thread_local import get_current_user
 from apps.currencies.models import Currency
-from apps.import_app.models import ImportRun, ImportProfile
+from apps.import_app.models import ImportRun, ImportProfile, ImportRunLog
 from apps.import_app.schemas import version_1
 from apps.transactions.models import (
     Transaction,
@@ -27,7 +32,7 @@ from apps.transactions.models import (
     TransactionTag,
     TransactionEntity,
 )
-from apps.rules.signals import transaction_created
+from apps.rules.signals import batched_rule_checks, transaction_created
 from apps.import_app.schemas.v1 import (
     TransactionCategoryMapping,
     TransactionAccountMapping,
@@ -40,9 +45,19 @@ logger = logging.getLogger(__name__)
 
 class ImportService:
     TEMP_DIR = "/usr/src/app/temp"
+    # Buffered log lines and counters are written once either threshold is hit
+    LOG_FLUSH_LINES = 200
+    LOG_FLUSH_INTERVAL = 2  # seconds
+    # Rows between two updates of a streamed file's estimated total
+    TOTAL_ESTIMATE_ROWS = 100
+    # Shards always import in chunks, of this size unless batch_size is set
+    SHARD_BATCH_SIZE = 500
 
     def __init__(self, import_run: ImportRun):
         self.import_run: ImportRun = import_run
+        self._log_buffer: list[ImportRunLog] = []
+        self._dirty_fields: set[str] = set()
+        self._last_flush = time.monotonic()
         self.profile: ImportProfile = import_run.profile
         self.config: version_1.ImportProfileSchema = self._load_config()
         self.settings: version_1.CSVImportSettings | version_1.ExcelImportSettings = (
@@ -53,6 +68,24 @@ class ImportService:
         )
         self.mapping: Dict[str, version_1.ColumnMapping] = self.config.mapping
 
+        # Batched import state, see _queue_row
+        self.batch_size: int = (
+            getattr(self.settings, "batch_size", 0)
+            if self.settings.importing == "transactions"
+            else 0
+        )
+        self._pending_rows: list[tuple[int, Dict[str, Any]]] = []
+        self._batch_lookups = None
+        self._duplicate_keys = {}
+
+        # Sharded import state, see split_file
+        self.row_range: tuple[int, int | None] | None = None
+        if import_run.parent_id:
+            self.row_range = (import_run.shard_start, import_run.shard_end)
+            self.batch_size = self.batch_size or self.SHARD_BATCH_SIZE
+        self._row_index = 0
+        self._shard_synced_id = 0
+
         # Ensure temp directory exists
         os.makedirs(self.TEMP_DIR, exist_ok=True)
 
@@ -69,18 +102,18 @@ class ImportService:
 
     def _log(self, level: str, message: str, **kwargs) -> None:
         """Add a log entry to the import run logs"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
         # Format additional context if present
         context = ""
         if kwargs:
             context = " - " + ", ".join(f"{k}={v}" for k, v in kwargs.items())
 
-        log_line = f"[{timestamp}] {level.upper()}: {message}{context}\n"
+        entry = ImportRunLog(
+            import_run=self.import_run, level=level, message=f"{message}{context}"
+        )
+        log_line = str(entry)
 
-        # Append to existing logs
-        self.import_run.logs += log_line
-        self.import_run.save(update_fields=["logs"])
+        self._log_buffer.append(entry)
+        self._write_progress()
 
         if level == "info":
             logger.info(log_line)
@@ -96,19 +129,16 @@ class ImportService:
     ) -> None:
         if field == "total":
             self.import_run.total_rows = value
-            self.import_run.save(update_fields=["total_rows"])
         elif field == "processed":
             self.import_run.processed_rows = value
-            self.import_run.save(update_fields=["processed_rows"])
         elif field == "successful":
             self.import_run.successful_rows = value
-            self.import_run.save(update_fields=["successful_rows"])
         elif field == "skipped":
             self.import_run.skipped_rows = value
-            self.import_run.save(update_fields=["skipped_rows"])
         elif field == "failed":
             self.import_run.failed_rows = value
-            self.import_run.save(update_fields=["failed_rows"])
+
+        self._write_progress(f"{field}_rows")
 
     def _increment_totals(
         self,
@@ -117,19 +147,40 @@ class ImportService:
     ) -> None:
         if field == "total":
             self.import_run.total_rows = self.import_run.total_rows + value
-            self.import_run.save(update_fields=["total_rows"])
         elif field == "processed":
             self.import_run.processed_rows = self.import_run.processed_rows + value
-            self.import_run.save(update_fields=["processed_rows"])
         elif field == "successful":
             self.import_run.successful_rows = self.import_run.successful_rows + value
-            self.import_run.save(update_fields=["successful_rows"])
         elif field == "skipped":
             self.import_run.skipped_rows = self.import_run.skipped_rows + value
-            self.import_run.save(update_fields=["skipped_rows"])
         elif field == "failed":
             self.import_run.failed_rows = self.import_run.failed_rows + value
-            self.import_run.save(update_fields=["failed_rows"])
+
+        self._write_progress(f"{field}_rows")
+
+    def _write_progress(self, *fields: str, force: bool = False) -> None:
+        """
+        Mark the given ImportRun fields as changed and write them, along with the
+        buffered log lines, once LOG_FLUSH_LINES lines are buffered or
+        LOG_FLUSH_INTERVAL seconds have passed since the last write.
+        """
+        self._dirty_fields.update(fields)
+
+        if (
+            not force
+            and len(self._log_buffer) < self.LOG_FLUSH_LINES
+            and time.monotonic() - self._last_flush < self.LOG_FLUSH_INTERVAL
+        ):
+            return
+
+        if self._log_buffer:
+            ImportRunLog.objects.bulk_create(self._log_buffer)
+            self._log_buffer = []
+        if self._dirty_fields:
+            self.import_run.save(update_fields=sorted(self._dirty_fields))
+            self._dirty_fields = set()
+
+        self._last_flush = time.monotonic()
 
     def _update_status(
         self, new_status: Literal["PROCESSING", "FAILED", "FINISHED"]
@@ -141,7 +192,8 @@ class ImportService:
         elif new_status == "FINISHED":
             self.import_run.status = ImportRun.Status.FINISHED
 
-        self.import_run.save(update_fields=["status"])
+        # Status changes are written right away, with everything buffered so far
+        self._write_progress("status", force=True)
 
     def _transform_value(
         self,
@@ -454,28 +506,446 @@ class ImportService:
         self.import_run.entities.add(entity)
         return entity
 
-    def _check_duplicate_transaction(self, transaction_data: Dict[str, Any]) -> bool:
-        for rule in self.deduplication:
-            if rule.type == "compare":
-                query = Transaction.all_objects.all().values("id")
-
-                # Build query conditions for each field in the rule
-                for field in rule.fields:
-                    if field in transaction_data:
-                        value = transaction_data[field]
-                        query = self._apply_deduplication_filter(
-                            query=query,
-                            field=field,
-                            value=value,
-                            match_type=rule.match_type,
+    def _queue_row(self, row: Dict[str, str], row_number: int) -> None:
+        """Map a row and queue it for the next bulk insert"""
+        try:
+            mapped_data = self._map_row(row)
+        except Exception as e:
+            self._handle_row_error(row_number, e)
+            return
+
+        if not mapped_data:
+            self._increment_totals("processed", value=1)
+            return
+
+        self._pending_rows.append((row_number, mapped_data))
+        if len(self._pending_rows) >= self.batch_size:
+            self._flush_batch()
+
+    def _handle_row_error(self, row_number: int, error: Exception) -> None:
+        if not self.settings.skip_errors:
+            self._log("error", f"Fatal error processing row {row_number}: {str(error)}")
+            self._update_status("FAILED")
+            raise error
+
+        self._log("warning", f"Error processing row {row_number}: {str(error)}")
+        self._increment_totals("failed", value=1)
+        logger.error(f"Fatal error processing row {row_number}", exc_info=error)
+
+    def _flush_batch(self) -> None:
+        """Insert the queued rows with a single bulk_create."""
+        rows, self._pending_rows = self._pending_rows, []
+        if not rows:
+            return
+
+        built = []
+        with self._shard_lock():
+            for row_number, mapped_data in rows:
+                try:
+                    if self.deduplication and self._check_duplicate_row(mapped_data):
+                        self._increment_totals("skipped", 1)
+                        self._log("info", f"Skipped duplicate row {row_number}")
+                        continue
+
+                    original_data = mapped_data.copy()
+                    built.append(
+                        (
+                            row_number,
+                            original_data,
+                            *self._build_transaction(mapped_data),
                         )
+                    )
+                    if self.deduplication:
+                        self._remember_duplicate_keys(original_data)
+                except Exception as e:
+                    if not self.settings.skip_errors:
+                        # Row by row imports keep the rows before the failing one
+                        self._insert_batch(built)
+                    self._handle_row_error(row_number, e)
+
+            self._insert_batch(built)
 
-                # If we found any matching transaction, it's a duplicate
-                if query.exists():
+    @contextmanager
+    def _shard_lock(self):
+        """
+        Shards of a file take turns checking their chunk for duplicates and
+        inserting it, so rows repeated across shards are only imported once.
+        """
+        if not (self.row_range and self.deduplication):
+            yield
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_lock(hashtext('import_run'), %s)",
+                [self.import_run.parent_id],
+            )
+        try:
+            self._sync_shard_duplicate_keys()
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_unlock(hashtext('import_run'), %s)",
+                    [self.import_run.parent_id],
+                )
+
+    def _sync_shard_duplicate_keys(self) -> None:
+        """Add the keys of the rows other shards inserted since the last chunk"""
+        # Inserts are serialized by the lock, so ids only grow between syncs
+        imported = Transaction.all_objects.filter(
+            import_runs__parent_id=self.import_run.parent_id,
+            id__gt=self._shard_synced_id,
+        ).order_by()
+
+        for i, rule in enumerate(self.deduplication):
+            if rule.type != "compare" or self._get_duplicate_keys(i, rule) is None:
+                continue
+
+            for values in imported.values_list("id", *rule.fields):
+                self._shard_synced_id = max(self._shard_synced_id, values[0])
+                self._duplicate_keys[i].add(self._get_duplicate_key(rule, values[1:]))
+
+    def _insert_batch(self, built) -> None:
+        if not built:
+            return
+
+        try:
+            with transaction.atomic():
+                created = Transaction.objects.bulk_create(
+                    [new_transaction for _, _, new_transaction, _, _ in built],
+                    emit_signal=False,
+                )
+                self._insert_batch_relations(built)
+        except IntegrityError:
+            # A row broke a constraint, import the chunk row by row so only the
+            # offending rows fail
+            self._log("warning", "Bulk insert failed, importing rows one by one")
+            for row_number, mapped_data, _, _, _ in built:
+                try:
+                    self._create_transaction(mapped_data)
+                except Exception as e:
+                    self._handle_row_error(row_number, e)
+                else:
+                    self._row_imported(row_number)
+            return
+
+        if self.settings.trigger_transaction_rules:
+            for new_transaction in created:
+                transaction_created.send(sender=new_transaction)
+
+        for row_number, _, _, _, _ in built:
+            self._row_imported(row_number)
+
+    def _insert_batch_relations(self, built) -> None:
+        tag_links = []
+        entity_links = []
+        tags = set()
+        entities = set()
+        categories = set()
+
+        for _, _, new_transaction, transaction_tags, transaction_entities in built:
+            for tag in transaction_tags:
+                tag_links.append(
+                    Transaction.tags.through(
+                        transaction_id=new_transaction.id, transactiontag_id=tag.id
+                    )
+                )
+                tags.add(tag)
+            for entity in transaction_entities:
+                entity_links.append(
+                    Transaction.entities.through(
+                        transaction_id=new_transaction.id,
+                        transactionentity_id=entity.id,
+                    )
+                )
+                entities.add(entity)
+            if new_transaction.category_id:
+                categories.add(new_transaction.category)
+
+        Transaction.tags.through.objects.bulk_create(tag_links, ignore_conflicts=True)
+        Transaction.entities.through.objects.bulk_create(
+            entity_links, ignore_conflicts=True
+        )
+
+        self.import_run.transactions.add(
+            *[new_transaction for _, _, new_transaction, _, _ in built]
+        )
+        if tags:
+            self.import_run.tags.add(*tags)
+        if entities:
+            self.import_run.entities.add(*entities)
+        if categories:
+            self.import_run.categories.add(*categories)
+
+    def _row_imported(self, row_number: int) -> None:
+        self._increment_totals("successful", value=1)
+        self._log("info", f"Successfully processed row {row_number}")
+        self._increment_totals("processed", value=1)
+
+    def _get_batch_lookups(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Accounts, categories, tags and entities by id and by name, loaded once so
+        batched rows don't query them one by one.
+        """
+        if self._batch_lookups is None:
+            self._batch_lookups = {
+                "account": self._build_lookup(
+                    Account.objects.select_related("currency")
+                ),
+                "category": self._build_lookup(TransactionCategory.objects.all()),
+                "tag": self._build_lookup(TransactionTag.objects.all()),
+                "entity": self._build_lookup(TransactionEntity.objects.all()),
+            }
+
+        return self._batch_lookups
+
+    @staticmethod
+    def _build_lookup(queryset) -> Dict[str, dict]:
+        lookup = {"id": {}, "name": {}}
+        for obj in queryset:
+            lookup["id"][obj.id] = obj
+            # Mirror .filter(name=...).first()
+            lookup["name"].setdefault(obj.name, obj)
+        return lookup
+
+    def _find_related(self, kind: str, value, by_id: bool, create: bool = False):
+        lookup = self._get_batch_lookups()[kind]
+
+        if by_id:
+            try:
+                return lookup["id"].get(int(value))
+            except (TypeError, ValueError):
+                return None
+
+        name = str(value).strip() if kind in ("tag", "entity") else value
+        obj = lookup["name"].get(name)
+
+        if obj is None and create:
+            model = {
+                "category": TransactionCategory,
+                "tag": TransactionTag,
+                "entity": TransactionEntity,
+            }[kind]
+            obj = model(name=name)
+            obj.save()
+            lookup["id"][obj.id] = obj
+            lookup["name"][name] = obj
+
+        return obj
+
+    def _get_target_mapping(self, mapping_class, target: str):
+        return next(
+            (
+                m
+                for m in self.mapping.values()
+                if isinstance(m, mapping_class) and m.target == target
+            ),
+            None,
+        )
+
+    def _build_transaction(self, data: Dict[str, Any]):
+        """
+        Batched counterpart of _create_transaction: resolves the related objects
+        from the preloaded lookups and returns an unsaved, validated transaction
+        with its tags and entities.
+        """
+        tags = []
+        entities = []
+
+        if "category" in data:
+            category_value = data.pop("category")
+            category_mapping = self._get_target_mapping(
+                TransactionCategoryMapping, "category"
+            )
+            if category_mapping:
+                category = self._find_related(
+                    "category",
+                    category_value,
+                    by_id=category_mapping.type == "id",
+                    create=getattr(category_mapping, "create", False),
+                )
+                if category:
+                    data["category"] = category
+
+        if "account" in data:
+            account_value = data.pop("account")
+            account_mapping = self._get_target_mapping(
+                TransactionAccountMapping, "account"
+            )
+            account = self._find_related(
+                "account",
+                account_value,
+                by_id=bool(account_mapping and account_mapping.type == "id"),
+            )
+            if not account:
+                raise ValueError(f"Account '{account_value}' not found")
+            data["account"] = account
+
+        if "tags" in data:
+            tag_values = data.pop("tags")
+            tags_mapping = self._get_target_mapping(TransactionTagsMapping, "tags")
+            if tags_mapping:
+                for tag_value in tag_values:
+                    tag = self._find_related(
+                        "tag",
+                        tag_value,
+                        by_id=tags_mapping.type == "id",
+                        create=getattr(tags_mapping, "create", False),
+                    )
+                    if tag:
+                        tags.append(tag)
+
+        if "entities" in data:
+            entity_values = data.pop("entities")
+            entities_mapping = self._get_target_mapping(
+                TransactionEntitiesMapping, "entities"
+            )
+            if entities_mapping:
+                for entity_value in entity_values:
+                    entity = self._find_related(
+                        "entity",
+                        entity_value,
+                        by_id=entities_mapping.type == "id",
+                        create=getattr(entities_mapping, "create", False),
+                    )
+                    if entity:
+                        entities.append(entity)
+
+        new_transaction = Transaction(**data)
+        if not new_transaction.reference_date and new_transaction.date:
+            new_transaction.reference_date = new_transaction.date.replace(day=1)
+        if not new_transaction.owner:
+            new_transaction.owner = get_current_user()
+
+        # What Transaction.save() runs through full_clean, minus the queries:
+        # related objects come from the lookups and unique fields are left to
+        # the database
+        new_transaction.clean_fields(
+            exclude=[
+                "account",
+                "category",
+                "installment_plan",
+                "recurring_transaction",
+                "owner",
+            ]
+        )
+        new_transaction.clean()
+
+        return new_transaction, tags, entities
+
+    def _check_duplicate_row(self, transaction_data: Dict[str, Any]) -> bool:
+        """
+        Batched counterpart of _check_duplicate_transaction: rules on plain fields
+        are checked against the key set of existing transactions, loaded once.
+        """
+        for i, rule in enumerate(self.deduplication):
+            if rule.type != "compare":
+                continue
+
+            key = self._get_row_duplicate_key(i, rule, transaction_data)
+            if key is None:
+                if self._matches_deduplication_rule(rule, transaction_data):
                     return True
+            elif key in self._duplicate_keys[i]:
+                return True
+
+        return False
+
+    def _remember_duplicate_keys(self, transaction_data: Dict[str, Any]) -> None:
+        """Later rows of the file are compared against an imported row too"""
+        for i, rule in enumerate(self.deduplication):
+            if rule.type != "compare":
+                continue
+
+            key = self._get_row_duplicate_key(i, rule, transaction_data)
+            if key is not None:
+                self._duplicate_keys[i].add(key)
+
+    def _get_row_duplicate_key(
+        self,
+        index: int,
+        rule: version_1.CompareDeduplicationRule,
+        transaction_data: Dict[str, Any],
+    ):
+        """The row's key for the rule, None if the rule has to be queried"""
+        if self._get_duplicate_keys(index, rule) is None:
+            return None
+
+        if not all(
+            field in transaction_data and not isinstance(transaction_data[field], list)
+            for field in rule.fields
+        ):
+            return None
+
+        return self._get_duplicate_key(
+            rule, [transaction_data[field] for field in rule.fields]
+        )
+
+    def _get_duplicate_keys(self, index: int, rule: version_1.CompareDeduplicationRule):
+        if index not in self._duplicate_keys:
+            keys = None
+            try:
+                fields = [Transaction._meta.get_field(field) for field in rule.fields]
+            except FieldDoesNotExist:
+                fields = None
+
+            if fields and all(
+                field.concrete and not field.is_relation for field in fields
+            ):
+                keys = {
+                    self._get_duplicate_key(rule, values)
+                    for values in Transaction.all_objects.values_list(
+                        *rule.fields
+                    ).order_by()
+                }
+
+            self._duplicate_keys[index] = keys
+
+        return self._duplicate_keys[index]
+
+    @staticmethod
+    def _get_duplicate_key(rule: version_1.CompareDeduplicationRule, values) -> tuple:
+        # Lax rules compare strings case insensitively, like __iexact
+        return tuple(
+            (
+                value.upper()
+                if rule.match_type == "lax" and isinstance(value, str)
+                else value
+            )
+            for value in values
+        )
+
+    def _check_duplicate_transaction(self, transaction_data: Dict[str, Any]) -> bool:
+        for rule in self.deduplication:
+            if rule.type == "compare" and self._matches_deduplication_rule(
+                rule, transaction_data
+            ):
+                return True
 
         return False
 
+    def _matches_deduplication_rule(
+        self,
+        rule: version_1.CompareDeduplicationRule,
+        transaction_data: Dict[str, Any],
+    ) -> bool:
+        query = Transaction.all_objects.all().values("id")
+
+        # Build query conditions for each field in the rule
+        for field in rule.fields:
+            if field in transaction_data:
+                value = transaction_data[field]
+                query = self._apply_deduplication_filter(
+                    query=query,
+                    field=field,
+                    value=value,
+                    match_type=rule.match_type,
+                )
+
+        # If we found any matching transaction, it's a duplicate
+        return query.exists()
+
     @staticmethod
     def _is_int_like(value: Any) -> bool:
         try:
@@ -704,6 +1174,10 @@ class ImportService:
         return Decimal(value)
 
     def _process_row(self, row: Dict[str, str], row_number: int) -> None:
+        if self.batch_size:
+            self._queue_row(row, row_number)
+            return
+
         try:
             mapped_data = self._map_row(row)
 
@@ -745,14 +1219,20 @@ class ImportService:
             logger.error(f"Fatal error processing row {row_number}", exc_info=e)
 
     def _process_csv(self, file_path):
-        # First pass: count rows
-        with open(file_path, "r", encoding=self.settings.encoding) as csv_file:
-            # Skip specified number of rows
-            for _ in range(self.settings.skip_lines):
-                next(csv_file)
+        self._log("info", "Starting import")
 
-            reader = csv.DictReader(csv_file, delimiter=self.settings.delimiter)
-            self._update_totals("total", value=sum(1 for _ in reader))
+        for row_number, row in self._read_csv(file_path):
+            self._process_row(row, row_number)
+
+    def _read_csv(self, file_path):
+        """
+        Yield the numbered rows of a CSV file, reading it a single time.
+
+        The total row count isn't known until the end, so it is estimated from
+        the bytes read so far against the file size every TOTAL_ESTIMATE_ROWS
+        rows, and set to the real count once the file is exhausted.
+        """
+        file_size = os.path.getsize(file_path)
 
         with open(file_path, "r", encoding=self.settings.encoding) as csv_file:
             # Skip specified number of rows
@@ -763,10 +1243,25 @@ class ImportService:
 
             reader = csv.DictReader(csv_file, delimiter=self.settings.delimiter)
 
-            self._log("info", f"Starting import with {self.import_run.total_rows} rows")
+            rows = enumerate(reader, start=1)
+            if self.row_range:
+                rows = islice(rows, *self.row_range)
+
+            row_number = 0
+            for row_number, row in rows:
+                if row_number % self.TOTAL_ESTIMATE_ROWS == 1:
+                    # The text layer reads ahead in chunks, so this is the
+                    # position of the underlying binary buffer
+                    bytes_read = csv_file.buffer.tell()
+                    if bytes_read:
+                        self._update_totals(
+                            "total",
+                            value=max(row_number, row_number * file_size // bytes_read),
+                        )
+
+                yield row_number, row
 
-            for row_number, row in enumerate(reader, start=1):
-                self._process_row(row, row_number)
+            self._update_totals("total", value=row_number)
 
     def _process_excel(self, file_path):
         try:
@@ -813,6 +1308,9 @@ class ImportService:
                         ),
                         start=1,
                     ):
+                        if not self._in_row_range():
+                            continue
+
                         try:
                             row_data = {
                                 key: str(value) if value is not None else None
@@ -868,6 +1366,9 @@ class ImportService:
                         for col in range(sheet.ncols)
                     ]
                     for row_number in range(self.settings.start_row, sheet.nrows):
+                        if not self._in_row_range():
+                            continue
+
                         try:
                             row_data = {}
                             for col, key in enumerate(headers):
@@ -1143,17 +1644,21 @@ class ImportService:
 
             self._update_status("PROCESSING")
             self.import_run.started_at = timezone.now()
-            self.import_run.save(update_fields=["started_at"])
+            self._write_progress("started_at", force=True)
 
             self._log("info", "Starting import process")
 
             try:
-                if isinstance(self.settings, version_1.CSVImportSettings):
-                    self._process_csv(file_path)
-                elif isinstance(self.settings, version_1.ExcelImportSettings):
-                    self._process_excel(file_path)
-                elif isinstance(self.settings, version_1.QIFImportSettings):
-                    self._process_qif(file_path)
+                # One rules job per batch of imported rows instead of one per row
+                with batched_rule_checks():
+                    if isinstance(self.settings, version_1.CSVImportSettings):
+                        self._process_csv(file_path)
+                    elif isinstance(self.settings, version_1.ExcelImportSettings):
+                        self._process_excel(file_path)
+                    elif isinstance(self.settings, version_1.QIFImportSettings):
+                        self._process_qif(file_path)
+
+                    self._flush_batch()
 
                 self._update_status("FINISHED")
                 self._log(
@@ -1170,13 +1675,180 @@ class ImportService:
                 raise Exception("Import failed")
 
             finally:
-                self._log("info", "Cleaning up temporary files")
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        self._log("info", f"Deleted temporary file: {file_path}")
-                except OSError as e:
-                    self._log("warning", f"Failed to delete temporary file: {str(e)}")
+                # Shards share the file, merge_shards deletes it
+                if not self.row_range:
+                    self._log("info", "Cleaning up temporary files")
+                    try:
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                            self._log("info", f"Deleted temporary file: {file_path}")
+                    except OSError as e:
+                        self._log(
+                            "warning", f"Failed to delete temporary file: {str(e)}"
+                        )
 
                 self.import_run.finished_at = timezone.now()
-                self.import_run.save(update_fields=["finished_at"])
+                self._write_progress("finished_at", force=True)
+
+    def _in_row_range(self) -> bool:
+        """Count a row of the file and tell whether this import handles it"""
+        self._row_index += 1
+        if not self.row_range:
+            return True
+
+        start, end = self.row_range
+        return start < self._row_index and (end is None or self._row_index <= end)
+
+    def _count_rows(self, file_path: str) -> int:
+        if isinstance(self.settings, version_1.CSVImportSettings):
+            with open(file_path, "r", encoding=self.settings.encoding) as csv_file:
+                for _ in range(self.settings.skip_lines):
+                    next(csv_file)
+
+                reader = csv.DictReader(csv_file, delimiter=self.settings.delimiter)
+                return sum(1 for _ in reader)
+
+        if self.settings.file_type == "xlsx":
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            sheet_names = workbook.sheetnames
+            sheet_rows = {name: workbook[name].max_row for name in sheet_names}
+            workbook.close()
+        else:
+            workbook = xlrd.open_workbook(file_path, on_demand=True)
+            sheet_names = workbook.sheet_names()
+            sheet_rows = {
+                name: workbook.sheet_by_name(name).nrows for name in sheet_names
+            }
+
+        sheets = self.settings.sheets
+        if sheets != "*":
+            sheet_names = sheets if isinstance(sheets, list) else [sheets]
+
+        return sum(
+            max(0, sheet_rows[name] - self.settings.start_row)
+            for name in sheet_names
+            if name in sheet_rows
+        )
+
+    def split_file(self, file_path: str) -> list[ImportRun]:
+        """
+        Split a transactions file with more than shard_size rows into shard runs
+        of shard_size rows, each imported by its own process_import_shard job.
+        Returns an empty list if the file is to be imported in one go.
+        """
+        shard_size = getattr(self.settings, "shard_size", 0)
+        if not shard_size or self.settings.importing != "transactions":
+            return []
+
+        file_path = self._validate_file_path(file_path)
+
+        with cachalot_disabled():
+            total_rows = self._count_rows(file_path)
+            if total_rows <= shard_size:
+                return []
+
+            starts = range(0, total_rows, shard_size)
+            shards = ImportRun.objects.bulk_create(
+                [
+                    ImportRun(
+                        profile=self.profile,
+                        file_name=self.import_run.file_name,
+                        parent=self.import_run,
+                        shard_start=start,
+                        # The last shard also takes rows the count missed
+                        shard_end=start + shard_size if start != starts[-1] else None,
+                    )
+                    for start in starts
+                ]
+            )
+
+            self.import_run.started_at = timezone.now()
+            self._update_totals("total", value=total_rows)
+            self._log(
+                "info",
+                f"Splitting {total_rows} rows into {len(shards)} shards "
+                f"of {shard_size} rows",
+            )
+            self._write_progress("started_at")
+            self._update_status("PROCESSING")
+
+        return shards
+
+    @classmethod
+    def merge_shards(cls, import_run: ImportRun, file_path: str) -> bool:
+        """
+        Merge the counters, logs and imported objects of finished shards into
+        their parent run. Returns False if some shard is still running.
+        """
+        with cachalot_disabled(), transaction.atomic():
+            import_run = ImportRun.objects.select_for_update().get(id=import_run.id)
+            shards = list(import_run.shards.all())
+            if import_run.finished_at or any(
+                shard.status in (ImportRun.Status.QUEUED, ImportRun.Status.PROCESSING)
+                for shard in shards
+            ):
+                return False
+
+            for field in (
+                "processed_rows",
+                "successful_rows",
+                "skipped_rows",
+                "failed_rows",
+            ):
+                setattr(import_run, field, sum(getattr(s, field) for s in shards))
+
+            ImportRunLog.objects.filter(import_run__in=shards).update(
+                import_run=import_run
+            )
+
+            for name in (
+                "transactions",
+                "tags",
+                "categories",
+                "entities",
+                "currencies",
+            ):
+                field = ImportRun._meta.get_field(name)
+                through = field.remote_field.through
+                source = field.m2m_field_name()
+                target = f"{field.m2m_reverse_field_name()}_id"
+                through.objects.bulk_create(
+                    [
+                        through(**{source: import_run, target: related_id})
+                        for related_id in through.objects.filter(
+                            **{f"{source}__in": shards}
+                        ).values_list(target, flat=True)
+                    ],
+                    ignore_conflicts=True,
+                    batch_size=1000,
+                )
+
+            failed = any(shard.status == ImportRun.Status.FAILED for shard in shards)
+            import_run.status = (
+                ImportRun.Status.FAILED if failed else ImportRun.Status.FINISHED
+            )
+            import_run.finished_at = timezone.now()
+            import_run.save()
+
+            ImportRunLog.objects.create(
+                import_run=import_run,
+                level="error" if failed else "info",
+                message=(
+                    f"Import of {len(shards)} shards "
+                    f"{'failed' if failed else 'completed'}. "
+                    f"Successful: {import_run.successful_rows}, "
+                    f"Failed: {import_run.failed_rows}, "
+                    f"Skipped: {import_run.skipped_rows}"
+                ),
+            )
+
+            import_run.shards.all().delete()
+
+        try:
+            file_path = os.path.abspath(file_path)
+            if file_path.startswith(cls.TEMP_DIR) and os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as e:
+            logger.warning(f"Failed to delete temporary file: {str(e)}")
+
+        return True
@@ -1,14 +1,22 @@
 import logging
+from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils import timezone
 from procrastinate.contrib.django import app
+from procrastinate.contrib.django.models import ProcrastinateJob
 
 from apps.common.middleware.thread_local import write_current_user, delete_current_user
-from apps.import_app.models import ImportRun
+from apps.import_app.models import ImportRun, ImportRunLog
 from apps.import_app.services import ImportServiceV1
 
 logger = logging.getLogger(__name__)
 
+# Workers send a heartbeat every few seconds, one silent for this long is gone
+# along with the jobs it was running
+STALLED_WORKER_TIMEOUT = timedelta(minutes=5)
+
 
 @app.task(name="process_import")
 def process_import(import_run_id: int, file_path: str, user_id: int):
@@ -18,8 +26,119 @@ def process_import(import_run_id: int, file_path: str, user_id: int):
     try:
         import_run = ImportRun.objects.get(id=import_run_id)
         import_service = ImportServiceV1(import_run)
-        import_service.process_file(file_path)
+
+        shards = import_service.split_file(file_path)
+        if shards:
+            for shard in shards:
+                process_import_shard.defer(
+                    import_run_id=shard.id, file_path=file_path, user_id=user_id
+                )
+        else:
+            import_service.process_file(file_path)
+        delete_current_user()
+    except ImportRun.DoesNotExist:
         delete_current_user()
+        raise ValueError(f"ImportRun with id {import_run_id} not found")
+
+
+@app.task(name="process_import_shard")
+def process_import_shard(import_run_id: int, file_path: str, user_id: int):
+    user = get_user_model().objects.get(id=user_id)
+    write_current_user(user)
+
+    try:
+        shard = ImportRun.objects.get(id=import_run_id)
     except ImportRun.DoesNotExist:
         delete_current_user()
         raise ValueError(f"ImportRun with id {import_run_id} not found")
+
+    try:
+        ImportServiceV1(shard).process_file(file_path)
+    finally:
+        delete_current_user()
+
+        # A shard that failed before updating its status, e.g. on an invalid file
+        # path, would otherwise keep its parent run from ever being merged
+        ImportRun.objects.filter(
+            id=shard.id,
+            status__in=[ImportRun.Status.QUEUED, ImportRun.Status.PROCESSING],
+        ).update(status=ImportRun.Status.FAILED, finished_at=timezone.now())
+
+        # The last shard to finish hands over to the aggregation job
+        if not ImportRun.objects.filter(
+            parent_id=shard.parent_id,
+            status__in=[ImportRun.Status.QUEUED, ImportRun.Status.PROCESSING],
+        ).exists():
+            finish_import_shards.defer(
+                import_run_id=shard.parent_id, file_path=file_path
+            )
+
+
+@app.task(name="finish_import_shards")
+def finish_import_shards(import_run_id: int, file_path: str):
+    import_run = ImportRun.objects.get(id=import_run_id)
+
+    # Shards finishing at the same time may both defer this job
+    if not ImportServiceV1.merge_shards(import_run, file_path):
+        logger.info(f"ImportRun {import_run_id} shards already merged or running")
+
+
+@app.periodic(cron="*/10 * * * *")
+@app.task(lock="fail_stalled_import_shards", name="fail_stalled_import_shards")
+def fail_stalled_import_shards(timestamp=None):
+    running = [ImportRun.Status.QUEUED, ImportRun.Status.PROCESSING]
+
+    shards = list(ImportRun.objects.filter(parent__isnull=False, status__in=running))
+    if not shards:
+        return "No running import shards."
+
+    jobs = ProcrastinateJob.objects.filter(
+        task_name__in=["process_import", "process_import_shard"]
+    )
+    alive = {
+        (job.task_name, job.args.get("import_run_id"))
+        for job in jobs.filter(
+            Q(status="todo")
+            | Q(
+                status="doing",
+                worker__last_heartbeat__gte=timezone.now() - STALLED_WORKER_TIMEOUT,
+            )
+        ).only("task_name", "args")
+    }
+
+    # A shard waiting on its parent's split job to defer it isn't stalled either
+    stalled = [
+        shard
+        for shard in shards
+        if ("process_import_shard", shard.id) not in alive
+        and ("process_import", shard.parent_id) not in alive
+    ]
+
+    failed = 0
+    for shard in stalled:
+        if ImportRun.objects.filter(id=shard.id, status__in=running).update(
+            status=ImportRun.Status.FAILED, finished_at=timezone.now()
+        ):
+            ImportRunLog.objects.create(
+                import_run=shard,
+                level=ImportRunLog.Level.ERROR,
+                message="Import stopped: the worker processing it is gone",
+            )
+            failed += 1
+
+    parent_ids = {shard.parent_id for shard in stalled}
+    for parent_id in parent_ids:
+        if ImportRun.objects.filter(parent_id=parent_id, status__in=running).exists():
+            continue
+
+        job_args = (
+            jobs.filter(task_name="process_import", args__import_run_id=parent_id)
+            .values_list("args", flat=True)
+            .first()
+        )
+        finish_import_shards.defer(
+            import_run_id=parent_id,
+            file_path=job_args["file_path"] if job_args else "",
+        )
+
+    return f"Failed {failed} stalled import shards."
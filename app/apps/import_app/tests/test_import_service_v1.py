@@ -6,15 +6,26 @@ different field types correctly, particularly ensuring that __iexact
 is only used for string fields (not dates, decimals, etc.).
 """
 
-from datetime import date
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
 from decimal import Decimal
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from apps.accounts.models import Account, AccountGroup
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
 from apps.currencies.models import Currency
-from apps.import_app.models import ImportProfile, ImportRun
+from apps.import_app.models import ImportProfile, ImportRun, ImportRunLog
 from apps.import_app.services.v1 import ImportService
+from apps.import_app.tasks import fail_stalled_import_shards, process_import_shard
 from apps.transactions.models import Transaction, TransactionEntity
 
 
@@ -309,3 +320,429 @@ deduplication:
             }
         )
         self.assertFalse(is_duplicate)
+
+
+class BatchedImportTests(TestCase):
+    """Tests for imports using batch_size."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.original_temp_dir = ImportService.TEMP_DIR
+        self.test_dir = tempfile.mkdtemp()
+        ImportService.TEMP_DIR = self.test_dir
+
+        self.user = get_user_model().objects.create_user(
+            email="batch@example.com", password="password"
+        )
+        write_current_user(self.user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+        Transaction.objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            date=date(2024, 1, 1),
+            amount=Decimal("5.00"),
+            description="Already imported",
+            owner=self.user,
+        )
+
+    def tearDown(self):
+        delete_current_user()
+        ImportService.TEMP_DIR = self.original_temp_dir
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _import(self, content: str, batch_size: int = 2, skip_errors: bool = True):
+        yaml_config = f"""
+settings:
+  file_type: csv
+  importing: transactions
+  trigger_transaction_rules: false
+  skip_errors: {str(skip_errors).lower()}
+  batch_size: {batch_size}
+mapping:
+  date_field:
+    source: date
+    target: date
+    format: "%Y-%m-%d"
+  amount_field:
+    source: amount
+    target: amount
+  description_field:
+    source: description
+    target: description
+  account_field:
+    source: account
+    target: account
+    type: name
+  category_field:
+    source: category
+    target: category
+  tags_field:
+    source: tags
+    target: tags
+deduplication:
+  - type: compare
+    fields: ["date", "description"]
+    match_type: lax
+"""
+        profile = ImportProfile.objects.create(
+            name=f"Batched {batch_size}", yaml_config=yaml_config
+        )
+        import_run = ImportRun.objects.create(profile=profile, file_name="test.csv")
+
+        file_path = os.path.join(self.test_dir, "test.csv")
+        with open(file_path, "w", encoding="utf-8") as csv_file:
+            csv_file.write(content)
+
+        ImportService(import_run).process_file(file_path)
+        import_run.refresh_from_db()
+        return import_run
+
+    def test_rows_are_imported_in_chunks(self):
+        """Test that batched rows get their account, category and tags."""
+        import_run = self._import(
+            "date,amount,description,account,category,tags\n"
+            '2024-02-01,10.00,Coffee,Checking,Food,"Morning,Work"\n'
+            "2024-02-02,20.00,Lunch,Checking,Food,Work\n"
+            "2024-02-03,30.00,Dinner,Checking,,\n"
+        )
+
+        self.assertEqual(import_run.successful_rows, 3)
+        self.assertEqual(import_run.processed_rows, 3)
+        self.assertEqual(import_run.transactions.count(), 3)
+
+        coffee = Transaction.objects.get(description="Coffee")
+        self.assertEqual(coffee.account, self.account)
+        self.assertEqual(coffee.owner, self.user)
+        self.assertEqual(coffee.reference_date, date(2024, 2, 1))
+        self.assertEqual(coffee.category.name, "Food")
+        self.assertEqual(
+            sorted(coffee.tags.values_list("name", flat=True)), ["Morning", "Work"]
+        )
+        self.assertEqual(
+            Transaction.objects.get(description="Lunch").category, coffee.category
+        )
+        self.assertIsNone(Transaction.objects.get(description="Dinner").category)
+        self.assertEqual(import_run.tags.count(), 2)
+        self.assertEqual(import_run.categories.count(), 1)
+
+    def test_duplicates_are_skipped_within_the_file_and_against_the_database(self):
+        """Test that the prefetched key set finds both kinds of duplicates."""
+        import_run = self._import(
+            "date,amount,description,account,category,tags\n"
+            "2024-01-01,5.00,ALREADY IMPORTED,Checking,,\n"
+            "2024-02-01,10.00,Coffee,Checking,,\n"
+            "2024-02-01,10.00,coffee,Checking,,\n"
+        )
+
+        self.assertEqual(import_run.successful_rows, 1)
+        self.assertEqual(import_run.skipped_rows, 2)
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_failing_rows_are_skipped(self):
+        """Test that a row with an unknown account fails alone."""
+        import_run = self._import(
+            "date,amount,description,account,category,tags\n"
+            "2024-02-01,10.00,Coffee,Checking,,\n"
+            "2024-02-02,20.00,Lunch,Savings,,\n"
+            "2024-02-03,30.00,Dinner,Checking,,\n"
+        )
+
+        self.assertEqual(import_run.successful_rows, 2)
+        self.assertEqual(import_run.failed_rows, 1)
+        self.assertTrue(
+            import_run.log_entries.filter(
+                level="warning", message__contains="Account 'Savings' not found"
+            ).exists()
+        )
+        self.assertFalse(Transaction.objects.filter(description="Lunch").exists())
+
+    def test_batches_use_fewer_queries_than_row_by_row(self):
+        """Test that a chunk's rows share their lookups and inserts."""
+        content = "date,amount,description,account,category,tags\n" + "".join(
+            f"2024-03-{day:02d},1.00,Row {day},Checking,Food,Tag\n"
+            for day in range(1, 21)
+        )
+
+        with CaptureQueriesContext(connection) as batched:
+            self._import(content, batch_size=20)
+        Transaction.all_objects.filter(description__startswith="Row").hard_delete()
+        with CaptureQueriesContext(connection) as row_by_row:
+            self._import(content, batch_size=0)
+
+        self.assertLess(len(batched), len(row_by_row) / 4)
+
+    def test_log_lines_are_written_in_bulk(self):
+        """Test that log lines are buffered instead of saved one by one."""
+        content = "date,amount,description,account,category,tags\n" + "".join(
+            f"2024-03-{day:02d},1.00,Row {day},Checking,Food,Tag\n"
+            for day in range(1, 21)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            import_run = self._import(content, batch_size=0)
+
+        log_inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "import_app_importrunlog"')
+        ]
+        self.assertTrue(
+            import_run.log_entries.filter(
+                message="Successfully processed row 20"
+            ).exists()
+        )
+        self.assertGreater(import_run.log_entries.count(), 20)
+        self.assertLess(len(log_inserts), 10)
+        self.assertEqual(
+            import_run.log_entries.last().message,
+            "Deleted temporary file: " + os.path.join(self.test_dir, "test.csv"),
+        )
+
+    def test_csv_total_is_estimated_while_streaming(self):
+        """Test that the total row count is estimated in a single pass."""
+        content = "date,amount,description,account,category,tags\n" + "".join(
+            f"2024-{month:02d}-{day:02d},1.00,Row {month} {day},Checking,,\n"
+            for month in range(1, 11)
+            for day in range(1, 26)
+        )
+
+        with mock.patch.object(ImportService, "TOTAL_ESTIMATE_ROWS", 10):
+            with mock.patch.object(
+                ImportService,
+                "_update_totals",
+                autospec=True,
+                side_effect=ImportService._update_totals,
+            ) as update_totals:
+                import_run = self._import(content, batch_size=50)
+
+        totals = [
+            call.kwargs["value"]
+            for call in update_totals.call_args_list
+            if call.args[1] == "total"
+        ]
+        self.assertGreater(len(totals), 1)
+        self.assertLess(totals[0], 250)
+        self.assertEqual(totals[-1], 250)
+        self.assertEqual(import_run.total_rows, 250)
+        self.assertEqual(import_run.successful_rows, 250)
+
+
+class ShardedImportTests(TestCase):
+    """Tests for imports split into shards with shard_size."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.original_temp_dir = ImportService.TEMP_DIR
+        self.test_dir = tempfile.mkdtemp()
+        ImportService.TEMP_DIR = self.test_dir
+
+        self.user = get_user_model().objects.create_user(
+            email="shard@example.com", password="password"
+        )
+        write_current_user(self.user)
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Checking", currency=self.currency, owner=self.user
+        )
+
+        yaml_config = """
+settings:
+  file_type: csv
+  importing: transactions
+  trigger_transaction_rules: false
+  shard_size: 4
+mapping:
+  date_field:
+    source: date
+    target: date
+    format: "%Y-%m-%d"
+  amount_field:
+    source: amount
+    target: amount
+  description_field:
+    source: description
+    target: description
+  account_field:
+    source: account
+    target: account
+    type: name
+deduplication:
+  - type: compare
+    fields: ["date", "description"]
+    match_type: lax
+"""
+        self.profile = ImportProfile.objects.create(
+            name="Sharded", yaml_config=yaml_config
+        )
+        self.import_run = ImportRun.objects.create(
+            profile=self.profile, file_name="test.csv"
+        )
+
+        self.file_path = os.path.join(self.test_dir, "test.csv")
+        with open(self.file_path, "w", encoding="utf-8") as csv_file:
+            csv_file.write(
+                "date,amount,description,account\n"
+                + "".join(
+                    f"2024-04-{day:02d},1.00,Row {day},Checking\n"
+                    for day in range(1, 10)
+                )
+                # Duplicate of a row in the first shard
+                + "2024-04-02,1.00,ROW 2,Checking\n"
+            )
+
+    def tearDown(self):
+        delete_current_user()
+        ImportService.TEMP_DIR = self.original_temp_dir
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _insert_job(self, task_name, status, import_run_id, heartbeat=None):
+        with connection.cursor() as cursor:
+            worker_id = None
+            if heartbeat is not None:
+                cursor.execute(
+                    "INSERT INTO procrastinate_workers (last_heartbeat) "
+                    "VALUES (%s) RETURNING id",
+                    [heartbeat],
+                )
+                worker_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT INTO procrastinate_jobs "
+                "(queue_name, task_name, args, status, worker_id) "
+                "VALUES ('default', %s, %s, %s, %s) RETURNING id",
+                [
+                    task_name,
+                    json.dumps(
+                        {"import_run_id": import_run_id, "file_path": self.file_path}
+                    ),
+                    status,
+                    worker_id,
+                ],
+            )
+            return worker_id
+
+    def test_file_is_split_into_row_ranges(self):
+        """Test that shards cover the whole file, the last one open ended."""
+        shards = ImportService(self.import_run).split_file(self.file_path)
+
+        self.assertEqual(
+            [(shard.shard_start, shard.shard_end) for shard in shards],
+            [(0, 4), (4, 8), (8, None)],
+        )
+        self.import_run.refresh_from_db()
+        self.assertEqual(self.import_run.total_rows, 10)
+        self.assertEqual(self.import_run.status, ImportRun.Status.PROCESSING)
+
+    def test_small_files_are_not_split(self):
+        """Test that files within shard_size are imported in one job."""
+        with open(self.file_path, "w", encoding="utf-8") as csv_file:
+            csv_file.write(
+                "date,amount,description,account\n2024-04-01,1.00,Row 1,Checking\n"
+            )
+
+        self.assertEqual(ImportService(self.import_run).split_file(self.file_path), [])
+        self.assertFalse(self.import_run.shards.exists())
+
+    def test_shards_are_merged_into_the_parent_run(self):
+        """Test that shard counters, logs and transactions end up in the parent."""
+        shards = ImportService(self.import_run).split_file(self.file_path)
+
+        self.assertFalse(ImportService.merge_shards(self.import_run, self.file_path))
+        for shard in reversed(shards):
+            ImportService(shard).process_file(self.file_path)
+            self.assertTrue(os.path.exists(self.file_path))
+        self.assertTrue(ImportService.merge_shards(self.import_run, self.file_path))
+
+        self.import_run.refresh_from_db()
+        self.assertEqual(self.import_run.status, ImportRun.Status.FINISHED)
+        self.assertEqual(self.import_run.processed_rows, 9)
+        self.assertEqual(self.import_run.successful_rows, 9)
+        self.assertEqual(self.import_run.skipped_rows, 1)
+        self.assertEqual(self.import_run.transactions.count(), 9)
+        self.assertEqual(Transaction.objects.count(), 9)
+        self.assertTrue(
+            self.import_run.log_entries.filter(
+                message="Successfully processed row 9"
+            ).exists()
+        )
+        self.assertFalse(ImportRun.objects.filter(parent=self.import_run).exists())
+        self.assertFalse(os.path.exists(self.file_path))
+
+        # Merging twice does nothing
+        self.assertFalse(ImportService.merge_shards(self.import_run, self.file_path))
+
+    @mock.patch("apps.import_app.tasks.finish_import_shards.defer")
+    def test_shards_failing_early_are_marked_failed(self, mock_defer):
+        """Test that a shard failing before it starts still lets the run finish."""
+        shards = ImportService(self.import_run).split_file(self.file_path)
+        invalid_path = "/etc/passwd"
+        task_func = process_import_shard.func
+        task_func = getattr(task_func, "__wrapped__", task_func)
+
+        for shard in shards:
+            with self.assertRaises(ValueError):
+                task_func(
+                    import_run_id=shard.id,
+                    file_path=invalid_path,
+                    user_id=self.user.id,
+                )
+        # The task clears the current user
+        write_current_user(self.user)
+
+        self.assertEqual(
+            set(self.import_run.shards.values_list("status", flat=True)),
+            {ImportRun.Status.FAILED},
+        )
+        mock_defer.assert_called_once_with(
+            import_run_id=self.import_run.id, file_path=invalid_path
+        )
+
+    @mock.patch("apps.import_app.tasks.finish_import_shards.defer")
+    def test_shards_of_stalled_workers_are_marked_failed(self, mock_defer):
+        """Test that shards whose worker died stop holding up their parent run."""
+        shards = ImportService(self.import_run).split_file(self.file_path)
+        self._insert_job("process_import", "succeeded", self.import_run.id)
+        ImportService(shards[0]).process_file(self.file_path)
+        worker_id = self._insert_job(
+            "process_import_shard", "doing", shards[1].id, heartbeat=timezone.now()
+        )
+        self._insert_job(
+            "process_import_shard",
+            "doing",
+            shards[2].id,
+            heartbeat=timezone.now() - timedelta(hours=1),
+        )
+        task_func = fail_stalled_import_shards.func
+        task_func = getattr(task_func, "__wrapped__", task_func)
+
+        self.assertEqual(task_func(), "Failed 1 stalled import shards.")
+        self.assertEqual(
+            [shard.status for shard in self.import_run.shards.order_by("id")],
+            [
+                ImportRun.Status.FINISHED,
+                ImportRun.Status.QUEUED,
+                ImportRun.Status.FAILED,
+            ],
+        )
+        mock_defer.assert_not_called()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE procrastinate_workers SET last_heartbeat = %s WHERE id = %s",
+                [timezone.now() - timedelta(hours=1), worker_id],
+            )
+        self.assertEqual(task_func(), "Failed 1 stalled import shards.")
+        mock_defer.assert_called_once_with(
+            import_run_id=self.import_run.id, file_path=self.file_path
+        )
+        self.assertTrue(
+            shards[1].log_entries.filter(level=ImportRunLog.Level.ERROR).exists()
+        )
@@ -3,6 +3,7 @@ import shutil
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.files.storage import FileSystemStorage
+from django.core.paginator import Paginator
 from django.http import HttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.utils.translation import gettext_lazy as _
@@ -144,7 +145,9 @@ def import_profile_delete(request, profile_id):
 def import_runs_list(request, profile_id):
     profile = ImportProfile.objects.get(id=profile_id)
 
-    runs = ImportRun.objects.filter(profile=profile).order_by("-id")
+    runs = ImportRun.objects.filter(profile=profile, parent__isnull=True).order_by(
+        "-id"
+    )
 
     return render(
         request,
@@ -160,10 +163,21 @@ def import_runs_list(request, profile_id):
 def import_run_log(request, profile_id, run_id):
     run = ImportRun.objects.get(profile__id=profile_id, id=run_id)
 
+    page_number = request.GET.get("page", 1)
+    paginator = Paginator(run.log_entries.all(), 500)
+    page_obj = paginator.get_page(page_number)
+
+    # Further pages are appended to the already open log
+    template = (
+        "import_app/fragments/runs/log_entries.html"
+        if "page" in request.GET
+        else "import_app/fragments/runs/log.html"
+    )
+
     return render(
         request,
-        "import_app/fragments/runs/log.html",
-        {"run": run},
+        template,
+        {"run": run, "page_obj": page_obj},
     )
 
 
@@ -5,13 +5,26 @@ from django.db.models import Sum, Case, When, Value, DecimalField
 from django.db.models.functions import Coalesce
 
 from apps.transactions.models import Transaction
-from apps.currencies.models import Currency
-from apps.currencies.utils.convert import convert
+from apps.currencies.utils.totals import TotalsConverter
+
+EXCHANGED_FIELDS = [
+    "expense_current",
+    "expense_projected",
+    "income_current",
+    "income_projected",
+    "total_income",
+    "total_expense",
+    "total_current",
+    "total_projected",
+    "total_final",
+]
 
 
 def get_categories_totals(
     transactions_queryset, ignore_empty=False, show_entities=False
 ):
+    converter = TotalsConverter()
+
     # Step 1: Aggregate transaction data by category and currency.
     # This query calculates the total current and projected income/expense for each
     # category by grouping transactions and summing up their amounts based on their
@@ -195,38 +208,12 @@ def get_categories_totals(
 
         # Step 4a: Handle currency conversion for category totals if an exchange currency is defined.
         if metric["account__currency__exchange_currency"]:
-            from_currency = Currency.objects.get(id=currency_id)
-            exchange_currency = Currency.objects.get(
-                id=metric["account__currency__exchange_currency"]
+            exchanged = converter.exchange(
+                currency_data,
+                EXCHANGED_FIELDS,
+                currency_id,
+                metric["account__currency__exchange_currency"],
             )
-
-            exchanged = {}
-            for field in [
-                "expense_current",
-                "expense_projected",
-                "income_current",
-                "income_projected",
-                "total_income",
-                "total_expense",
-                "total_current",
-                "total_projected",
-                "total_final",
-            ]:
-                amount, prefix, suffix, decimal_places = convert(
-                    amount=currency_data[field],
-                    from_currency=from_currency,
-                    to_currency=exchange_currency,
-                )
-                if amount is not None:
-                    exchanged[field] = amount
-                    if "currency" not in exchanged:
-                        exchanged["currency"] = {
-                            "prefix": prefix,
-                            "suffix": suffix,
-                            "decimal_places": decimal_places,
-                            "code": exchange_currency.code,
-                            "name": exchange_currency.name,
-                        }
             if exchanged:
                 currency_data["exchanged"] = exchanged
 
@@ -291,38 +278,12 @@ def get_categories_totals(
 
             # Step 5a: Handle currency conversion for tag totals.
             if tag_metric["account__currency__exchange_currency"]:
-                from_currency = Currency.objects.get(id=currency_id)
-                exchange_currency = Currency.objects.get(
-                    id=tag_metric["account__currency__exchange_currency"]
+                exchanged = converter.exchange(
+                    tag_currency_data,
+                    EXCHANGED_FIELDS,
+                    currency_id,
+                    tag_metric["account__currency__exchange_currency"],
                 )
-
-                exchanged = {}
-                for field in [
-                    "expense_current",
-                    "expense_projected",
-                    "income_current",
-                    "income_projected",
-                    "total_income",
-                    "total_expense",
-                    "total_current",
-                    "total_projected",
-                    "total_final",
-                ]:
-                    amount, prefix, suffix, decimal_places = convert(
-                        amount=tag_currency_data[field],
-                        from_currency=from_currency,
-                        to_currency=exchange_currency,
-                    )
-                    if amount is not None:
-                        exchanged[field] = amount
-                        if "currency" not in exchanged:
-                            exchanged["currency"] = {
-                                "prefix": prefix,
-                                "suffix": suffix,
-                                "decimal_places": decimal_places,
-                                "code": exchange_currency.code,
-                                "name": exchange_currency.name,
-                            }
                 if exchanged:
                     tag_currency_data["exchanged"] = exchanged
 
@@ -462,38 +423,12 @@ def get_categories_totals(
                     }
 
                     if entity_metric["account__currency__exchange_currency"]:
-                        from_currency = Currency.objects.get(id=currency_id)
-                        exchange_currency = Currency.objects.get(
-                            id=entity_metric["account__currency__exchange_currency"]
+                        exchanged = converter.exchange(
+                            entity_currency_data,
+                            EXCHANGED_FIELDS,
+                            currency_id,
+                            entity_metric["account__currency__exchange_currency"],
                         )
-
-                        exchanged = {}
-                        for field in [
-                            "expense_current",
-                            "expense_projected",
-                            "income_current",
-                            "income_projected",
-                            "total_income",
-                            "total_expense",
-                            "total_current",
-                            "total_projected",
-                            "total_final",
-                        ]:
-                            amount, prefix, suffix, decimal_places = convert(
-                                amount=entity_currency_data[field],
-                                from_currency=from_currency,
-                                to_currency=exchange_currency,
-                            )
-                            if amount is not None:
-                                exchanged[field] = amount
-                                if "currency" not in exchanged:
-                                    exchanged["currency"] = {
-                                        "prefix": prefix,
-                                        "suffix": suffix,
-                                        "decimal_places": decimal_places,
-                                        "code": exchange_currency.code,
-                                        "name": exchange_currency.name,
-                                    }
                         if exchanged:
                             entity_currency_data["exchanged"] = exchanged
 
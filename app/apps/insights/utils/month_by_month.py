@@ -6,18 +6,18 @@ from django.db.models import Sum, Case, When, Value
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from apps.currencies.models import Currency
-from apps.currencies.utils.convert import convert
+from apps.currencies.utils.totals import TotalsConverter
 from apps.transactions.models import Transaction
 
 
-def get_month_by_month_data(year=None, group_by="categories"):
+def get_month_by_month_data(year=None, group_by="categories", queryset=None):
     """
     Aggregate transaction totals by month for a specific year, grouped by categories, tags, or entities.
 
     Args:
         year: The year to filter transactions (defaults to current year)
         group_by: One of "categories", "tags", or "entities"
+        queryset: The transactions to aggregate (defaults to all of them)
 
     Returns:
         {
@@ -39,11 +39,16 @@ def get_month_by_month_data(year=None, group_by="categories"):
             "grand_total": {"currencies": {...}}
         }
     """
+    converter = TotalsConverter()
+
     if year is None:
         year = timezone.localdate(timezone.now()).year
 
+    if queryset is None:
+        queryset = Transaction.objects.all()
+
     # Base queryset - all paid transactions, non-muted
-    transactions = Transaction.objects.filter(
+    transactions = queryset.filter(
         is_paid=True,
         account__is_archived=False,
     ).exclude(account__currency__is_archived=True)
@@ -182,28 +187,14 @@ def get_month_by_month_data(year=None, group_by="categories"):
 
         # Handle currency conversion if exchange currency is set
         if metric["account__currency__exchange_currency"]:
-            from_currency = Currency.objects.get(id=currency_id)
-            exchange_currency = Currency.objects.get(
-                id=metric["account__currency__exchange_currency"]
+            exchanged = converter.exchange(
+                currency_data,
+                ["final_total"],
+                currency_id,
+                metric["account__currency__exchange_currency"],
             )
-
-            converted_amount, prefix, suffix, decimal_places = convert(
-                amount=final_total,
-                from_currency=from_currency,
-                to_currency=exchange_currency,
-            )
-
-            if converted_amount is not None:
-                currency_data["exchanged"] = {
-                    "final_total": converted_amount,
-                    "currency": {
-                        "prefix": prefix,
-                        "suffix": suffix,
-                        "decimal_places": decimal_places,
-                        "code": exchange_currency.code,
-                        "name": exchange_currency.name,
-                    },
-                }
+            if exchanged:
+                currency_data["exchanged"] = exchanged
 
         result["items"][item_key]["month_totals"][month]["currencies"][currency_id] = (
             currency_data
@@ -243,74 +234,38 @@ def get_month_by_month_data(year=None, group_by="categories"):
     for item_key, item_data in result["items"].items():
         for currency_id, total_data in item_data["total"]["currencies"].items():
             if currency_info[currency_id]["exchange_currency_id"]:
-                from_currency = Currency.objects.get(id=currency_id)
-                exchange_currency = Currency.objects.get(
-                    id=currency_info[currency_id]["exchange_currency_id"]
-                )
-                converted_amount, prefix, suffix, decimal_places = convert(
-                    amount=total_data["final_total"],
-                    from_currency=from_currency,
-                    to_currency=exchange_currency,
+                exchanged = converter.exchange(
+                    total_data,
+                    ["final_total"],
+                    currency_id,
+                    currency_info[currency_id]["exchange_currency_id"],
                 )
-                if converted_amount is not None:
-                    total_data["exchanged"] = {
-                        "final_total": converted_amount,
-                        "currency": {
-                            "prefix": prefix,
-                            "suffix": suffix,
-                            "decimal_places": decimal_places,
-                            "code": exchange_currency.code,
-                            "name": exchange_currency.name,
-                        },
-                    }
+                if exchanged:
+                    total_data["exchanged"] = exchanged
 
     # Add currency conversion for month totals
     for month, month_data in result["month_totals"].items():
         for currency_id, total_data in month_data["currencies"].items():
             if currency_info[currency_id]["exchange_currency_id"]:
-                from_currency = Currency.objects.get(id=currency_id)
-                exchange_currency = Currency.objects.get(
-                    id=currency_info[currency_id]["exchange_currency_id"]
-                )
-                converted_amount, prefix, suffix, decimal_places = convert(
-                    amount=total_data["final_total"],
-                    from_currency=from_currency,
-                    to_currency=exchange_currency,
+                exchanged = converter.exchange(
+                    total_data,
+                    ["final_total"],
+                    currency_id,
+                    currency_info[currency_id]["exchange_currency_id"],
                 )
-                if converted_amount is not None:
-                    total_data["exchanged"] = {
-                        "final_total": converted_amount,
-                        "currency": {
-                            "prefix": prefix,
-                            "suffix": suffix,
-                            "decimal_places": decimal_places,
-                            "code": exchange_currency.code,
-                            "name": exchange_currency.name,
-                        },
-                    }
+                if exchanged:
+                    total_data["exchanged"] = exchanged
 
     # Add currency conversion for grand total
     for currency_id, total_data in result["grand_total"]["currencies"].items():
         if currency_info[currency_id]["exchange_currency_id"]:
-            from_currency = Currency.objects.get(id=currency_id)
-            exchange_currency = Currency.objects.get(
-                id=currency_info[currency_id]["exchange_currency_id"]
+            exchanged = converter.exchange(
+                total_data,
+                ["final_total"],
+                currency_id,
+                currency_info[currency_id]["exchange_currency_id"],
             )
-            converted_amount, prefix, suffix, decimal_places = convert(
-                amount=total_data["final_total"],
-                from_currency=from_currency,
-                to_currency=exchange_currency,
-            )
-            if converted_amount is not None:
-                total_data["exchanged"] = {
-                    "final_total": converted_amount,
-                    "currency": {
-                        "prefix": prefix,
-                        "suffix": suffix,
-                        "decimal_places": decimal_places,
-                        "code": exchange_currency.code,
-                        "name": exchange_currency.name,
-                    },
-                }
+            if exchanged:
+                total_data["exchanged"] = exchanged
 
     return result
@@ -3,6 +3,7 @@ from django.utils import timezone
 
 from dateutil.relativedelta import relativedelta
 
+from apps.common.functions.dates import month_bounds
 from apps.transactions.models import Transaction
 from apps.insights.forms import (
     SingleMonthForm,
@@ -29,8 +30,9 @@ def get_transactions(
             else:
                 month = timezone.localdate(timezone.now()).replace(day=1)
 
+            month_start, month_end = month_bounds(month.year, month.month)
             transactions = transactions.filter(
-                reference_date__month=month.month, reference_date__year=month.year
+                reference_date__gte=month_start, reference_date__lte=month_end
             )
         elif filter_type == "year":
             form = SingleYearForm(request.GET)
@@ -85,8 +87,9 @@ def get_transactions(
             )
     else:  # Default to current month
         month = timezone.localdate(timezone.now())
+        month_start, month_end = month_bounds(month.year, month.month)
         transactions = transactions.filter(
-            reference_date__month=month.month, reference_date__year=month.year
+            reference_date__gte=month_start, reference_date__lte=month_end
         )
 
     if not include_unpaid:
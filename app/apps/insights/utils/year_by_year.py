@@ -5,8 +5,7 @@ from django.db import models
 from django.db.models import Sum, Case, When, Value
 from django.db.models.functions import Coalesce
 
-from apps.currencies.models import Currency
-from apps.currencies.utils.convert import convert
+from apps.currencies.utils.totals import TotalsConverter
 from apps.transactions.models import Transaction
 
 
@@ -38,6 +37,8 @@ def get_year_by_year_data(group_by="categories"):
             "grand_total": {"currencies": {...}}  # Sum of everything
         }
     """
+    converter = TotalsConverter()
+
     # Base queryset - all paid transactions, non-muted
     transactions = Transaction.objects.filter(
         is_paid=True,
@@ -169,28 +170,14 @@ def get_year_by_year_data(group_by="categories"):
 
         # Handle currency conversion if exchange currency is set
         if metric["account__currency__exchange_currency"]:
-            from_currency = Currency.objects.get(id=currency_id)
-            exchange_currency = Currency.objects.get(
-                id=metric["account__currency__exchange_currency"]
-            )
-
-            converted_amount, prefix, suffix, decimal_places = convert(
-                amount=final_total,
-                from_currency=from_currency,
-                to_currency=exchange_currency,
+            exchanged = converter.exchange(
+                currency_data,
+                ["final_total"],
+                currency_id,
+                metric["account__currency__exchange_currency"],
             )
-
-            if converted_amount is not None:
-                currency_data["exchanged"] = {
-                    "final_total": converted_amount,
-                    "currency": {
-                        "prefix": prefix,
-                        "suffix": suffix,
-                        "decimal_places": decimal_places,
-                        "code": exchange_currency.code,
-                        "name": exchange_currency.name,
-                    },
-                }
+            if exchanged:
+                currency_data["exchanged"] = exchanged
 
         result["items"][item_key]["year_totals"][year]["currencies"][currency_id] = (
             currency_data
@@ -230,74 +217,38 @@ def get_year_by_year_data(group_by="categories"):
     for item_key, item_data in result["items"].items():
         for currency_id, total_data in item_data["total"]["currencies"].items():
             if currency_info[currency_id]["exchange_currency_id"]:
-                from_currency = Currency.objects.get(id=currency_id)
-                exchange_currency = Currency.objects.get(
-                    id=currency_info[currency_id]["exchange_currency_id"]
+                exchanged = converter.exchange(
+                    total_data,
+                    ["final_total"],
+                    currency_id,
+                    currency_info[currency_id]["exchange_currency_id"],
                 )
-                converted_amount, prefix, suffix, decimal_places = convert(
-                    amount=total_data["final_total"],
-                    from_currency=from_currency,
-                    to_currency=exchange_currency,
-                )
-                if converted_amount is not None:
-                    total_data["exchanged"] = {
-                        "final_total": converted_amount,
-                        "currency": {
-                            "prefix": prefix,
-                            "suffix": suffix,
-                            "decimal_places": decimal_places,
-                            "code": exchange_currency.code,
-                            "name": exchange_currency.name,
-                        },
-                    }
+                if exchanged:
+                    total_data["exchanged"] = exchanged
 
     # Add currency conversion for year totals
     for year, year_data in result["year_totals"].items():
         for currency_id, total_data in year_data["currencies"].items():
             if currency_info[currency_id]["exchange_currency_id"]:
-                from_currency = Currency.objects.get(id=currency_id)
-                exchange_currency = Currency.objects.get(
-                    id=currency_info[currency_id]["exchange_currency_id"]
-                )
-                converted_amount, prefix, suffix, decimal_places = convert(
-                    amount=total_data["final_total"],
-                    from_currency=from_currency,
-                    to_currency=exchange_currency,
+                exchanged = converter.exchange(
+                    total_data,
+                    ["final_total"],
+                    currency_id,
+                    currency_info[currency_id]["exchange_currency_id"],
                 )
-                if converted_amount is not None:
-                    total_data["exchanged"] = {
-                        "final_total": converted_amount,
-                        "currency": {
-                            "prefix": prefix,
-                            "suffix": suffix,
-                            "decimal_places": decimal_places,
-                            "code": exchange_currency.code,
-                            "name": exchange_currency.name,
-                        },
-                    }
+                if exchanged:
+                    total_data["exchanged"] = exchanged
 
     # Add currency conversion for grand total
     for currency_id, total_data in result["grand_total"]["currencies"].items():
         if currency_info[currency_id]["exchange_currency_id"]:
-            from_currency = Currency.objects.get(id=currency_id)
-            exchange_currency = Currency.objects.get(
-                id=currency_info[currency_id]["exchange_currency_id"]
+            exchanged = converter.exchange(
+                total_data,
+                ["final_total"],
+                currency_id,
+                currency_info[currency_id]["exchange_currency_id"],
             )
-            converted_amount, prefix, suffix, decimal_places = convert(
-                amount=total_data["final_total"],
-                from_currency=from_currency,
-                to_currency=exchange_currency,
-            )
-            if converted_amount is not None:
-                total_data["exchanged"] = {
-                    "final_total": converted_amount,
-                    "currency": {
-                        "prefix": prefix,
-                        "suffix": suffix,
-                        "decimal_places": decimal_places,
-                        "code": exchange_currency.code,
-                        "name": exchange_currency.name,
-                    },
-                }
+            if exchanged:
+                total_data["exchanged"] = exchanged
 
     return result
@@ -1,19 +1,26 @@
 from datetime import date
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 
 from apps.accounts.models import Account, AccountGroup
-from apps.currencies.models import Currency
+from apps.currencies.models import Currency, ExchangeRate
 from apps.transactions.models import (
     Transaction,
     TransactionCategory,
     TransactionTag,
 )
+from apps.transactions.utils import calculations
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
 
 
 @override_settings(
+    CACHES=LOCMEM_CACHES,
     STORAGES={
         "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
         "staticfiles": {
@@ -367,3 +374,83 @@ class MonthlySummaryFilterBehaviorTests(TestCase):
             HTTP_HX_REQUEST="true",
         )
         self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MonthlySummaryCacheTests(TestCase):
+    """Tests for the cached monthly summary fragments."""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+        self.client.login(username="testuser@test.com", password="testpass123")
+
+        self.currency = Currency.objects.create(
+            code="USD", name="US Dollar", decimal_places=2, prefix="$ "
+        )
+        self.account = Account.objects.create(
+            name="Test Account", currency=self.currency, owner=self.user
+        )
+        self._create_expense(date(2025, 12, 10), Decimal("200.00"))
+
+    def _create_expense(self, day, amount):
+        return Transaction.objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            date=day,
+            amount=amount,
+            owner=self.user,
+        )
+
+    def _get_summary(self, query=""):
+        with patch(
+            "apps.monthly_overview.views.calculate_currency_totals",
+            wraps=calculations.calculate_currency_totals,
+        ) as calculate:
+            response = self.client.get(
+                f"/monthly/12/2025/summary/currencies/{query}",
+                HTTP_HX_REQUEST="true",
+            )
+
+        data = response.context["currency_data"][self.currency.id]
+        return data["expense_current"], calculate.called
+
+    def test_repeated_requests_are_served_from_cache(self):
+        """Test that the totals are computed once per filter"""
+        self.assertEqual(self._get_summary(), (Decimal("200.00"), True))
+        self.assertEqual(self._get_summary(), (Decimal("200.00"), False))
+
+        # A different filter is cached separately
+        self.assertEqual(self._get_summary("?is_paid=1"), (Decimal("200.00"), True))
+
+    def test_transaction_changes_invalidate_their_month(self):
+        """Test that only changes to the summarized month bust the cache"""
+        self._get_summary()
+
+        self._create_expense(date(2025, 11, 10), Decimal("10.00"))
+        self.assertEqual(self._get_summary(), (Decimal("200.00"), False))
+
+        self._create_expense(date(2025, 12, 11), Decimal("10.00"))
+        self.assertEqual(self._get_summary(), (Decimal("210.00"), True))
+
+        Transaction.objects.filter(date=date(2025, 12, 11)).update(
+            amount=Decimal("20.00"), emit_signal=False
+        )
+        self.assertEqual(self._get_summary(), (Decimal("220.00"), True))
+
+    def test_exchange_rate_changes_invalidate_summaries(self):
+        """Test that exchanged values are recomputed when rates change"""
+        self._get_summary()
+
+        euro = Currency.objects.create(code="EUR", name="Euro")
+        self._get_summary()
+        ExchangeRate.objects.create(
+            from_currency=self.currency,
+            to_currency=euro,
+            rate=Decimal("0.9"),
+            date=date(2025, 12, 1),
+        )
+
+        self.assertEqual(self._get_summary(), (Decimal("200.00"), True))
@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.contrib.auth.decorators import login_required
 from django.db.models import (
     Q,
@@ -9,6 +11,7 @@ from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
 from apps.common.decorators.htmx import only_htmx
+from apps.common.functions.dates import month_bounds
 from apps.common.utils.dicts import remove_falsey_entries
 from apps.monthly_overview.utils.daily_spending_allowance import (
     calculate_daily_allowance_currency,
@@ -21,6 +24,7 @@ from apps.transactions.utils.calculations import (
     calculate_account_totals,
 )
 from apps.transactions.utils.default_ordering import default_order
+from apps.transactions.utils.overview_cache import get_cached_month_overview
 
 
 @login_required
@@ -79,21 +83,27 @@ def transactions_list(request, month: int, year: int):
 
     today = timezone.localdate(timezone.now())
 
+    month_start, month_end = month_bounds(year, month)
+
     f = TransactionsFilter(request.GET)
-    transactions_filtered = f.qs.filter(
-        reference_date__year=year,
-        reference_date__month=month,
-    ).prefetch_related(
-        "account",
-        "account__group",
-        "category",
-        "tags",
-        "account__exchange_currency",
-        "account__currency",
-        "installment_plan",
-        "entities",
-        "dca_expense_entries",
-        "dca_income_entries",
+    transactions_filtered = (
+        f.qs.filter(
+            reference_date__gte=month_start,
+            reference_date__lte=month_end,
+        )
+        .prefetch_related(
+            "account",
+            "account__group",
+            "category",
+            "tags",
+            "account__exchange_currency",
+            "account__currency",
+            "installment_plan",
+            "entities",
+            "dca_expense_entries",
+            "dca_income_entries",
+        )
+        .with_exchanged_amounts()
     )
 
     # Late transactions: date < today and is_paid = False (only shown for default ordering)
@@ -121,14 +131,13 @@ def transactions_list(request, month: int, year: int):
     )
 
 
-@only_htmx
-@login_required
-@require_http_methods(["GET"])
-def monthly_summary(request, month: int, year: int):
+def _monthly_summary_context(request, month: int, year: int):
+    month_start, month_end = month_bounds(year, month)
+
     # Base queryset with all required filters
     base_queryset = Transaction.objects.filter(
-        reference_date__year=year,
-        reference_date__month=month,
+        reference_date__gte=month_start,
+        reference_date__lte=month_end,
     )
 
     # Apply filters and check if any are active
@@ -185,6 +194,21 @@ def monthly_summary(request, month: int, year: int):
         "has_active_filter": has_active_filter,
     }
 
+    return context
+
+
+@only_htmx
+@login_required
+@require_http_methods(["GET"])
+def monthly_summary(request, month: int, year: int):
+    context = get_cached_month_overview(
+        request,
+        "summary",
+        year,
+        month,
+        partial(_monthly_summary_context, request, month, year),
+    )
+
     return render(
         request,
         "monthly_overview/fragments/monthly_summary.html",
@@ -192,14 +216,13 @@ def monthly_summary(request, month: int, year: int):
     )
 
 
-@only_htmx
-@login_required
-@require_http_methods(["GET"])
-def monthly_account_summary(request, month: int, year: int):
+def _monthly_account_summary_context(request, month: int, year: int):
+    month_start, month_end = month_bounds(year, month)
+
     # Base queryset with all required filters
     base_queryset = Transaction.objects.filter(
-        reference_date__year=year,
-        reference_date__month=month,
+        reference_date__gte=month_start,
+        reference_date__lte=month_end,
     )
 
     # Apply filters and check if any are active
@@ -238,6 +261,21 @@ def monthly_account_summary(request, month: int, year: int):
         "account_percentages": account_percentages,
     }
 
+    return context
+
+
+@only_htmx
+@login_required
+@require_http_methods(["GET"])
+def monthly_account_summary(request, month: int, year: int):
+    context = get_cached_month_overview(
+        request,
+        "accounts",
+        year,
+        month,
+        partial(_monthly_account_summary_context, request, month, year),
+    )
+
     return render(
         request,
         "monthly_overview/fragments/monthly_account_summary.html",
@@ -245,14 +283,13 @@ def monthly_account_summary(request, month: int, year: int):
     )
 
 
-@only_htmx
-@login_required
-@require_http_methods(["GET"])
-def monthly_currency_summary(request, month: int, year: int):
+def _monthly_currency_summary_context(request, month: int, year: int):
+    month_start, month_end = month_bounds(year, month)
+
     # Base queryset with all required filters
     base_queryset = Transaction.objects.filter(
-        reference_date__year=year,
-        reference_date__month=month,
+        reference_date__gte=month_start,
+        reference_date__lte=month_end,
     )
 
     # Apply filters and check if any are active
@@ -291,6 +328,21 @@ def monthly_currency_summary(request, month: int, year: int):
         "currency_percentages": currency_percentages,
     }
 
+    return context
+
+
+@only_htmx
+@login_required
+@require_http_methods(["GET"])
+def monthly_currency_summary(request, month: int, year: int):
+    context = get_cached_month_overview(
+        request,
+        "currencies",
+        year,
+        month,
+        partial(_monthly_currency_summary_context, request, month, year),
+    )
+
     return render(
         request, "monthly_overview/fragments/monthly_currency_summary.html", context
     )
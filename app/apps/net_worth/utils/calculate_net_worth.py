@@ -7,19 +7,64 @@ from django.db.models.functions import TruncMonth
 from django.template.defaultfilters import date as date_filter
 from django.utils import timezone
 
-from apps.accounts.models import Account
+from apps.accounts.models import Account, AccountMonthlyBalance
+from apps.accounts.services import get_balance_expression
 from apps.common.middleware.thread_local import get_current_user
 from apps.currencies.models import Currency
 from apps.transactions.models import Transaction
 
 
-def calculate_historical_currency_net_worth(queryset):
-    # Get all currencies and date range in a single query
-    aggregates = queryset.aggregate(
-        min_date=Min("reference_date"),
-        max_date=Max("reference_date"),
+def _get_month_range(queryset, paid_only=False):
+    if queryset.model is AccountMonthlyBalance:
+        if paid_only:
+            queryset = queryset.exclude(income_current=0, expense_current=0)
+        return queryset.aggregate(min_date=Min("month"), max_date=Max("month"))
+
+    if paid_only:
+        queryset = queryset.filter(is_paid=True)
+    return queryset.aggregate(
+        min_date=Min("reference_date"), max_date=Max("reference_date")
+    )
+
+
+def _get_monthly_changes(queryset, group_by, paid_only=False):
+    """
+    Balance change (income - expense) of each month, grouped by `group_by`.
+
+    Accepts a queryset of transactions or of account monthly balances; the latter
+    is already grouped by month, so only accounts x months rows are summed.
+    """
+    if queryset.model is AccountMonthlyBalance:
+        return (
+            queryset.values(group_by, "month")
+            .annotate(balance=Sum(get_balance_expression(paid_only)))
+            .order_by("month", group_by)
+        )
+
+    if paid_only:
+        queryset = queryset.filter(is_paid=True)
+
+    return (
+        queryset.annotate(month=TruncMonth("reference_date"))
+        .values(group_by, "month")
+        .annotate(
+            balance=Sum(
+                Case(
+                    When(type=Transaction.Type.INCOME, then=F("amount")),
+                    When(type=Transaction.Type.EXPENSE, then=-F("amount")),
+                    default=Value(0),
+                    output_field=DecimalField(),
+                )
+            )
+        )
+        .order_by("month", group_by)
     )
 
+
+def calculate_historical_currency_net_worth(queryset, paid_only=False):
+    # Get all currencies and date range in a single query
+    aggregates = _get_month_range(queryset, paid_only=paid_only)
+
     user = get_current_user()
 
     currencies = list(
@@ -47,20 +92,8 @@ def calculate_historical_currency_net_worth(queryset):
         end_date = aggregates["max_date"].replace(day=1)
 
     # Calculate cumulative balances for each account, currency, and month
-    cumulative_balances = (
-        queryset.annotate(month=TruncMonth("reference_date"))
-        .values("account__currency__name", "month")
-        .annotate(
-            balance=Sum(
-                Case(
-                    When(type=Transaction.Type.INCOME, then=F("amount")),
-                    When(type=Transaction.Type.EXPENSE, then=-F("amount")),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            )
-        )
-        .order_by("month", "account__currency__name")
+    cumulative_balances = _get_monthly_changes(
+        queryset, "account__currency__name", paid_only=paid_only
     )
 
     # Create a dictionary to store cumulative balances
@@ -107,16 +140,14 @@ def calculate_historical_currency_net_worth(queryset):
     return historical_net_worth
 
 
-def calculate_historical_account_balance(queryset):
+def calculate_historical_account_balance(queryset, paid_only=False):
     # Get all accounts
     accounts = Account.objects.filter(
         is_archived=False,
     )
 
     # Get the date range
-    date_range = queryset.aggregate(
-        min_date=Min("reference_date"), max_date=Max("reference_date")
-    )
+    date_range = _get_month_range(queryset, paid_only=paid_only)
 
     if not date_range.get("min_date"):
         start_date = timezone.localdate(timezone.now())
@@ -129,21 +160,7 @@ def calculate_historical_account_balance(queryset):
         end_date = date_range["max_date"].replace(day=1)
 
     # Calculate balances for each account and month
-    balances = (
-        queryset.annotate(month=TruncMonth("reference_date"))
-        .values("account", "month")
-        .annotate(
-            balance=Sum(
-                Case(
-                    When(type=Transaction.Type.INCOME, then=F("amount")),
-                    When(type=Transaction.Type.EXPENSE, then=-F("amount")),
-                    default=0,
-                    output_field=DecimalField(),
-                )
-            )
-        )
-        .order_by("account", "month")
-    )
+    balances = _get_monthly_changes(queryset, "account", paid_only=paid_only)
 
     # Organize data by account and month
     account_balances = defaultdict(lambda: defaultdict(Decimal))
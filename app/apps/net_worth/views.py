@@ -6,6 +6,7 @@ from django.shortcuts import render, redirect
 from django.utils.translation import gettext
 from django.views.decorators.http import require_http_methods
 
+from apps.accounts.models import AccountMonthlyBalance
 from apps.currencies.models import Currency
 from apps.currencies.utils.convert import convert
 from apps.net_worth.utils.calculate_net_worth import (
@@ -13,7 +14,6 @@ from apps.net_worth.utils.calculate_net_worth import (
     calculate_historical_account_balance,
     calculate_monthly_net_worth_difference,
 )
-from apps.transactions.models import Transaction
 from apps.transactions.utils.calculations import (
     calculate_currency_totals,
     calculate_account_totals,
@@ -29,44 +29,41 @@ def net_worth(request):
     else:
         view_type = request.session.get("networth_view_type", "current")
 
-    if view_type == "current":
-        transactions_currency_queryset = (
-            Transaction.objects.filter(is_paid=True, account__is_archived=False)
-            .order_by(
-                "account__currency__name",
-            )
-            .exclude(account__in=request.user.untracked_accounts.all())
-        )
-        transactions_account_queryset = Transaction.objects.filter(
-            is_paid=True, account__is_archived=False
-        ).order_by(
-            "account__group__name",
-            "account__name",
+    paid_only = view_type == "current"
+
+    balances_currency_queryset = (
+        AccountMonthlyBalance.objects.filter(account__is_archived=False)
+        .order_by(
+            "account__currency__name",
         )
-    else:
-        transactions_currency_queryset = (
-            Transaction.objects.filter(account__is_archived=False)
-            .order_by(
-                "account__currency__name",
-            )
-            .exclude(account__in=request.user.untracked_accounts.all())
+        .exclude(account__in=request.user.untracked_accounts.all())
+    )
+    balances_account_queryset = AccountMonthlyBalance.objects.filter(
+        account__is_archived=False
+    ).order_by(
+        "account__group__name",
+        "account__name",
+    )
+    if paid_only:
+        # Months with only unpaid transactions don't exist for the current view
+        balances_currency_queryset = balances_currency_queryset.exclude(
+            income_current=0, expense_current=0
         )
-        transactions_account_queryset = Transaction.objects.filter(
-            account__is_archived=False
-        ).order_by(
-            "account__group__name",
-            "account__name",
+        balances_account_queryset = balances_account_queryset.exclude(
+            income_current=0, expense_current=0
         )
 
     currency_net_worth = calculate_currency_totals(
-        transactions_queryset=transactions_currency_queryset, deep_search=True
+        transactions_queryset=balances_currency_queryset,
+        deep_search=True,
+        paid_only=paid_only,
     )
     account_net_worth = calculate_account_totals(
-        transactions_queryset=transactions_account_queryset
+        transactions_queryset=balances_account_queryset, paid_only=paid_only
     )
 
     historical_currency_net_worth = calculate_historical_currency_net_worth(
-        queryset=transactions_currency_queryset
+        queryset=balances_currency_queryset, paid_only=paid_only
     )
 
     labels = (
@@ -183,7 +180,7 @@ def net_worth(request):
     )
 
     historical_account_balance = calculate_historical_account_balance(
-        queryset=transactions_account_queryset
+        queryset=balances_account_queryset, paid_only=paid_only
     )
 
     labels = (
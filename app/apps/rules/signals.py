@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+from threading import local
+
 from django.conf import settings
 from django.dispatch import receiver
 
@@ -7,10 +10,58 @@ from apps.transactions.models import (
     transaction_updated,
     transaction_deleted,
 )
-from apps.rules.tasks import check_for_transaction_rules
+from apps.rules.tasks import (
+    check_for_transaction_rules,
+    check_for_transaction_rules_batch,
+)
 from apps.common.middleware.thread_local import get_current_user
 from apps.rules.utils.transactions import serialize_transaction
 
+RULE_CHECKS_BATCH_SIZE = 500
+
+_batched_rule_checks = local()
+
+
+@contextmanager
+def batched_rule_checks():
+    """
+    Coalesce the rule checks of every transaction signal sent inside the block
+    into check_for_transaction_rules_batch jobs, deferred when it exits, instead
+    of deferring one job per transaction.
+    """
+    if getattr(_batched_rule_checks, "checks", None) is not None:
+        # Nested block, the outermost one defers the jobs
+        yield
+        return
+
+    _batched_rule_checks.checks = {}
+    try:
+        yield
+    finally:
+        # Transactions saved before an error still need their rules checked
+        pending = _batched_rule_checks.checks
+        _batched_rule_checks.checks = None
+
+        for (user_id, signal, is_hard_deleted), checks in pending.items():
+            for i in range(0, len(checks), RULE_CHECKS_BATCH_SIZE):
+                check_for_transaction_rules_batch.defer(
+                    checks=checks[i : i + RULE_CHECKS_BATCH_SIZE],
+                    user_id=user_id,
+                    signal=signal,
+                    is_hard_deleted=is_hard_deleted,
+                )
+
+
+def _defer_rule_check(user_id, signal, is_hard_deleted=False, **check):
+    pending = getattr(_batched_rule_checks, "checks", None)
+
+    if pending is None:
+        if signal == "transaction_deleted":
+            check["is_hard_deleted"] = is_hard_deleted
+        check_for_transaction_rules.defer(user_id=user_id, signal=signal, **check)
+    else:
+        pending.setdefault((user_id, signal, is_hard_deleted), []).append(check)
+
 
 @receiver(transaction_created)
 @receiver(transaction_updated)
@@ -21,7 +72,7 @@ def transaction_changed_receiver(sender: Transaction, signal, **kwargs):
         # Serialize transaction data for processing
         transaction_data = serialize_transaction(sender, deleted=True)
 
-        check_for_transaction_rules.defer(
+        _defer_rule_check(
             transaction_data=transaction_data,
             user_id=get_current_user().id,
             signal="transaction_deleted",
@@ -39,7 +90,7 @@ def transaction_changed_receiver(sender: Transaction, signal, **kwargs):
     if signal is transaction_updated and old_data:
         old_data = serialize_transaction(old_data, deleted=False)
 
-    check_for_transaction_rules.defer(
+    _defer_rule_check(
         instance_id=sender.id,
         user_id=get_current_user().id,
         signal=(
@@ -14,7 +14,6 @@ from dateutil.relativedelta import relativedelta
 from django.contrib.auth import get_user_model
 from django.forms import model_to_dict
 from procrastinate.contrib.django import app
-from simpleeval import EvalWithCompoundTypes
 
 from apps.accounts.models import Account
 from apps.common.middleware.thread_local import write_current_user, delete_current_user
@@ -29,6 +28,7 @@ from apps.transactions.models import (
     TransactionEntity,
 )
 from apps.rules.utils import transactions
+from apps.rules.utils.evaluator import RuleEvaluator
 
 logger = logging.getLogger(__name__)
 
@@ -124,11 +124,8 @@ class DryRunResults:
         self.results.append(result)
 
 
-@app.task(name="check_for_transaction_rules")
-def check_for_transaction_rules(
-    instance_id=None,
-    transaction_data=None,
-    old_data=None,
+def _check_for_transaction_rules(
+    checks,
     user_id=None,
     signal=None,
     is_hard_deleted=False,
@@ -539,240 +536,308 @@ def check_for_transaction_rules(
 
         return transaction
 
-    user = get_user_model().objects.get(id=user_id)
-    if not dry_run:
-        write_current_user(user)
-    logs = [] if dry_run else None
-    dry_run_results = DryRunResults(dry_run=dry_run)
-
-    if dry_run and not rule_id:
-        raise Exception("Cannot dry run without a rule id")
-
-    try:
-        with cachalot_disabled():
-            # For deleted transactions
-            if signal == "transaction_deleted" and transaction_data:
-                # Create a transaction-like object from the serialized data
-                if is_hard_deleted:
-                    instance = transaction_data
-                else:
-                    instance = Transaction.deleted_objects.get(id=instance_id)
+    def _check_transaction(instance_id=None, transaction_data=None, old_data=None):
+        # For deleted transactions
+        if signal == "transaction_deleted" and transaction_data:
+            # Create a transaction-like object from the serialized data
+            if is_hard_deleted:
+                instance = transaction_data
             else:
-                # Regular transaction processing for creates and updates
-                instance = Transaction.objects.get(id=instance_id)
+                instance = Transaction.deleted_objects.get(id=instance_id)
+        else:
+            # Regular transaction processing for creates and updates
+            instance = Transaction.objects.get(id=instance_id)
 
-            dry_run_results.triggering_transaction(instance)
+        dry_run_results.triggering_transaction(instance)
 
-            functions = {
-                "relativedelta": relativedelta,
-                "str": str,
-                "int": int,
-                "float": float,
-                "abs": abs,
-                "randint": randint,
-                "random": random,
-                "decimal": decimal.Decimal,
-                "datetime": datetime,
-                "date": date,
-                "transactions": transactions.TransactionsGetter,
-            }
+        simple.names = _get_names(instance)
 
-            _log("Starting rule execution...")
-            _log("Available functions: {}".format(functions.keys()))
+        if signal == "transaction_updated" and old_data:
+            simple.names.update(_get_names(old_data, "old_"))
 
-            names = _get_names(instance)
-
-            simple = EvalWithCompoundTypes(names=names, functions=functions)
-
-            if signal == "transaction_updated" and old_data:
-                simple.names.update(_get_names(old_data, "old_"))
-
-            # Select rules based on the signal type
-            if dry_run and rule_id:
-                rules = TransactionRule.objects.filter(id=rule_id)
-            elif signal == "transaction_created":
-                rules = TransactionRule.objects.filter(
-                    active=True, on_create=True
-                ).order_by("order", "id")
-            elif signal == "transaction_updated":
-                rules = TransactionRule.objects.filter(
-                    active=True, on_update=True
-                ).order_by("order", "id")
-            elif signal == "transaction_deleted":
-                rules = TransactionRule.objects.filter(
-                    active=True, on_delete=True
-                ).order_by("order", "id")
-            else:
-                rules = TransactionRule.objects.filter(active=True).order_by(
-                    "order", "id"
-                )
+        _log("Testing {} rule(s)...".format(len(rules)))
 
-            _log("Testing {} rule(s)...".format(len(rules)))
+        for rule in rules:
+            _log("Testing rule: {}".format(rule.name))
+            if simple.eval(rule.trigger):
+                _log("Initial trigger matched!")
+                # For deleted transactions, we want to limit what actions can be performed
+                if signal == "transaction_deleted":
+                    _log(
+                        "Event is of type 'delete'. Only processing Update or Create actions..."
+                    )
+                    # Process only create/update actions, not edit actions
+                    for action in rule.update_or_create_transaction_actions.all():
+                        try:
+                            _log(
+                                "Processing action with id {} and order {}...".format(
+                                    action.id, action.order
+                                )
+                            )
+                            _process_update_or_create_transaction_action(
+                                processed_action=action,
+                            )
+                        except Exception as e:
+                            dry_run_results.error(
+                                "Error raised: '{}'. Check the logs tab for more "
+                                "information".format(e)
+                            )
+                            _log(
+                                f"Error processing update or create transaction action {action.id} on deletion",
+                                level="error",
+                            )
+                else:
+                    # Normal processing for non-deleted transactions
+                    edit_actions = list(rule.transaction_actions.all())
+                    update_or_create_actions = list(
+                        rule.update_or_create_transaction_actions.all()
+                    )
 
-            # Process the rules as before
-            for rule in rules:
-                _log("Testing rule: {}".format(rule.name))
-                if simple.eval(rule.trigger):
-                    _log("Initial trigger matched!")
-                    # For deleted transactions, we want to limit what actions can be performed
-                    if signal == "transaction_deleted":
+                    # Check if any action has a non-zero order
+                    has_custom_order = any(a.order > 0 for a in edit_actions) or any(
+                        a.order > 0 for a in update_or_create_actions
+                    )
+
+                    if has_custom_order:
                         _log(
-                            "Event is of type 'delete'. Only processing Update or Create actions..."
+                            "One or more actions have a custom order, actions will be processed ordered by "
+                            "order and creation date..."
+                        )
+                        # Combine and sort actions by order
+                        all_actions = sorted(
+                            chain(edit_actions, update_or_create_actions),
+                            key=lambda a: (a.order, a.id),
                         )
-                        # Process only create/update actions, not edit actions
-                        for action in rule.update_or_create_transaction_actions.all():
+
+                        for action in all_actions:
                             try:
-                                _log(
-                                    "Processing action with id {} and order {}...".format(
-                                        action.id, action.order
+                                if isinstance(action, TransactionRuleAction):
+                                    _log(
+                                        "Processing 'edit_transaction' action with id {} and order {}...".format(
+                                            action.id, action.order
+                                        )
                                     )
-                                )
-                                _process_update_or_create_transaction_action(
-                                    processed_action=action,
-                                )
+                                    instance = _process_edit_transaction_action(
+                                        transaction=instance,
+                                        processed_action=action,
+                                    )
+
+                                    if rule.sequenced:
+                                        # Update names for next actions
+                                        simple.names.update(_get_names(instance))
+                                else:
+                                    _log(
+                                        "Processing 'update_or_create_transaction' action with id {} and order {}...".format(
+                                            action.id, action.order
+                                        )
+                                    )
+                                    _process_update_or_create_transaction_action(
+                                        processed_action=action,
+                                    )
+                                    _clear_names("my_")
                             except Exception as e:
                                 dry_run_results.error(
                                     "Error raised: '{}'. Check the logs tab for more "
                                     "information".format(e)
                                 )
                                 _log(
-                                    f"Error processing update or create transaction action {action.id} on deletion",
+                                    f"Error processing action {action.id}",
                                     level="error",
                                 )
+                        # Save at the end
+                        if signal != "transaction_deleted":
+                            instance.save()
                     else:
-                        # Normal processing for non-deleted transactions
-                        edit_actions = list(rule.transaction_actions.all())
-                        update_or_create_actions = list(
-                            rule.update_or_create_transaction_actions.all()
+                        _log(
+                            "No actions have a custom order, actions will be processed ordered by creation "
+                            "date, with Edit actions running first, then Update or Create actions..."
                         )
-
-                        # Check if any action has a non-zero order
-                        has_custom_order = any(
-                            a.order > 0 for a in edit_actions
-                        ) or any(a.order > 0 for a in update_or_create_actions)
-
-                        if has_custom_order:
+                        # Original behavior
+                        for action in edit_actions:
                             _log(
-                                "One or more actions have a custom order, actions will be processed ordered by "
-                                "order and creation date..."
-                            )
-                            # Combine and sort actions by order
-                            all_actions = sorted(
-                                chain(edit_actions, update_or_create_actions),
-                                key=lambda a: (a.order, a.id),
+                                "Processing 'edit_transaction' action with id {}...".format(
+                                    action.id
+                                )
                             )
+                            try:
+                                instance = _process_edit_transaction_action(
+                                    transaction=instance,
+                                    processed_action=action,
+                                )
+                                if rule.sequenced:
+                                    # Update names for next actions
+                                    simple.names.update(_get_names(instance))
+                            except Exception as e:
+                                dry_run_results.error(
+                                    "Error raised: '{}'. Check the logs tab for more "
+                                    "information".format(e)
+                                )
+                                _log(
+                                    f"Error processing edit transaction action {action.id}",
+                                    level="error",
+                                )
 
-                            for action in all_actions:
-                                try:
-                                    if isinstance(action, TransactionRuleAction):
-                                        _log(
-                                            "Processing 'edit_transaction' action with id {} and order {}...".format(
-                                                action.id, action.order
-                                            )
-                                        )
-                                        instance = _process_edit_transaction_action(
-                                            transaction=instance,
-                                            processed_action=action,
-                                        )
+                        if rule.sequenced:
+                            # Update names for next actions
+                            simple.names.update(_get_names(instance))
+                        if signal != "transaction_deleted":
+                            instance.save()
 
-                                        if rule.sequenced:
-                                            # Update names for next actions
-                                            simple.names.update(_get_names(instance))
-                                    else:
-                                        _log(
-                                            "Processing 'update_or_create_transaction' action with id {} and order {}...".format(
-                                                action.id, action.order
-                                            )
-                                        )
-                                        _process_update_or_create_transaction_action(
-                                            processed_action=action,
-                                        )
-                                        _clear_names("my_")
-                                except Exception as e:
-                                    dry_run_results.error(
-                                        "Error raised: '{}'. Check the logs tab for more "
-                                        "information".format(e)
-                                    )
-                                    _log(
-                                        f"Error processing action {action.id}",
-                                        level="error",
-                                    )
-                            # Save at the end
-                            if signal != "transaction_deleted":
-                                instance.save()
-                        else:
+                        for action in update_or_create_actions:
                             _log(
-                                "No actions have a custom order, actions will be processed ordered by creation "
-                                "date, with Edit actions running first, then Update or Create actions..."
+                                "Processing 'update_or_create_transaction' action with id {}...".format(
+                                    action.id
+                                )
                             )
-                            # Original behavior
-                            for action in edit_actions:
+                            try:
+                                _process_update_or_create_transaction_action(
+                                    processed_action=action,
+                                )
+                                _clear_names("my_")
+                            except Exception as e:
+                                dry_run_results.error(
+                                    "Error raised: '{}'. Check the logs tab for more "
+                                    "information".format(e)
+                                )
                                 _log(
-                                    "Processing 'edit_transaction' action with id {}...".format(
-                                        action.id
-                                    )
+                                    f"Error processing update or create transaction action {action.id}",
+                                    level="error",
                                 )
-                                try:
-                                    instance = _process_edit_transaction_action(
-                                        transaction=instance,
-                                        processed_action=action,
-                                    )
-                                    if rule.sequenced:
-                                        # Update names for next actions
-                                        simple.names.update(_get_names(instance))
-                                except Exception as e:
-                                    dry_run_results.error(
-                                        "Error raised: '{}'. Check the logs tab for more "
-                                        "information".format(e)
-                                    )
-                                    _log(
-                                        f"Error processing edit transaction action {action.id}",
-                                        level="error",
-                                    )
+            else:
+                dry_run_results.error(
+                    error="Initial trigger didn't match, this rule will be skipped",
+                )
+                _log("Initial trigger didn't match, this rule will be skipped")
 
-                            if rule.sequenced:
-                                # Update names for next actions
-                                simple.names.update(_get_names(instance))
-                            if signal != "transaction_deleted":
-                                instance.save()
+    user = get_user_model().objects.get(id=user_id)
+    if not dry_run:
+        write_current_user(user)
+    logs = [] if dry_run else None
+    dry_run_results = DryRunResults(dry_run=dry_run)
 
-                            for action in update_or_create_actions:
-                                _log(
-                                    "Processing 'update_or_create_transaction' action with id {}...".format(
-                                        action.id
-                                    )
-                                )
-                                try:
-                                    _process_update_or_create_transaction_action(
-                                        processed_action=action,
-                                    )
-                                    _clear_names("my_")
-                                except Exception as e:
-                                    dry_run_results.error(
-                                        "Error raised: '{}'. Check the logs tab for more "
-                                        "information".format(e)
-                                    )
-                                    _log(
-                                        f"Error processing update or create transaction action {action.id}",
-                                        level="error",
-                                    )
-                else:
-                    dry_run_results.error(
-                        error="Initial trigger didn't match, this rule will be skipped",
+    if dry_run and not rule_id:
+        raise Exception("Cannot dry run without a rule id")
+
+    errors = []
+    try:
+        with cachalot_disabled():
+            functions = {
+                "relativedelta": relativedelta,
+                "str": str,
+                "int": int,
+                "float": float,
+                "abs": abs,
+                "randint": randint,
+                "random": random,
+                "decimal": decimal.Decimal,
+                "datetime": datetime,
+                "date": date,
+                "transactions": transactions.TransactionsGetter,
+            }
+
+            _log("Starting rule execution...")
+            _log("Available functions: {}".format(functions.keys()))
+
+            # Rules, actions and the evaluator are shared by every checked transaction
+            simple = RuleEvaluator(names={}, functions=functions)
+            rules = _get_rules(signal=signal, rule_id=rule_id if dry_run else None)
+
+            for check in checks:
+                if len(checks) > 1:
+                    _log(
+                        "Checking transaction {}...".format(
+                            check.get("instance_id")
+                            or (check.get("transaction_data") or {}).get("id")
+                        )
                     )
-                    _log("Initial trigger didn't match, this rule will be skipped")
+
+                try:
+                    _check_transaction(**check)
+                except Exception as e:
+                    _log(
+                        "** Error while executing 'check_for_transaction_rules' task",
+                        level="error",
+                    )
+                    errors.append(e)
     except Exception as e:
         _log(
             "** Error while executing 'check_for_transaction_rules' task",
             level="error",
         )
-        if not dry_run:
-            delete_current_user()
-            raise e
+        errors.append(e)
 
     if not dry_run:
         delete_current_user()
+        if errors:
+            raise errors[0]
 
     return logs, dry_run_results.results
 
-    return None
+
+def _get_rules(signal=None, rule_id=None):
+    """Rules to test for the signal, with their actions loaded"""
+    if rule_id:
+        rules = TransactionRule.objects.filter(id=rule_id)
+    elif signal == "transaction_created":
+        rules = TransactionRule.objects.filter(active=True, on_create=True)
+    elif signal == "transaction_updated":
+        rules = TransactionRule.objects.filter(active=True, on_update=True)
+    elif signal == "transaction_deleted":
+        rules = TransactionRule.objects.filter(active=True, on_delete=True)
+    else:
+        rules = TransactionRule.objects.filter(active=True)
+
+    return list(
+        rules.order_by("order", "id").prefetch_related(
+            "transaction_actions", "update_or_create_transaction_actions"
+        )
+    )
+
+
+@app.task(name="check_for_transaction_rules")
+def check_for_transaction_rules(
+    instance_id=None,
+    transaction_data=None,
+    old_data=None,
+    user_id=None,
+    signal=None,
+    is_hard_deleted=False,
+    dry_run=False,
+    rule_id=None,
+):
+    return _check_for_transaction_rules(
+        checks=[
+            {
+                "instance_id": instance_id,
+                "transaction_data": transaction_data,
+                "old_data": old_data,
+            }
+        ],
+        user_id=user_id,
+        signal=signal,
+        is_hard_deleted=is_hard_deleted,
+        dry_run=dry_run,
+        rule_id=rule_id,
+    )
+
+
+@app.task(name="check_for_transaction_rules_batch")
+def check_for_transaction_rules_batch(
+    checks,
+    user_id=None,
+    signal=None,
+    is_hard_deleted=False,
+):
+    """
+    Run the rules for many transactions of the same signal in a single job.
+
+    Each item of `checks` holds the `instance_id`, `transaction_data` and
+    `old_data` check_for_transaction_rules would receive for that transaction.
+    A failing transaction doesn't stop the others, the job fails at the end.
+    """
+    _check_for_transaction_rules(
+        checks=checks,
+        user_id=user_id,
+        signal=signal,
+        is_hard_deleted=is_hard_deleted,
+    )
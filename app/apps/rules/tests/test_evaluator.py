@@ -0,0 +1,30 @@
+import ast
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.rules.utils.evaluator import RuleEvaluator, parse_expression
+
+
+class RuleEvaluatorTests(SimpleTestCase):
+    def setUp(self):
+        parse_expression.cache_clear()
+
+    def test_expressions_are_parsed_once(self):
+        first = RuleEvaluator(names={"amount": 10})
+        second = RuleEvaluator(names={"amount": 50})
+
+        with patch("ast.parse", wraps=ast.parse) as mock_parse:
+            self.assertTrue(first.eval("amount > 5"))
+            self.assertTrue(second.eval("amount > 5"))
+            second.names = {"amount": 1}
+            self.assertFalse(second.eval("amount > 5"))
+
+        mock_parse.assert_called_once()
+
+    def test_edited_expressions_are_parsed_again(self):
+        simple = RuleEvaluator(names={"description": "Coffee"})
+
+        self.assertEqual(simple.eval("description + '!'"), "Coffee!")
+        self.assertEqual(simple.eval("description + '?'"), "Coffee?")
+        self.assertEqual(parse_expression.cache_info().currsize, 2)
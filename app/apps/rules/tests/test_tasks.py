@@ -7,8 +7,16 @@ from django.test import TransactionTestCase
 
 from apps.accounts.models import Account
 from apps.currencies.models import Currency
-from apps.rules.models import TransactionRule, UpdateOrCreateTransactionRuleAction
-from apps.rules.tasks import check_for_transaction_rules
+from apps.rules.models import (
+    TransactionRule,
+    TransactionRuleAction,
+    UpdateOrCreateTransactionRuleAction,
+)
+from apps.rules.signals import batched_rule_checks
+from apps.rules.tasks import (
+    check_for_transaction_rules,
+    check_for_transaction_rules_batch,
+)
 from apps.transactions.models import Transaction
 
 
@@ -19,6 +27,13 @@ def run_check_for_transaction_rules_without_worker_wrapper(**kwargs):
     return task_func(**kwargs)
 
 
+def run_check_for_transaction_rules_batch_without_worker_wrapper(**kwargs):
+    task_func = check_for_transaction_rules_batch.func
+    task_func = getattr(task_func, "__wrapped__", task_func)
+
+    return task_func(**kwargs)
+
+
 class CheckForTransactionRulesTests(TransactionTestCase):
     def setUp(self):
         User = get_user_model()
@@ -80,3 +95,116 @@ class CheckForTransactionRulesTests(TransactionTestCase):
             description="Generated transaction"
         )
         self.assertIsNone(generated_transaction.category)
+
+
+class BatchedRuleChecksTests(TransactionTestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="batch-rules@example.com",
+            password="testpass123",
+        )
+        self.currency = Currency.objects.create(
+            code="USD",
+            name="US Dollar",
+            decimal_places=2,
+        )
+        self.account = Account.objects.create(
+            name="Main Account",
+            currency=self.currency,
+            owner=self.user,
+        )
+
+    def _create_transactions(self, count):
+        return [
+            Transaction.objects.create(
+                account=self.account,
+                type=Transaction.Type.EXPENSE,
+                amount=Decimal("10.00"),
+                date=date(2026, 5, 4),
+                reference_date=date(2026, 5, 1),
+                description=f"Transaction {i}",
+                owner=self.user,
+            )
+            for i in range(count)
+        ]
+
+    @patch("apps.rules.signals.check_for_transaction_rules_batch.defer")
+    @patch("apps.rules.signals.check_for_transaction_rules.defer")
+    @patch("apps.rules.signals.get_current_user")
+    def test_signals_inside_block_are_deferred_as_one_job(
+        self, mock_user, mock_defer, mock_batch_defer
+    ):
+        from apps.transactions.models import transaction_created
+
+        mock_user.return_value = self.user
+        transactions = self._create_transactions(3)
+
+        with batched_rule_checks():
+            for transaction in transactions:
+                transaction_created.send(sender=transaction)
+            mock_batch_defer.assert_not_called()
+
+        mock_defer.assert_not_called()
+        mock_batch_defer.assert_called_once_with(
+            checks=[
+                {"instance_id": transaction.id, "old_data": None}
+                for transaction in transactions
+            ],
+            user_id=self.user.id,
+            signal="transaction_created",
+            is_hard_deleted=False,
+        )
+
+    @patch("apps.rules.signals.check_for_transaction_rules.defer")
+    def test_batch_job_runs_rules_for_every_transaction(self, mock_defer):
+        transactions = self._create_transactions(3)
+        rule = TransactionRule.objects.create(
+            active=True,
+            on_create=True,
+            name="Rename",
+            trigger="amount > 5",
+            owner=self.user,
+        )
+        TransactionRuleAction.objects.create(
+            rule=rule,
+            field=TransactionRuleAction.Field.description,
+            value="description + ' (checked)'",
+        )
+
+        run_check_for_transaction_rules_batch_without_worker_wrapper(
+            checks=[{"instance_id": transaction.id} for transaction in transactions],
+            user_id=self.user.id,
+            signal="transaction_created",
+        )
+
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("description", flat=True)),
+            [f"Transaction {i} (checked)" for i in range(3)],
+        )
+
+    @patch("apps.rules.signals.check_for_transaction_rules.defer")
+    def test_batch_job_keeps_going_after_a_failing_transaction(self, mock_defer):
+        transactions = self._create_transactions(1)
+        rule = TransactionRule.objects.create(
+            active=True,
+            on_create=True,
+            name="Always",
+            trigger="True",
+            owner=self.user,
+        )
+        TransactionRuleAction.objects.create(
+            rule=rule,
+            field=TransactionRuleAction.Field.description,
+            value="'Checked'",
+        )
+
+        with self.assertRaises(Transaction.DoesNotExist):
+            run_check_for_transaction_rules_batch_without_worker_wrapper(
+                checks=[{"instance_id": 0}, {"instance_id": transactions[0].id}],
+                user_id=self.user.id,
+                signal="transaction_created",
+            )
+
+        transactions[0].refresh_from_db()
+        self.assertEqual(transactions[0].description, "Checked")
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+from simpleeval import EvalWithCompoundTypes
+
+# Distinct expressions kept parsed by each process
+PARSED_EXPRESSIONS_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=PARSED_EXPRESSIONS_CACHE_SIZE)
+def parse_expression(expr: str):
+    """
+    Parse a rule expression into its AST once per process.
+
+    Keyed by the expression itself, so editing a rule or one of its actions
+    can never return a stale tree: the new text is simply parsed again.
+    """
+    return EvalWithCompoundTypes.parse(expr)
+
+
+class RuleEvaluator(EvalWithCompoundTypes):
+    """
+    EvalWithCompoundTypes that reuses the parsed trees of the expressions it has
+    already seen, instead of calling ast.parse on every evaluation.
+    """
+
+    @staticmethod
+    def parse(expr):
+        return parse_expression(expr)
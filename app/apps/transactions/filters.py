@@ -1,20 +1,21 @@
 import django_filters
 from apps.accounts.models import Account
 from apps.common.fields.month_year import MonthYearFormField
+from apps.common.middleware.thread_local import get_current_user
 from apps.common.widgets.datepicker import AirDatePickerInput
 from apps.common.widgets.decimal import ArbitraryDecimalDisplayNumberInput
 from apps.common.widgets.tom_select import TomSelectMultiple
 from apps.currencies.models import Currency
-from apps.transactions.models import (
-    Transaction,
-    TransactionCategory,
-    TransactionEntity,
-    TransactionTag,
+from apps.transactions.models import Transaction
+from apps.transactions.utils.filter_choices import (
+    INLINE_CHOICES_LIMIT,
+    get_filter_choices,
 )
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Column, Field, Layout, Row
 from django import forms
 from django.db.models import Q
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django_filters import Filter
 
@@ -201,27 +202,36 @@ class TransactionsFilter(django_filters.FilterSet):
         self.form.fields["date_end"].widget = AirDatePickerInput()
 
         self.form.fields["account"].queryset = Account.objects.all()
-        category_choices = list(
-            TransactionCategory.objects.values_list("name", "name").order_by("name")
+        self._set_name_choices(
+            "category",
+            [("any", _("Categorized")), ("uncategorized", _("Uncategorized"))],
         )
-        custom_choices = [
-            ("any", _("Categorized")),
-            ("uncategorized", _("Uncategorized")),
-        ]
-        self.form.fields["category"].choices = custom_choices + category_choices
-        tag_choices = list(
-            TransactionTag.objects.values_list("name", "name").order_by("name")
+        self._set_name_choices(
+            "tags", [("any", _("Tagged")), ("untagged", _("Untagged"))]
         )
-        custom_tag_choices = [("any", _("Tagged")), ("untagged", _("Untagged"))]
-        self.form.fields["tags"].choices = custom_tag_choices + tag_choices
-        entity_choices = list(
-            TransactionEntity.objects.values_list("name", "name").order_by("name")
+        self._set_name_choices(
+            "entities", [("any", _("Any entity")), ("no_entity", _("No entity"))]
         )
-        custom_entity_choices = [
-            ("any", _("Any entity")),
-            ("no_entity", _("No entity")),
-        ]
-        self.form.fields["entities"].choices = custom_entity_choices + entity_choices
+
+    def _set_name_choices(self, field_name, custom_choices):
+        names = get_filter_choices(get_current_user(), field_name)
+        field = self.form.fields[field_name]
+        field.choices = custom_choices + [(name, name) for name in names]
+
+        if len(names) > INLINE_CHOICES_LIMIT:
+            # Only the selected names are rendered, TomSelect fetches the rest
+            selected = (
+                set(self.form.data.getlist(field_name))
+                if hasattr(self.form.data, "getlist")
+                else set()
+            )
+            field.widget.choices = custom_choices + [
+                (name, name) for name in names if name in selected
+            ]
+            field.widget.attrs["data-load"] = reverse(
+                "transactions_filter_choices", kwargs={"field": field_name}
+            )
+            field.widget.attrs["data-load-paginated"] = "true"
 
     @property
     def has_active_filters(self):
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0050_filterpreset"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["account", "reference_date"],
+                name="transactions_acc_ref_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["reference_date"],
+                name="transactions_ref_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["date"],
+                name="transactions_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["account", "is_paid", "type"],
+                name="transactions_acc_paid_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["installment_plan", "installment_id"],
+                name="transactions_installment_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0051_transaction_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transactioncategory",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="transactiontag",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="transactionentity",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="transactioncategory",
+            index=models.Index(
+                fields=["updated_at", "id"], name="t_categories_sync_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transactiontag",
+            index=models.Index(fields=["updated_at", "id"], name="tags_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transactionentity",
+            index=models.Index(fields=["updated_at", "id"], name="entities_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["updated_at", "id"],
+                name="transactions_sync_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("deleted", True)),
+                fields=["deleted_at", "id"],
+                name="transactions_deleted_sync_idx",
+            ),
+        ),
+    ]
@@ -14,7 +14,8 @@ from apps.common.models import (
     SharedObjectManager,
 )
 from apps.common.templatetags.decimal import drop_trailing_zeros, localize_number
-from apps.currencies.utils.convert import convert
+from apps.common.utils.visibility import get_accessible_ids
+from apps.currencies.utils.convert import batch_convert, convert
 from apps.transactions.storage import PrivateMediaStorage
 from apps.transactions.validators import validate_decimal_places, validate_non_negative
 from dateutil.relativedelta import relativedelta
@@ -51,35 +52,156 @@ class FilterPreset(models.Model):
         return self.name
 
 
+def _format_exchanged_amount(converted):
+    converted_amount, prefix, suffix, decimal_places = converted
+    if not converted_amount:
+        return None
+
+    return {
+        "amount": converted_amount,
+        "prefix": prefix,
+        "suffix": suffix,
+        "decimal_places": decimal_places,
+    }
+
+
+def get_exchanged_amounts(rows):
+    """
+    The exchanged_amount() of many (amount, date, currency_id,
+    exchange_currency_id) rows, the last two being the ones of their accounts,
+    with one query for the currencies and one for every rate involved.
+    """
+    from apps.currencies.models import Currency
+
+    if not rows:
+        return []
+
+    currencies = Currency.objects.in_bulk()
+    pending = []
+    for index, row in enumerate(rows):
+        amount, transaction_date, currency_id, exchange_currency_id = row
+        from_currency = currencies.get(currency_id)
+        to_currency = currencies.get(
+            exchange_currency_id or getattr(from_currency, "exchange_currency_id", None)
+        )
+        if from_currency and to_currency:
+            pending.append(
+                (index, (amount, from_currency, to_currency, transaction_date))
+            )
+
+    exchanged_amounts = [None] * len(rows)
+    converted = batch_convert([conversion for _index, conversion in pending])
+    for (index, _conversion), result in zip(pending, converted):
+        exchanged_amounts[index] = _format_exchanged_amount(result)
+
+    return exchanged_amounts
+
+
+def prefetch_exchanged_amounts(transactions):
+    """
+    Compute the exchanged_amount() of many transactions with one query for the
+    currencies and one for every rate involved. Their accounts should already
+    be loaded, with select_related or prefetch_related.
+    """
+    transactions = [t for t in transactions if isinstance(t, Transaction)]
+    if not transactions:
+        return
+
+    exchanged_amounts = get_exchanged_amounts(
+        [
+            (
+                t.amount,
+                t.date,
+                t.account.currency_id,
+                t.account.exchange_currency_id,
+            )
+            for t in transactions
+        ]
+    )
+    for t, exchanged_amount in zip(transactions, exchanged_amounts):
+        t._exchanged_amount = exchanged_amount
+
+
 def transaction_attachment_path(instance, filename):
     extension = Path(filename).suffix
     return f"transaction_attachments/{instance.transaction_id}/{instance.id}{extension}"
 
 
 class SoftDeleteQuerySet(models.QuerySet):
+    _exchanged_amounts = False
+
+    def with_exchanged_amounts(self):
+        """
+        Compute exchanged_amount() for every fetched transaction at once, the
+        way prefetch_related loads relations, instead of once per transaction.
+        """
+        clone = self._chain()
+        clone._exchanged_amounts = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._exchanged_amounts = self._exchanged_amounts
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is None
+        super()._fetch_all()
+        if fetched and self._exchanged_amounts:
+            prefetch_exchanged_amounts(self._result_cache)
+
     @staticmethod
-    def _emit_signals(instances, created=False, old_data=None):
+    def emit_signals(instances, created=False, old_data=None):
         """Helper to emit signals for multiple instances"""
-        for i, instance in enumerate(instances):
-            if created:
-                transaction_created.send(sender=instance)
-            else:
-                transaction_updated.send(sender=instance, old_data=old_data[i])
+        from apps.rules.signals import batched_rule_checks
+
+        # The receivers update the DCA entries of every transaction
+        instances = list(instances)
+        models.prefetch_related_objects(
+            instances, "dca_expense_entries", "dca_income_entries"
+        )
+
+        with batched_rule_checks():
+            for i, instance in enumerate(instances):
+                if created:
+                    transaction_created.send(sender=instance)
+                else:
+                    transaction_updated.send(sender=instance, old_data=old_data[i])
+
+    @staticmethod
+    def _refresh_balances(instances):
+        """Refresh the account balances the instances counted and now count towards"""
+        from apps.accounts.services import refresh_account_balances
+
+        refresh_account_balances(
+            {instance.get_balance_key() for instance in instances}
+            | {instance.get_balance_key(loaded=True) for instance in instances}
+        )
 
     def bulk_create(self, objs, emit_signal=True, **kwargs):
         instances = super().bulk_create(objs, **kwargs)
+        self._refresh_balances(instances)
 
         if emit_signal:
-            self._emit_signals(instances, created=True)
+            self.emit_signals(instances, created=True)
 
         return instances
 
     def bulk_update(self, objs, fields, emit_signal=True, **kwargs):
         old_data = deepcopy(objs)
+
+        # Like save(), bulk writes count as changes for the sync API
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        if "updated_at" not in fields:
+            fields = [*fields, "updated_at"]
+
         result = super().bulk_update(objs, fields, **kwargs)
+        self._refresh_balances(objs)
 
         if emit_signal:
-            self._emit_signals(objs, created=False, old_data=old_data)
+            self.emit_signals(objs, created=False, old_data=old_data)
 
         return result
 
@@ -88,16 +210,33 @@ class SoftDeleteQuerySet(models.QuerySet):
         instances = list(self)
         old_data = deepcopy(instances)
 
+        kwargs.setdefault("updated_at", timezone.now())
         result = super().update(**kwargs)
 
+        if {"account", "account_id", "reference_date"} & kwargs.keys():
+            moved = self.model.userless_all_objects.filter(
+                pk__in=[obj.pk for obj in instances]
+            )
+            self._refresh_balances(instances + list(moved))
+        else:
+            self._refresh_balances(instances)
+
         if emit_signal:
             # Refresh instances to get new values
             refreshed = self.model.objects.filter(pk__in=[obj.pk for obj in instances])
-            self._emit_signals(refreshed, created=False, old_data=old_data)
+            self.emit_signals(refreshed, created=False, old_data=old_data)
 
         return result
 
     def delete(self):
+        from apps.accounts.services import deferred_account_balance_refresh
+        from apps.rules.signals import batched_rule_checks
+
+        # Deleted rows refresh their balances from post_delete, do it once at the end
+        with deferred_account_balance_refresh(), batched_rule_checks():
+            return self._delete()
+
+    def _delete(self):
         if not settings.ENABLE_SOFT_DELETE:
             # Get instances before hard delete
             instances = list(self)
@@ -143,7 +282,14 @@ class SoftDeleteQuerySet(models.QuerySet):
         )
 
     def hard_delete(self):
-        return super().delete()
+        from apps.accounts.services import deferred_account_balance_refresh
+
+        with deferred_account_balance_refresh():
+            return super().delete()
+
+
+def _accessible_account_ids(model, user):
+    return get_accessible_ids(model._meta.get_field("account").related_model, user)
 
 
 class SoftDeleteManager(models.Manager):
@@ -151,20 +297,11 @@ class SoftDeleteManager(models.Manager):
         qs = SoftDeleteQuerySet(self.model, using=self._db)
         user = get_current_user()
         if user and not user.is_anonymous:
-            account_ids = (
-                qs.filter(
-                    Q(account__visibility="public")
-                    | Q(account__owner=user)
-                    | Q(account__shared_with=user)
-                    | Q(account__visibility="private", account__owner=None),
-                    deleted=False,
-                )
-                .values_list("account__id", flat=True)
-                .distinct()
+            return qs.filter(
+                account_id__in=_accessible_account_ids(self.model, user),
+                deleted=False,
             )
 
-            return qs.filter(account_id__in=account_ids, deleted=False)
-
         else:
             return qs.filter(
                 deleted=False,
@@ -175,15 +312,8 @@ class AllObjectsManager(models.Manager):
     def get_queryset(self):
         user = get_current_user()
         if user and not user.is_anonymous:
-            return (
-                SoftDeleteQuerySet(self.model, using=self._db)
-                .filter(
-                    Q(account__visibility="public")
-                    | Q(account__owner=user)
-                    | Q(account__shared_with=user)
-                    | Q(account__visibility="private", account__owner=None),
-                )
-                .distinct()
+            return SoftDeleteQuerySet(self.model, using=self._db).filter(
+                account_id__in=_accessible_account_ids(self.model, user)
             )
         else:
             return SoftDeleteQuerySet(self.model, using=self._db)
@@ -200,12 +330,9 @@ class DeletedObjectsManager(models.Manager):
         user = get_current_user()
         if user and not user.is_anonymous:
             return qs.filter(
-                Q(account__visibility="public")
-                | Q(account__owner=user)
-                | Q(account__shared_with=user)
-                | Q(account__visibility="private", account__owner=None),
+                account_id__in=_accessible_account_ids(self.model, user),
                 deleted=True,
-            ).distinct()
+            )
         else:
             return qs.filter(
                 deleted=True,
@@ -226,11 +353,8 @@ class GenericAccountOwnerManager(models.Manager):
         user = get_current_user()
         if user and not user.is_anonymous:
             return queryset.filter(
-                Q(account__visibility="public")
-                | Q(account__owner=user)
-                | Q(account__shared_with=user)
-                | Q(account__visibility="private", account__owner=None),
-            ).distinct()
+                account_id__in=_accessible_account_ids(self.model, user)
+            )
         return queryset.none()
 
 
@@ -245,6 +369,8 @@ class TransactionCategory(SharedObject):
         ),
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = SharedObjectManager()
     all_objects = models.Manager()  # Unfiltered manager
 
@@ -253,6 +379,9 @@ class TransactionCategory(SharedObject):
         verbose_name_plural = _("Transaction Categories")
         db_table = "t_categories"
         unique_together = (("owner", "name"),)
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="t_categories_sync_idx"),
+        ]
         ordering = ["name", "id"]
 
     def __str__(self):
@@ -269,6 +398,8 @@ class TransactionTag(SharedObject):
         ),
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = SharedObjectManager()
     all_objects = models.Manager()  # Unfiltered manager
 
@@ -277,6 +408,9 @@ class TransactionTag(SharedObject):
         verbose_name_plural = _("Transaction Tags")
         db_table = "tags"
         unique_together = (("owner", "name"),)
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="tags_sync_idx"),
+        ]
         ordering = ["name", "id"]
 
     def __str__(self):
@@ -293,6 +427,8 @@ class TransactionEntity(SharedObject):
         ),
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     objects = SharedObjectManager()
     all_objects = models.Manager()  # Unfiltered manager
 
@@ -301,6 +437,9 @@ class TransactionEntity(SharedObject):
         verbose_name_plural = _("Entities")
         db_table = "entities"
         unique_together = (("owner", "name"),)
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="entities_sync_idx"),
+        ]
         ordering = ["name", "id"]
 
     def __str__(self):
@@ -403,6 +542,42 @@ class Transaction(OwnedObject):
         verbose_name_plural = _("Transactions")
         db_table = "transactions"
         default_manager_name = "objects"
+        indexes = [
+            models.Index(
+                fields=["account", "reference_date"],
+                condition=Q(deleted=False),
+                name="transactions_acc_ref_date_idx",
+            ),
+            models.Index(
+                fields=["reference_date"],
+                condition=Q(deleted=False),
+                name="transactions_ref_date_idx",
+            ),
+            models.Index(
+                fields=["date"],
+                condition=Q(deleted=False),
+                name="transactions_date_idx",
+            ),
+            models.Index(
+                fields=["account", "is_paid", "type"],
+                condition=Q(deleted=False),
+                name="transactions_acc_paid_type_idx",
+            ),
+            models.Index(
+                fields=["installment_plan", "installment_id"],
+                name="transactions_installment_idx",
+            ),
+            models.Index(
+                fields=["updated_at", "id"],
+                condition=Q(deleted=False),
+                name="transactions_sync_idx",
+            ),
+            models.Index(
+                fields=["deleted_at", "id"],
+                condition=Q(deleted=True),
+                name="transactions_deleted_sync_idx",
+            ),
+        ]
 
     def clean(self):
         super().clean()
@@ -462,37 +637,48 @@ class Transaction(OwnedObject):
     def hard_delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the balance the row counted towards when it was loaded, so
+        # moving it to another account or month also refreshes the one it left
+        if "account_id" in field_names and "reference_date" in field_names:
+            instance._loaded_balance_key = instance.get_balance_key()
+        return instance
+
+    def get_balance_key(self, loaded=False):
+        """
+        The (account_id, month) AccountMonthlyBalance this transaction counts
+        towards, or counted towards when it was loaded if `loaded` is True.
+        """
+        if loaded:
+            return getattr(self, "_loaded_balance_key", None)
+
+        if not self.account_id or not self.reference_date:
+            return None
+
+        return self.account_id, self.reference_date.replace(day=1)
+
     def exchanged_amount(self):
+        if hasattr(self, "_exchanged_amount"):
+            # Set by prefetch_exchanged_amounts
+            return self._exchanged_amount
+
         if self.account.exchange_currency:
-            converted_amount, prefix, suffix, decimal_places = convert(
-                self.amount,
-                to_currency=self.account.exchange_currency,
-                from_currency=self.account.currency,
-                date=self.date,
-            )
-            if converted_amount:
-                return {
-                    "amount": converted_amount,
-                    "prefix": prefix,
-                    "suffix": suffix,
-                    "decimal_places": decimal_places,
-                }
+            to_currency = self.account.exchange_currency
         elif self.account.currency.exchange_currency:
-            converted_amount, prefix, suffix, decimal_places = convert(
+            to_currency = self.account.currency.exchange_currency
+        else:
+            return None
+
+        return _format_exchanged_amount(
+            convert(
                 self.amount,
-                to_currency=self.account.currency.exchange_currency,
+                to_currency=to_currency,
                 from_currency=self.account.currency,
                 date=self.date,
             )
-            if converted_amount:
-                return {
-                    "amount": converted_amount,
-                    "prefix": prefix,
-                    "suffix": suffix,
-                    "decimal_places": decimal_places,
-                }
-
-        return None
+        )
 
     def __str__(self):
         type_display = self.get_type_display()
@@ -0,0 +1,109 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import Account
+from apps.accounts.services import account_months_changed
+from apps.currencies.models import Currency, ExchangeRate
+from apps.transactions.models import (
+    Transaction,
+    TransactionCategory,
+    TransactionEntity,
+    TransactionTag,
+    transaction_created,
+    transaction_deleted,
+    transaction_updated,
+)
+from apps.transactions.utils.filter_choices import bump_filter_choices_version
+from apps.transactions.utils.overview_cache import (
+    bump_global_overview_version,
+    bump_overview_versions,
+    bump_user_overview_versions,
+)
+
+
+@receiver(transaction_created)
+@receiver(transaction_deleted)
+def transaction_changed_receiver(sender, **kwargs):
+    bump_overview_versions([sender.get_balance_key()])
+
+
+@receiver(transaction_updated)
+def transaction_updated_receiver(sender, old_data=None, **kwargs):
+    # The transaction may have moved to another account or month
+    keys = {sender.get_balance_key(), sender.get_balance_key(loaded=True)}
+    if old_data is not None:
+        keys.add(old_data.get_balance_key())
+
+    bump_overview_versions(keys)
+
+
+@receiver(account_months_changed)
+def account_months_changed_receiver(sender, keys, **kwargs):
+    # Covers the writes that don't send transaction signals, like bulk updates
+    bump_overview_versions(keys)
+
+
+@receiver(m2m_changed, sender=Transaction.tags.through)
+@receiver(m2m_changed, sender=Transaction.entities.through)
+def transaction_relations_changed_receiver(sender, instance, action, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+
+    if reverse or not instance.get_balance_key():
+        # A tag or entity changed for any number of transactions
+        bump_global_overview_version()
+    else:
+        bump_overview_versions([instance.get_balance_key()])
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+@receiver(post_save, sender=Currency)
+@receiver(post_delete, sender=Currency)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=TransactionCategory)
+@receiver(post_delete, sender=TransactionCategory)
+def overview_settings_changed_receiver(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_global_overview_version()
+
+
+@receiver(m2m_changed, sender=Account.untracked_by.through)
+def untracked_accounts_changed_receiver(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+
+    # Only the overviews of the users who (un)tracked the accounts change
+    if reverse:
+        bump_user_overview_versions([instance.pk])
+    elif pk_set is None:
+        bump_global_overview_version()
+    else:
+        bump_user_overview_versions(pk_set)
+
+
+@receiver(post_save, sender=TransactionCategory)
+@receiver(post_delete, sender=TransactionCategory)
+@receiver(post_save, sender=TransactionTag)
+@receiver(post_delete, sender=TransactionTag)
+@receiver(post_save, sender=TransactionEntity)
+@receiver(post_delete, sender=TransactionEntity)
+def filter_choices_changed_receiver(sender, **kwargs):
+    bump_filter_choices_version(sender)
+
+
+@receiver(m2m_changed, sender=TransactionCategory.shared_with.through)
+@receiver(m2m_changed, sender=TransactionTag.shared_with.through)
+@receiver(m2m_changed, sender=TransactionEntity.shared_with.through)
+def filter_choices_sharing_changed_receiver(
+    sender, instance, action, reverse, model, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+
+    bump_filter_choices_version(model if reverse else type(instance))
@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from cachalot.api import cachalot_disabled
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import Account
+from apps.currencies.models import Currency, ExchangeRate
+from apps.transactions.models import Transaction
+from apps.transactions.utils.calculations import (
+    calculate_account_totals,
+    calculate_currency_totals,
+)
+
+
+class TotalsCalculationTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.eur = Currency.objects.create(
+            code="EUR", name="Euro", decimal_places=2, suffix=" €"
+        )
+        self.usd = Currency.objects.create(
+            code="USD",
+            name="US Dollar",
+            decimal_places=2,
+            prefix="$ ",
+            exchange_currency=self.eur,
+        )
+        self.brl = Currency.objects.create(
+            code="BRL", name="Real", decimal_places=2, exchange_currency=self.usd
+        )
+
+        now = timezone.now()
+        ExchangeRate.objects.create(
+            from_currency=self.usd, to_currency=self.eur, rate=Decimal("0.8"), date=now
+        )
+        ExchangeRate.objects.create(
+            from_currency=self.usd, to_currency=self.brl, rate=Decimal("5"), date=now
+        )
+
+        self.usd_account = Account.objects.create(
+            name="Checking", currency=self.usd, exchange_currency=self.eur
+        )
+        self.brl_account = Account.objects.create(
+            name="Conta", currency=self.brl, exchange_currency=self.eur
+        )
+
+        Transaction.objects.create(
+            account=self.usd_account,
+            type=Transaction.Type.INCOME,
+            date=now.date(),
+            amount=Decimal("100.00"),
+        )
+        Transaction.objects.create(
+            account=self.brl_account,
+            type=Transaction.Type.EXPENSE,
+            date=now.date(),
+            amount=Decimal("50.00"),
+        )
+
+    def test_currency_totals_are_exchanged_and_consolidated(self):
+        """Test that totals are converted to the exchange currency and summed"""
+        result = calculate_currency_totals(Transaction.objects.all())
+
+        self.assertEqual(list(result), [self.usd.id, self.brl.id])
+        usd = result[self.usd.id]
+        self.assertEqual(usd["total_final"], Decimal("100.00"))
+        self.assertEqual(usd["exchanged"]["currency"]["code"], "EUR")
+        self.assertEqual(usd["exchanged"]["total_final"], Decimal("80"))
+        self.assertEqual(usd["exchanged"]["expense_current"], Decimal("0"))
+
+        # Converted through the inverse of the USD -> BRL rate
+        brl = result[self.brl.id]
+        self.assertEqual(brl["exchanged"]["expense_current"], Decimal("10"))
+        self.assertEqual(usd["consolidated"]["total_final"], Decimal("90"))
+        self.assertEqual(brl["consolidated"]["total_final"], Decimal("-50.00"))
+
+    def test_deep_search_adds_exchange_targets(self):
+        """Test that exchange targets without transactions are followed"""
+        result = calculate_currency_totals(Transaction.objects.all(), deep_search=True)
+
+        eur = result[self.eur.id]
+        self.assertEqual(eur["total_final"], Decimal("0"))
+        self.assertNotIn("exchanged", eur)
+        self.assertEqual(eur["consolidated"]["total_final"], Decimal("80"))
+
+    def test_account_totals_skip_missing_rates(self):
+        """Test that only convertible values are exchanged"""
+        result = calculate_account_totals(Transaction.objects.all())
+
+        exchanged = result[self.usd_account.id]["exchanged"]
+        self.assertEqual(exchanged["total_final"], Decimal("80"))
+        self.assertEqual(exchanged["currency"]["suffix"], " €")
+        self.assertNotIn("expense_current", exchanged)
+
+        # There's no BRL -> EUR rate
+        self.assertNotIn("exchanged", result[self.brl_account.id])
+
+    def test_query_count_doesnt_depend_on_currencies(self):
+        """Test that totals cost one query each for rows, currencies and rates"""
+        for code in ["GBP", "JPY", "CHF"]:
+            currency = Currency.objects.create(
+                code=code, name=code, exchange_currency=self.eur
+            )
+            account = Account.objects.create(name=code, currency=currency)
+            Transaction.objects.create(
+                account=account,
+                type=Transaction.Type.INCOME,
+                date=timezone.now().date(),
+                amount=Decimal("1.00"),
+            )
+
+        with cachalot_disabled():
+            with self.assertNumQueries(3):
+                calculate_currency_totals(Transaction.objects.all(), deep_search=True)
+
+            with self.assertNumQueries(3):
+                calculate_account_totals(Transaction.objects.all())
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+from cachalot.api import cachalot_disabled
+from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.transactions.filters import TransactionsFilter
+from apps.transactions.models import TransactionTag
+from apps.transactions.utils.filter_choices import get_filter_choices
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FilterChoicesTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        User = get_user_model()
+        self.user = User.objects.create_user(email="one@test.com", password="x")
+        self.other_user = User.objects.create_user(email="two@test.com", password="x")
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        TransactionTag.objects.create(name="Groceries", owner=self.user)
+        TransactionTag.objects.create(name="Bills", owner=self.user)
+        self.other_tag = TransactionTag.objects.create(
+            name="Theirs", owner=self.other_user
+        )
+
+    def test_choices_are_cached_per_user(self):
+        self.assertEqual(get_filter_choices(self.user, "tags"), ["Bills", "Groceries"])
+
+        with cachalot_disabled(), self.assertNumQueries(0):
+            self.assertEqual(
+                get_filter_choices(self.user, "tags"), ["Bills", "Groceries"]
+            )
+
+    def test_changes_and_sharing_invalidate_the_choices(self):
+        get_filter_choices(self.user, "tags")
+
+        TransactionTag.objects.create(name="Alpha", owner=self.user)
+        self.assertEqual(
+            get_filter_choices(self.user, "tags"), ["Alpha", "Bills", "Groceries"]
+        )
+
+        self.other_tag.shared_with.add(self.user)
+        self.assertIn("Theirs", get_filter_choices(self.user, "tags"))
+
+    def test_filter_inlines_the_choices(self):
+        f = TransactionsFilter(QueryDict())
+
+        widget = f.form.fields["tags"].widget
+        self.assertNotIn("data-load", widget.attrs)
+        self.assertEqual(
+            [value for value, label in widget.choices],
+            ["any", "untagged", "Bills", "Groceries"],
+        )
+
+    @patch("apps.transactions.filters.INLINE_CHOICES_LIMIT", 1)
+    def test_filter_loads_large_choice_lists_lazily(self):
+        f = TransactionsFilter(QueryDict("tags=Groceries"))
+
+        field = f.form.fields["tags"]
+        self.assertEqual(
+            field.widget.attrs["data-load"], "/transactions/json/filter-choices/tags/"
+        )
+        self.assertEqual(
+            [value for value, label in field.widget.choices],
+            ["any", "untagged", "Groceries"],
+        )
+        # Every name is still accepted
+        self.assertTrue(f.form.is_valid())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FilterChoicesPageViewTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="one@test.com", password="testpass123"
+        )
+        self.client.login(username="one@test.com", password="testpass123")
+        write_current_user(self.user)
+        for i in range(60):
+            TransactionTag.objects.create(name=f"Tag {i:02}", owner=self.user)
+        delete_current_user()
+
+    def test_returns_pages_of_choices(self):
+        response = self.client.get("/transactions/json/filter-choices/tags/")
+
+        data = response.json()
+        self.assertEqual(len(data["results"]), 50)
+        self.assertEqual(data["results"][0], {"text": "Tag 00", "value": "Tag 00"})
+
+        data = self.client.get(data["next"]).json()
+        self.assertEqual(len(data["results"]), 10)
+        self.assertIsNone(data["next"])
+
+    def test_searches_choices(self):
+        response = self.client.get(
+            "/transactions/json/filter-choices/tags/", {"q": "tag 5"}
+        )
+
+        self.assertEqual(
+            [choice["value"] for choice in response.json()["results"]],
+            [f"Tag 5{i}" for i in range(10)],
+        )
+
+    def test_rejects_unknown_fields(self):
+        response = self.client.get("/transactions/json/filter-choices/accounts/")
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from cachalot.api import cachalot_disabled
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import Account
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.currencies.models import Currency
+from apps.transactions.models import Transaction
+from apps.transactions.utils.default_ordering import default_order
+from apps.transactions.utils.keyset_pagination import (
+    encode_cursor,
+    paginate_keyset,
+)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="one@test.com", password="testpass123"
+        )
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+        currency = Currency.objects.create(code="USD", name="US Dollar")
+        self.account = Account.objects.create(name="Checking", currency=currency)
+
+        today = timezone.localdate(timezone.now())
+        # Several transactions per date, around today
+        for offset in range(-5, 5):
+            for _ in range(3):
+                Transaction.objects.create(
+                    account=self.account,
+                    type=Transaction.Type.EXPENSE,
+                    amount=Decimal("10"),
+                    is_paid=True,
+                    date=today + timedelta(days=offset),
+                )
+
+    def _walk(self, queryset, per_page):
+        pages = []
+        cursor = None
+        while True:
+            page = paginate_keyset(queryset, cursor, per_page=per_page)
+            pages.append([transaction.id for transaction in page])
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_follow_every_ordering(self):
+        for order in ("default", "newer", "older"):
+            with self.subTest(order=order):
+                queryset = default_order(Transaction.objects.all(), order=order)
+
+                pages = self._walk(queryset, per_page=4)
+
+                self.assertEqual(
+                    [id for page in pages for id in page],
+                    list(queryset.values_list("id", flat=True)),
+                )
+                self.assertEqual([len(page) for page in pages], [4] * 7 + [2])
+
+    def test_deep_pages_take_a_single_query(self):
+        queryset = default_order(Transaction.objects.all(), order="newer")
+        page = paginate_keyset(queryset, None, per_page=25)
+
+        with cachalot_disabled(), self.assertNumQueries(1):
+            paginate_keyset(queryset, page.next_cursor, per_page=25)
+
+    def test_invalid_cursors_give_the_first_page(self):
+        queryset = default_order(Transaction.objects.all(), order="older")
+        first_page = paginate_keyset(queryset, None, per_page=5)
+
+        for cursor in ("invalid", "WzFd", encode_cursor(["not a date", 1])):
+            with self.subTest(cursor=cursor):
+                page = paginate_keyset(queryset, cursor, per_page=5)
+
+                self.assertTrue(page.is_first())
+                self.assertEqual(page.object_list, first_page.object_list)
+
+
+class TransactionAllListTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="one@test.com", password="testpass123"
+        )
+        self.client.login(username="one@test.com", password="testpass123")
+        write_current_user(self.user)
+
+        currency = Currency.objects.create(code="USD", name="US Dollar")
+        account = Account.objects.create(name="Checking", currency=currency)
+        for day in range(1, 151):
+            Transaction.objects.create(
+                account=account,
+                type=Transaction.Type.EXPENSE,
+                amount=Decimal("10"),
+                is_paid=True,
+                date=date(2020, 1, 1) + timedelta(days=day),
+                description=f"Transaction {day}",
+            )
+        delete_current_user()
+
+    def test_pages_are_appended_with_a_cursor(self):
+        response = self.client.get(
+            "/transactions/list/", {"order": "older"}, HTTP_HX_REQUEST="true"
+        )
+
+        page_obj = response.context["page_obj"]
+        self.assertEqual(len(page_obj), 100)
+        self.assertTemplateUsed(response, "transactions/fragments/list_all.html")
+        self.assertContains(response, 'hx-trigger="revealed"')
+
+        response = self.client.get(
+            "/transactions/list/",
+            {"order": "older", "cursor": page_obj.next_cursor},
+            HTTP_HX_REQUEST="true",
+        )
+
+        self.assertTemplateNotUsed(response, "transactions/fragments/list_all.html")
+        self.assertEqual(
+            [transaction.description for transaction in response.context["page_obj"]],
+            [f"Transaction {day}" for day in range(101, 151)],
+        )
+        self.assertNotContains(response, 'hx-trigger="revealed"')
@@ -0,0 +1,160 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.accounts.models import Account
+from apps.common.middleware.thread_local import delete_current_user, write_current_user
+from apps.currencies.models import Currency
+from apps.transactions.models import (
+    Transaction,
+    transaction_created,
+    transaction_updated,
+)
+from apps.transactions.utils.overview_cache import get_cached_month_overview
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OverviewCacheTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="one@test.com", password="testpass123"
+        )
+        self.other_user = User.objects.create_user(
+            email="two@test.com", password="testpass123"
+        )
+        self.currency = Currency.objects.create(code="USD", name="US Dollar")
+        self.account = Account.objects.create(
+            name="Mine", currency=self.currency, owner=self.user
+        )
+        self.other_account = Account.objects.create(
+            name="Theirs", currency=self.currency, owner=self.other_user
+        )
+        self.request = RequestFactory().get("/")
+        self.request.user = self.user
+        write_current_user(self.user)
+        self.addCleanup(delete_current_user)
+
+    def _create_expense(self, account, day):
+        return Transaction.userless_all_objects.create(
+            account=account,
+            type=Transaction.Type.EXPENSE,
+            date=day,
+            amount=Decimal("10.00"),
+        )
+
+    def _is_rebuilt(self, month=12):
+        build = Mock(return_value={})
+        get_cached_month_overview(self.request, "test", 2025, month, build)
+        return build.called
+
+    def test_other_accounts_and_months_keep_the_cache(self):
+        """Test that only changes to a cached account and month invalidate it"""
+        self.assertTrue(self._is_rebuilt())
+        self.assertFalse(self._is_rebuilt())
+
+        self._create_expense(self.other_account, date(2025, 12, 10))
+        self._create_expense(self.account, date(2025, 11, 10))
+        self.assertFalse(self._is_rebuilt())
+
+        self._create_expense(self.account, date(2025, 12, 10))
+        self.assertTrue(self._is_rebuilt())
+
+    def test_transaction_signals_invalidate_old_and_new_months(self):
+        """Test that moving a transaction invalidates both months"""
+        transaction = self._create_expense(self.account, date(2025, 11, 10))
+        self._is_rebuilt(11)
+        self._is_rebuilt(12)
+
+        old_data = Transaction.userless_all_objects.get(id=transaction.id)
+        Transaction.userless_all_objects.filter(id=transaction.id).update(
+            date=date(2025, 12, 10),
+            reference_date=date(2025, 12, 1),
+            emit_signal=False,
+        )
+        transaction.refresh_from_db()
+        transaction_updated.send(sender=transaction, old_data=old_data)
+
+        self.assertTrue(self._is_rebuilt(11))
+        self.assertTrue(self._is_rebuilt(12))
+
+    def test_created_signal_invalidates_the_month(self):
+        """Test that transaction_created invalidates its account's month"""
+        transaction = self._create_expense(self.account, date(2025, 12, 10))
+        self._is_rebuilt()
+
+        transaction_created.send(sender=transaction)
+
+        self.assertTrue(self._is_rebuilt())
+
+    def test_untracking_an_account_only_invalidates_that_user(self):
+        """Test that tracking changes are scoped to the user"""
+        self._is_rebuilt()
+        self.other_account.untracked_by.add(self.other_user)
+        self.assertFalse(self._is_rebuilt())
+
+        self.user.untracked_accounts.add(self.account)
+        self.assertTrue(self._is_rebuilt())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class InvalidateCacheViewTests(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="one@test.com", password="testpass123"
+        )
+        self.client.login(username="one@test.com", password="testpass123")
+        self.currency = Currency.objects.create(code="USD", name="US Dollar")
+        self.account = Account.objects.create(
+            name="Mine", currency=self.currency, owner=self.user
+        )
+        Transaction.userless_all_objects.create(
+            account=self.account,
+            type=Transaction.Type.EXPENSE,
+            date=date(2025, 12, 10),
+            amount=Decimal("10.00"),
+        )
+
+    def _is_rebuilt(self, month):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        build = Mock(return_value={})
+        write_current_user(self.user)
+        try:
+            get_cached_month_overview(request, "test", 2025, month, build)
+        finally:
+            delete_current_user()
+        return build.called
+
+    def _invalidate(self, query=""):
+        return self.client.get(f"/cache/invalidate/{query}", HTTP_HX_REQUEST="true")
+
+    def test_clears_the_users_overviews(self):
+        self._is_rebuilt(11)
+
+        self.assertEqual(self._invalidate().status_code, 204)
+
+        self.assertTrue(self._is_rebuilt(11))
+
+    def test_clears_a_single_account_month(self):
+        self._is_rebuilt(11)
+        self._is_rebuilt(12)
+
+        response = self._invalidate(f"?account={self.account.id}&year=2025&month=12")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self._is_rebuilt(11))
+        self.assertTrue(self._is_rebuilt(12))
+
+    def test_rejects_invalid_scopes(self):
+        self.assertEqual(self._invalidate("?account=abc").status_code, 404)
+        self.assertEqual(self._invalidate("?account=999999").status_code, 404)
@@ -151,6 +151,11 @@ urlpatterns = [
         views.get_recent_transactions,
         name="transactions_search",
     ),
+    path(
+        "transactions/json/filter-choices/<str:field>/",
+        views.get_filter_choices_page,
+        name="transactions_filter_choices",
+    ),
     path(
         "transaction/<int:transaction_id>/clone/",
         views.transaction_clone,
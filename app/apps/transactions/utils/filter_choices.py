@@ -0,0 +1,70 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.transactions.models import (
+    TransactionCategory,
+    TransactionEntity,
+    TransactionTag,
+)
+
+FILTER_CHOICES_TIMEOUT = 60 * 60 * 24
+
+# Above this many choices, TomSelect loads them page by page instead
+INLINE_CHOICES_LIMIT = 500
+CHOICES_PAGE_SIZE = 50
+
+CHOICE_MODELS = {
+    "category": TransactionCategory,
+    "tags": TransactionTag,
+    "entities": TransactionEntity,
+}
+
+
+def _version_key(model) -> str:
+    return f"filter_choices:version:{model._meta.label_lower}"
+
+
+def _get_version(model) -> int:
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.set(key, version, None)
+
+    return version
+
+
+def _load_names(model) -> list[str]:
+    return list(model.objects.order_by("name").values_list("name", flat=True))
+
+
+def get_filter_choices(user, field) -> list[str]:
+    """
+    The sorted names of the categories, tags or entities (per `field`) the user
+    can see, cached until any of them is changed or (un)shared.
+    """
+    model = CHOICE_MODELS[field]
+    if user is None or not user.is_authenticated:
+        return _load_names(model)
+
+    key = f"filter_choices:{field}:{user.id}:{_get_version(model)}"
+    choices = cache.get(key)
+    if choices is None:
+        choices = _load_names(model)
+        cache.set(key, choices, FILTER_CHOICES_TIMEOUT)
+
+    return choices
+
+
+def _bump(model):
+    cache.set(_version_key(model), time.time_ns(), None)
+
+
+def bump_filter_choices_version(model):
+    """Invalidate every user's cached choices of `model`."""
+    # Bumped again after the commit, so choices read by a concurrent request
+    # before it aren't stored under the new version
+    _bump(model)
+    transaction.on_commit(lambda: _bump(model))
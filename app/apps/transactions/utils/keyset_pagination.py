@@ -0,0 +1,115 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+
+
+class KeysetPage:
+    """
+    A page of a queryset that starts right after the row a cursor points to.
+
+    Unlike Paginator pages, getting one costs a single query no matter how
+    deep it is: there's no COUNT(*) and no OFFSET.
+    """
+
+    def __init__(
+        self,
+        object_list: list,
+        cursor: str | None,
+        end_cursor: str | None,
+        has_next: bool,
+    ):
+        self.object_list = object_list
+        self.cursor = cursor
+        # Points to the last row, to pick up rows added after it later on
+        self.end_cursor = end_cursor
+        self.next_cursor = end_cursor if has_next else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def is_first(self) -> bool:
+        return self.cursor is None
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            # DjangoJSONEncoder drops the microseconds, which the cursor needs
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: list) -> str:
+    data = json.dumps(values, cls=_CursorEncoder).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list | None:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+    if not isinstance(values, list) or len(values) != size:
+        return None
+
+    return values
+
+
+def _after(ordering: list[str], values: list) -> Q:
+    # (a, b, c) > (x, y, z) is a > x OR (a = x AND b > y) OR (a = x AND ...),
+    # with the comparison flipped for descending fields
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        part = Q(**{f"{name}__{lookup}": values[index]})
+        for previous, value in zip(ordering[:index], values):
+            part &= Q(**{previous.lstrip("-"): value})
+        condition |= part
+
+    return condition
+
+
+def paginate_keyset(queryset: QuerySet, cursor: str | None, per_page: int):
+    """
+    Get the page of `queryset` after `cursor`, or the first one without it.
+
+    The queryset must be ordered by non-null field or annotation names ending
+    with a unique one, e.g. ("date", "id"). Invalid cursors, like the ones from
+    another ordering, give the first page.
+    """
+    ordering = list(queryset.query.order_by)
+
+    values = decode_cursor(cursor, len(ordering)) if cursor else None
+    if values is not None:
+        try:
+            queryset = queryset.filter(_after(ordering, values))
+        except ValidationError:
+            values = None
+
+    if values is None:
+        cursor = None
+
+    object_list = list(queryset[: per_page + 1])
+    has_next = len(object_list) > per_page
+    object_list = object_list[:per_page]
+
+    end_cursor = cursor
+    if object_list:
+        end_cursor = encode_cursor(
+            [getattr(object_list[-1], field.lstrip("-")) for field in ordering]
+        )
+
+    return KeysetPage(object_list, cursor, end_cursor, has_next)
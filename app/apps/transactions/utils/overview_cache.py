@@ -0,0 +1,155 @@
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Account
+
+OVERVIEW_CACHE_TIMEOUT = 60 * 60 * 24
+
+GLOBAL_VERSION_KEY = "overview:version"
+
+
+def _account_version_key(account_id, month) -> str:
+    return f"overview:version:{account_id}:{month:%Y-%m}"
+
+
+def _account_all_months_version_key(account_id) -> str:
+    return f"overview:version:{account_id}:all"
+
+
+def _user_version_key(user_id) -> str:
+    return f"overview:version:user:{user_id}"
+
+
+def _new_version() -> int:
+    # Never reused, so an overview can't outlive the data it was built from even
+    # if its version key gets evicted
+    return time.time_ns()
+
+
+def _get_versions(keys) -> list:
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    return [versions[key] for key in keys]
+
+
+def get_overview_data_version(user) -> tuple[str, datetime.datetime]:
+    """
+    The version of everything the user's overviews can be built from, whatever
+    the months, and roughly when it last changed. Both change along with the
+    versions the cached overviews depend on, so they can validate responses.
+    """
+    account_ids = sorted(Account.objects.values_list("id", flat=True))
+    versions = _get_versions(
+        [GLOBAL_VERSION_KEY, _user_version_key(user.id)]
+        + [_account_all_months_version_key(account_id) for account_id in account_ids]
+    )
+
+    # Defaults like the current year depend on the day
+    today = timezone.localdate(timezone.now())
+    version = hashlib.md5(repr((account_ids, versions, today)).encode()).hexdigest()
+
+    last_modified = max(
+        datetime.datetime.fromtimestamp(max(versions) / 10**9, tz=datetime.UTC),
+        datetime.datetime.combine(
+            today, datetime.time(), tzinfo=timezone.get_current_timezone()
+        ),
+    )
+
+    return version, last_modified
+
+
+def _get_overview_key(request, name, months) -> str:
+    account_ids = sorted(Account.objects.values_list("id", flat=True))
+    versions = _get_versions(
+        [GLOBAL_VERSION_KEY, _user_version_key(request.user.id)]
+        + [
+            _account_version_key(account_id, month)
+            for month in months
+            for account_id in account_ids
+        ]
+    )
+
+    data = repr(
+        (
+            account_ids,
+            versions,
+            sorted(request.GET.lists()),
+            # The daily allowance depends on the current day
+            timezone.localdate(timezone.now()),
+        )
+    )
+
+    return (
+        f"overview:{name}:{request.user.id}:{months[0]:%Y-%m}:{len(months)}:"
+        f"{hashlib.md5(data.encode()).hexdigest()}"
+    )
+
+
+def get_cached_overview(request, name, months, build):
+    """
+    Return the context built by `build`, cached per user, filter and the months
+    it covers (first days, as dates).
+
+    Invalidation is scoped by account and month: the entry is only bypassed once
+    one of the user's accounts has a transaction changed in one of those months,
+    or once exchange rates or the settings the overviews depend on change.
+    Changes to other users' accounts or to other months keep it.
+    """
+    key = _get_overview_key(request, name, months)
+
+    overview = cache.get(key)
+    if overview is None:
+        overview = build()
+        cache.set(key, overview, OVERVIEW_CACHE_TIMEOUT)
+
+    return overview
+
+
+def get_cached_month_overview(request, name, year, month, build):
+    return get_cached_overview(request, name, [datetime.date(year, month, 1)], build)
+
+
+def get_cached_year_overview(request, name, year, build):
+    return get_cached_overview(
+        request, name, [datetime.date(year, month, 1) for month in range(1, 13)], build
+    )
+
+
+def _bump(keys):
+    cache.set_many({key: _new_version() for key in keys}, None)
+
+
+def _bump_now_and_on_commit(keys):
+    # Bumping again after the commit keeps an overview built from the old data by
+    # a concurrent request from being stored under the new version
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_overview_versions(balance_keys):
+    """Invalidate the overviews of the given (account_id, month) pairs."""
+    balance_keys = [key for key in balance_keys if key is not None]
+    account_ids = {account_id for account_id, _ in balance_keys}
+    _bump_now_and_on_commit(
+        [_account_version_key(*key) for key in balance_keys]
+        + [_account_all_months_version_key(account_id) for account_id in account_ids]
+    )
+
+
+def bump_user_overview_versions(user_ids):
+    """Invalidate every overview cached for the given users."""
+    _bump_now_and_on_commit([_user_version_key(user_id) for user_id in user_ids])
+
+
+def bump_global_overview_version():
+    """Invalidate every overview."""
+    _bump_now_and_on_commit([GLOBAL_VERSION_KEY])
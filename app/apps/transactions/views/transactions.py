@@ -3,7 +3,11 @@ from copy import deepcopy
 
 from apps.common.decorators.demo import disabled_on_demo
 from apps.common.decorators.htmx import only_htmx
-from apps.rules.signals import transaction_created, transaction_updated
+from apps.rules.signals import (
+    batched_rule_checks,
+    transaction_created,
+    transaction_updated,
+)
 from apps.transactions.filters import TransactionsFilter
 from apps.transactions.forms import (
     BulkEditTransactionForm,
@@ -18,6 +22,12 @@ from apps.transactions.utils.calculations import (
     calculate_percentage_distribution,
 )
 from apps.transactions.utils.default_ordering import default_order
+from apps.transactions.utils.keyset_pagination import paginate_keyset
+from apps.transactions.utils.filter_choices import (
+    CHOICE_MODELS,
+    CHOICES_PAGE_SIZE,
+    get_filter_choices,
+)
 from dateutil.relativedelta import relativedelta
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -378,22 +388,24 @@ def transactions_bulk_edit(request):
     if request.method == "POST":
         form = BulkEditTransactionForm(request.POST)
         if form.is_valid():
-            # Apply changes from the form to all selected transactions
-            for transaction in transactions:
-                old_data = deepcopy(transaction)
-                for field_name, value in form.cleaned_data.items():
-                    if value or isinstance(
-                        value, bool
-                    ):  # Only update fields that have been filled in the form
-                        if field_name == "tags":
-                            transaction.tags.set(value)
-                        elif field_name == "entities":
-                            transaction.entities.set(value)
-                        else:
-                            setattr(transaction, field_name, value)
-
-                transaction.save()
-                transaction_updated.send(sender=transaction, old_data=old_data)
+            # Apply changes from the form to all selected transactions, with
+            # their rules checked by a single job
+            with batched_rule_checks():
+                for transaction in transactions:
+                    old_data = deepcopy(transaction)
+                    for field_name, value in form.cleaned_data.items():
+                        if value or isinstance(
+                            value, bool
+                        ):  # Only update fields that have been filled in the form
+                            if field_name == "tags":
+                                transaction.tags.set(value)
+                            elif field_name == "entities":
+                                transaction.entities.set(value)
+                            else:
+                                setattr(transaction, field_name, value)
+
+                    transaction.save()
+                    transaction_updated.send(sender=transaction, old_data=old_data)
 
             messages.success(
                 request,
@@ -748,37 +760,43 @@ def transaction_all_list(request):
         "entities",
         "dca_expense_entries",
         "dca_income_entries",
-    ).all()
+    ).with_exchanged_amounts()
 
     f = TransactionsFilter(request.GET, queryset=transactions)
 
     # Late transactions: date < today and is_paid = False (only shown for default ordering on first page)
     late_transactions = None
-    page_number = request.GET.get("page", 1)
-    if order == "default" and str(page_number) == "1":
-        late_transactions = f.qs.filter(
-            date__lt=today,
-            is_paid=False,
-        ).order_by("date", "id")
-        # Exclude late transactions from the main paginated list
-        main_transactions = f.qs.exclude(
+    cursor = request.GET.get("cursor") or None
+    main_transactions = f.qs
+    if order == "default":
+        if cursor is None:
+            late_transactions = f.qs.filter(
+                date__lt=today,
+                is_paid=False,
+            ).order_by("date", "id")
+        # Exclude late transactions from the main list
+        main_transactions = main_transactions.exclude(
             date__lt=today,
             is_paid=False,
         )
-    else:
-        main_transactions = f.qs
 
     main_transactions = default_order(main_transactions, order=order)
 
-    paginator = Paginator(main_transactions, 100)
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_keyset(main_transactions, cursor, per_page=100)
+
+    if not page_obj.is_first():
+        # Infinite scroll: only the rows to append after the previous page
+        return render(
+            request,
+            "transactions/fragments/list_all_page.html",
+            {"page_obj": page_obj},
+        )
 
     return render(
         request,
         "transactions/fragments/list_all.html",
         {
             "page_obj": page_obj,
-            "paginator": paginator,
             "late_transactions": late_transactions,
         },
     )
@@ -913,7 +931,7 @@ def transactions_trash_can_list(request):
         "entities",
         "dca_expense_entries",
         "dca_income_entries",
-    ).all()
+    ).with_exchanged_amounts()
 
     return render(
         request,
@@ -973,3 +991,30 @@ def get_recent_transactions(request, filter_type=None):
         data.append({"text": str(t), "value": str(t.id)})
 
     return JsonResponse(data, safe=False)
+
+
+@login_required
+@require_http_methods(["GET"])
+def get_filter_choices_page(request, field):
+    """Return a page of the category, tag or entity names TransactionsFilter offers."""
+    if field not in CHOICE_MODELS:
+        raise Http404
+
+    search_term = request.GET.get("q", "").strip().casefold()
+    names = get_filter_choices(request.user, field)
+    if search_term:
+        names = [name for name in names if search_term in name.casefold()]
+
+    page = Paginator(names, CHOICES_PAGE_SIZE).get_page(request.GET.get("page"))
+    next_url = None
+    if page.has_next():
+        params = QueryDict(mutable=True)
+        params.update({"q": request.GET.get("q", ""), "page": page.next_page_number()})
+        next_url = f"{request.path}?{params.urlencode()}"
+
+    return JsonResponse(
+        {
+            "results": [{"text": name, "value": name} for name in page],
+            "next": next_url,
+        }
+    )
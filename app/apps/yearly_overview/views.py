@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from django.http import Http404
@@ -6,6 +8,7 @@ from django.utils import timezone
 
 from apps.accounts.models import Account
 from apps.common.decorators.htmx import only_htmx
+from apps.common.functions.dates import month_bounds
 from apps.common.utils.dicts import remove_falsey_entries
 from apps.currencies.models import Currency
 from apps.transactions.models import Transaction
@@ -14,6 +17,7 @@ from apps.transactions.utils.calculations import (
     calculate_currency_totals,
     calculate_percentage_distribution,
 )
+from apps.transactions.utils.overview_cache import get_cached_year_overview
 
 
 @login_required
@@ -75,6 +79,21 @@ def index_yearly_overview_by_currency(request, year: int):
 @only_htmx
 @login_required
 def yearly_overview_by_currency(request, year: int):
+    context = get_cached_year_overview(
+        request,
+        "yearly_currencies",
+        year,
+        partial(_yearly_overview_by_currency_context, request, year),
+    )
+
+    return render(
+        request,
+        "yearly_overview/fragments/currency_data.html",
+        context=context,
+    )
+
+
+def _yearly_overview_by_currency_context(request, year: int):
     month = request.GET.get("month")
     currency = request.GET.get("currency")
 
@@ -86,7 +105,9 @@ def yearly_overview_by_currency(request, year: int):
         month = int(month)
         if not 1 <= month <= 12:
             raise Http404("Invalid month")
-        filter_params["reference_date__month"] = month
+        month_start, month_end = month_bounds(year, month)
+        filter_params["reference_date__gte"] = month_start
+        filter_params["reference_date__lte"] = month_end
 
     # Add currency filter if provided
     if currency:
@@ -102,15 +123,11 @@ def yearly_overview_by_currency(request, year: int):
     data = calculate_currency_totals(transactions)
     percentages = calculate_percentage_distribution(data)
 
-    return render(
-        request,
-        "yearly_overview/fragments/currency_data.html",
-        context={
-            "year": year,
-            "totals": data,
-            "percentages": percentages,
-        },
-    )
+    return {
+        "year": year,
+        "totals": data,
+        "percentages": percentages,
+    }
 
 
 @login_required
@@ -144,6 +161,21 @@ def index_yearly_overview_by_account(request, year: int):
 @only_htmx
 @login_required
 def yearly_overview_by_account(request, year: int):
+    context = get_cached_year_overview(
+        request,
+        "yearly_accounts",
+        year,
+        partial(_yearly_overview_by_account_context, request, year),
+    )
+
+    return render(
+        request,
+        "yearly_overview/fragments/account_data.html",
+        context=context,
+    )
+
+
+def _yearly_overview_by_account_context(request, year: int):
     month = request.GET.get("month")
     account = request.GET.get("account")
 
@@ -155,7 +187,9 @@ def yearly_overview_by_account(request, year: int):
         month = int(month)
         if not 1 <= month <= 12:
             raise Http404("Invalid month")
-        filter_params["reference_date__month"] = month
+        month_start, month_end = month_bounds(year, month)
+        filter_params["reference_date__gte"] = month_start
+        filter_params["reference_date__lte"] = month_end
 
     # Add account filter if provided
     if account:
@@ -173,12 +207,8 @@ def yearly_overview_by_account(request, year: int):
     data = calculate_account_totals(transactions)
     percentages = calculate_percentage_distribution(data)
 
-    return render(
-        request,
-        "yearly_overview/fragments/account_data.html",
-        context={
-            "year": year,
-            "totals": data,
-            "percentages": percentages,
-        },
-    )
+    return {
+        "year": year,
+        "totals": data,
+        "percentages": percentages,
+    }
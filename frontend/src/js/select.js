@@ -98,7 +98,26 @@ window.TomSelect = function createDynamicTomSelect(element) {
         };
     }
 
-    if (element.dataset.load) {
+    if (element.dataset.load && element.dataset.loadPaginated === 'true') {
+        // Responses are {results: [...], next: url|null}, fetched while scrolling
+        config.plugins.virtual_scroll = {};
+        config.firstUrl = function (query) {
+            return element.dataset.load + '?q=' + encodeURIComponent(query);
+        };
+        config.load = function (query, callback) {
+            const url = this.getUrl(query);
+            fetch(url)
+                .then(response => response.json())
+                .then(json => {
+                    if (json.next) {
+                        this.setNextUrl(query, json.next);
+                    }
+                    callback(json.results);
+                }).catch(() => {
+                    callback();
+                });
+        };
+    } else if (element.dataset.load) {
         config.load = function (query, callback) {
             let url = element.dataset.load + '?q=' + encodeURIComponent(query);
             fetch(url)